@@ -0,0 +1,68 @@
+"""
+Benchmark the batch geometry kernels against per-element Geometry calls.
+
+The unchecked column runs the same kernels on columns validated once up
+front with mathlib.validated.validate(); the cost of that validation is
+printed separately.
+
+Usage: python benchmarks/bench_batch_geometry.py [--size N]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from array import array
+
+from mathlib.batch_geometry import BatchGeometry, UncheckedGeometry
+from mathlib.geometry import Geometry
+from mathlib.validated import validate
+
+
+def best_of(func, repeat=5):
+    """Return the fastest of several timed runs of func."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000, help="elements per column")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    a = array("d", (rng.uniform(0, 100) for _ in range(args.size)))
+    b = array("d", (rng.uniform(0, 100) for _ in range(args.size)))
+    out = array("d", bytes(8 * args.size))
+    validate_ns = best_of(lambda: validate(a, non_negative=True)) / args.size * 1e9
+    va = validate(a, non_negative=True)
+    vb = validate(b, non_negative=True)
+
+    cases = [
+        ("circle_area", lambda: [Geometry.circle_area(r) for r in a],
+         lambda: BatchGeometry.circle_area(a, out=out),
+         lambda: UncheckedGeometry.circle_area(va, out=out)),
+        ("sphere_volume", lambda: [Geometry.sphere_volume(r) for r in a],
+         lambda: BatchGeometry.sphere_volume(a, out=out),
+         lambda: UncheckedGeometry.sphere_volume(va, out=out)),
+        ("rectangle_area", lambda: [Geometry.rectangle_area(x, y) for x, y in zip(a, b)],
+         lambda: BatchGeometry.rectangle_area(a, b, out=out),
+         lambda: UncheckedGeometry.rectangle_area(va, vb, out=out)),
+        ("cylinder_volume", lambda: [Geometry.cylinder_volume(x, y) for x, y in zip(a, b)],
+         lambda: BatchGeometry.cylinder_volume(a, b, out=out),
+         lambda: UncheckedGeometry.cylinder_volume(va, vb, out=out)),
+    ]
+
+    print(f"{'operation':<18}{'scalar ns/elem':>16}{'batch ns/elem':>16}{'unchecked':>12}{'speedup':>10}")
+    for name, scalar, batch, unchecked in cases:
+        scalar_ns = best_of(scalar) / args.size * 1e9
+        batch_ns = best_of(batch) / args.size * 1e9
+        unchecked_ns = best_of(unchecked) / args.size * 1e9
+        print(f"{name:<18}{scalar_ns:>16.1f}{batch_ns:>16.1f}{unchecked_ns:>12.1f}"
+              f"{scalar_ns / batch_ns:>9.1f}x")
+    print(f"validate() once: {validate_ns:.1f} ns/elem per column")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
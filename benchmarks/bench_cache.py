@@ -0,0 +1,66 @@
+"""
+Benchmark cold versus warm runs of the persistent result cache.
+
+Each run happens in a fresh interpreter, the way short-lived batch workers
+use the cache.
+
+Usage: python benchmarks/bench_cache.py [--runs N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+WORKLOAD = """
+import sys
+from mathlib.cache import PersistentCache
+from mathlib.calculator import Calculator
+from mathlib.statistics import Statistics
+
+cache = PersistentCache(sys.argv[1]) if len(sys.argv) > 1 else None
+factorial = cache.memoize(Calculator.factorial) if cache is not None else Calculator.factorial
+power = cache.memoize(Calculator.power) if cache is not None else Calculator.power
+percentile = cache.memoize(Statistics.percentile) if cache is not None else Statistics.percentile
+
+for n in range(20000, 20010):
+    factorial(n)
+    power(7, n * 50)
+data = [(i * 7919) % 10007 / 3.0 for i in range(100000)]
+for p in range(5, 100, 5):
+    percentile(data, p)
+"""
+
+
+def run_workload(cache_path=None):
+    """Run the workload in a new interpreter and return the elapsed time."""
+    cmd = [sys.executable, "-c", WORKLOAD]
+    if cache_path:
+        cmd.append(cache_path)
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="warm runs to time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite")
+        uncached = run_workload()
+        cold = run_workload(path)
+        warm = min(run_workload(path) for _ in range(args.runs))
+
+    print(f"{'mode':<10}{'seconds':>10}{'speedup':>10}")
+    for name, elapsed in [("uncached", uncached), ("cold", cold), ("warm", warm)]:
+        print(f"{name:<10}{elapsed:>10.3f}{uncached / elapsed:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Benchmark footer-based range queries against reading and scanning the rows.
+
+Usage: python benchmarks/bench_columnar.py [--rows N] [--block-size B] [--queries Q]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+from mathlib.columnar import ColumnarReader, write_columnar
+from mathlib.statistics import Statistics
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--block-size", type=int, default=65536)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    values = array("d", (rng.gauss(0, 1) for _ in range(args.rows)))
+    ranges = sorted((rng.randrange(args.rows // 2), rng.randrange(args.rows // 2, args.rows))
+                    for _ in range(args.queries))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "data.col")
+        start = time.perf_counter()
+        write_columnar(path, {"x": values}, args.block_size)
+        write_time = time.perf_counter() - start
+
+        with ColumnarReader(path) as reader:
+            start = time.perf_counter()
+            scanned = [Statistics.variance(reader.read("x", a, b)) for a, b in ranges]
+            scan_time = time.perf_counter() - start
+            start = time.perf_counter()
+            footers = [reader.variance("x", a, b) for a, b in ranges]
+            footer_time = time.perf_counter() - start
+        assert all(abs(x - y) < 1e-9 for x, y in zip(scanned, footers))
+
+    per_query = 1000 / args.queries
+    print(f"{args.rows} rows, {args.block_size}-row blocks, written in {write_time:.2f} s")
+    print(f"  read + Statistics.variance  {scan_time * per_query:10.2f} ms/query")
+    print(f"  ColumnarReader.variance     {footer_time * per_query:10.2f} ms/query")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Benchmark thread-pool scaling of batch operations across worker counts.
+
+Run it on a regular and a free-threaded interpreter (e.g. python3.13t) to
+compare: with the GIL, pure-Python chunks run one at a time and the speedup
+stays near 1x; without it, they spread over the available cores.
+
+Usage: python benchmarks/bench_executor.py [--size N] [--workers 1,2,4,8]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+from mathlib.batch_geometry import BatchGeometry
+from mathlib.calculator import Calculator
+from mathlib.executor import BatchExecutor, gil_enabled
+from mathlib.statistics import Statistics
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000, help="elements per column")
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    args = parser.parse_args()
+    worker_counts = [int(w) for w in args.workers.split(",")]
+
+    rng = random.Random(7)
+    radii = array("d", (rng.uniform(0, 100) for _ in range(args.size)))
+    heights = array("d", (rng.uniform(0, 100) for _ in range(args.size)))
+    exponents = [rng.randint(0, 3) for _ in range(args.size // 10)]
+    datasets = [[rng.random() for _ in range(50)] for _ in range(args.size // 100)]
+
+    cases = [
+        ("BatchGeometry.cylinder_volume",
+         lambda ex: ex.map_batch(BatchGeometry.cylinder_volume, radii, heights)),
+        ("Calculator.power", lambda ex: ex.map(Calculator.power, radii[:len(exponents)], exponents)),
+        ("Statistics.variance", lambda ex: ex.map(Statistics.variance, datasets)),
+    ]
+
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}, "
+          f"{os.cpu_count()} CPUs, {args.size} elements")
+    for name, run in cases:
+        baseline = None
+        for workers in worker_counts:
+            with BatchExecutor(workers=workers) as executor:
+                start = time.perf_counter()
+                run(executor)
+                elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"  {name:30} {workers:3} workers  {elapsed:8.3f} s  {baseline / elapsed:5.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Benchmark batch haversine and geohash radius queries against naive evaluation.
+
+The naive baseline calls Geodesic.haversine once per pair, converting
+degrees and recomputing cos(latitude) every time.
+
+Usage: python benchmarks/bench_geodesic.py [--points N] [--queries Q] [--radius KM]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from mathlib.geodesic import GeohashIndex, GeoPoints, Geodesic
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--radius", type=float, default=50.0, help="query radius in km")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    lats = [rng.uniform(35, 60) for _ in range(args.points)]
+    lons = [rng.uniform(-10, 30) for _ in range(args.points)]
+    queries = [(rng.uniform(35, 60), rng.uniform(-10, 30)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    naive = [[Geodesic.haversine(qlat, qlon, lat, lon) for lat, lon in zip(lats, lons)]
+             for qlat, qlon in queries]
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    points = GeoPoints(lats, lons)
+    prepare_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = [points.haversine_from(qlat, qlon) for qlat, qlon in queries]
+    batch_time = time.perf_counter() - start
+    assert all(abs(a - b) < 1e-6 for row_a, row_b in zip(naive, batch) for a, b in zip(row_a, row_b))
+
+    start = time.perf_counter()
+    index = GeohashIndex()
+    for key, (lat, lon) in enumerate(zip(lats, lons)):
+        index.add(key, lat, lon)
+    index.within_radius(*queries[0], args.radius)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    found = [index.within_radius(qlat, qlon, args.radius) for qlat, qlon in queries]
+    index_time = time.perf_counter() - start
+    for row, hits in zip(naive, found):
+        assert sorted(key for _, key in hits) == [i for i, d in enumerate(row) if d <= args.radius]
+
+    per_query = 1000 / args.queries
+    print(f"{args.points} points, {args.queries} queries, radius {args.radius} km")
+    print(f"  naive pairwise haversine   {naive_time * per_query:10.2f} ms/query")
+    print(f"  GeoPoints batch haversine  {batch_time * per_query:10.2f} ms/query"
+          f"  (prepare {prepare_time:.3f} s)")
+    print(f"  GeohashIndex radius query  {index_time * per_query:10.2f} ms/query"
+          f"  (build {build_time:.3f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
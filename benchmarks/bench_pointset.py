@@ -0,0 +1,74 @@
+"""
+Benchmark point-set algorithms against brute-force pairwise approaches.
+
+Closest pair is compared with calling Geometry.distance_between_points on
+every pair; the convex hull with the O(n^3) "every pair is an edge if all
+other points lie on one side" test, which is only run at small sizes.
+
+Usage: python benchmarks/bench_pointset.py [--sizes N ...]
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import time
+
+from mathlib.geometry import Geometry
+from mathlib.pointset import PointSet
+
+# Largest size at which the cubic brute-force hull is run
+MAX_BRUTE_HULL = 200
+
+
+def timed(func, *args):
+    """Return func(*args) and the time it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def brute_closest_pair(coords):
+    """Return (distance, i, j) of the closest pair by checking every pair."""
+    n = len(coords) // 2
+    return min((Geometry.distance_between_points(coords[2 * i], coords[2 * i + 1],
+                                                 coords[2 * j], coords[2 * j + 1]), i, j)
+               for i, j in itertools.combinations(range(n), 2))
+
+
+def brute_hull_size(coords):
+    """Return the number of hull vertices found with the cubic edge test."""
+    points = list(zip(coords[0::2], coords[1::2]))
+    vertices = set()
+    for (i, a), (j, b) in itertools.permutations(enumerate(points), 2):
+        if all((b[0] - a[0]) * (p[1] - a[1]) - (b[1] - a[1]) * (p[0] - a[0]) > 0
+               for k, p in enumerate(points) if k not in (i, j)):
+            vertices.update((i, j))
+    return len(vertices)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 1000, 3000])
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    print(f"{'points':>8}{'pair brute s':>14}{'pair d&c s':>12}{'hull brute s':>14}{'hull s':>10}")
+    for n in args.sizes:
+        coords = [rng.uniform(0, 1000) for _ in range(2 * n)]
+        fast_pair, pair_time = timed(PointSet.closest_pair, coords)
+        slow_pair, brute_pair_time = timed(brute_closest_pair, coords)
+        assert fast_pair[1:] == slow_pair[1:]
+        hull, hull_time = timed(PointSet.convex_hull, coords)
+        brute_hull = "-"
+        if n <= MAX_BRUTE_HULL:
+            size, elapsed = timed(brute_hull_size, coords)
+            assert size == len(hull)
+            brute_hull = f"{elapsed:.4f}"
+        print(f"{n:>8}{brute_pair_time:>14.4f}{pair_time:>12.4f}{brute_hull:>14}{hull_time:>10.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Benchmark approximate statistics against exact Statistics over a large dataset.
+
+Usage: python benchmarks/bench_sampling.py [--size N] [--tolerance T]
+"""
+
+import argparse
+import random
+import sys
+import time
+from array import array
+
+from mathlib.sampling import ApproximateStatistics, Reservoir
+from mathlib.statistics import Statistics
+
+
+def timed(func):
+    """Return func's result and the seconds it took."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=5_000_000)
+    parser.add_argument("--tolerance", type=float, default=0.05, help="margin for the mean")
+    parser.add_argument("--reservoir", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(2)
+    data = array("d", (rng.lognormvariate(1, 0.8) for _ in range(args.size)))
+
+    exact_mean, mean_time = timed(lambda: Statistics.mean(data))
+    exact_median, median_time = timed(lambda: Statistics.median(data))
+    reservoir = Reservoir(args.reservoir, seed=1)
+    _, reservoir_time = timed(lambda: reservoir.extend(data))
+    median, approx_median_time = timed(lambda: ApproximateStatistics.median(reservoir.sample))
+    mean, until_time = timed(lambda: ApproximateStatistics.sample_until(data, args.tolerance, seed=3))
+
+    print(f"{args.size} values")
+    print(f"  exact mean                {mean_time:8.3f} s  {exact_mean:.4f}")
+    print(f"  sample_until mean         {until_time:8.3f} s  {mean.value:.4f} ± {mean.margin:.4f}"
+          f"  ({mean.n} rows)")
+    print(f"  exact median              {median_time:8.3f} s  {exact_median:.4f}")
+    print(f"  Algorithm L reservoir     {reservoir_time:8.3f} s  (k={args.reservoir}, one pass)")
+    print(f"  reservoir median          {approx_median_time:8.3f} s  {median.value:.4f}"
+          f"  [{median.low:.4f}, {median.high:.4f}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Load-test the JSON-RPC compute server and report p50/p99 latency.
+
+Without --port a local server is started for each batching setting, so the
+effect of micro-batching can be compared; with --port an already running
+server (python -m mathlib.server) is loaded instead.
+
+Usage: python benchmarks/bench_server.py [--requests N] [--concurrency C] [--port PORT]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from mathlib.server import ComputeClient, ComputeServer, measure_latency
+from mathlib.statistics import Statistics
+
+
+async def load(host, port, calls, concurrency, connections):
+    """Spread the calls over several connections and return all latencies."""
+    clients = [await ComputeClient.connect(host, port) for _ in range(connections)]
+    share = -(-len(calls) // connections)
+    start = time.perf_counter()
+    parts = await asyncio.gather(*(
+        measure_latency(client, calls[i * share:(i + 1) * share], max(1, concurrency // connections))
+        for i, client in enumerate(clients)))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    return [latency for part in parts for latency in part], elapsed
+
+
+def report(label, latencies, elapsed):
+    """Print latency percentiles and throughput."""
+    p50 = Statistics.percentile(latencies, 50) * 1000
+    p99 = Statistics.percentile(latencies, 99) * 1000
+    print(f"  {label:28} p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  {len(latencies) / elapsed:9.0f} req/s")
+
+
+async def run(args):
+    """Run the load test against a remote or local server."""
+    rng = random.Random(5)
+    calls = [rng.choice([("Calculator.add", [rng.random(), rng.random()]),
+                         ("Geometry.circle_area", [rng.uniform(0, 10)]),
+                         ("Statistics.mean", [[rng.random() for _ in range(20)]])])
+             for _ in range(args.requests)]
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.connections} connections")
+    if args.port:
+        report(f"{args.host}:{args.port}", *await load(args.host, args.port, calls,
+                                                       args.concurrency, args.connections))
+        return
+    for max_batch, max_delay in [(1, 0.0), (64, 0.001), (256, 0.005)]:
+        server = ComputeServer(workers=args.workers, max_batch=max_batch, max_delay=max_delay)
+        await server.start()
+        async with server:
+            latencies, elapsed = await load(*server.address[:2], calls,
+                                            args.concurrency, args.connections)
+        report(f"max_batch={max_batch} delay={max_delay * 1000:g}ms", latencies, elapsed)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None, help="local server pool size")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="load an already running server")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
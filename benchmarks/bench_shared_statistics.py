@@ -0,0 +1,61 @@
+"""
+Benchmark shared-memory Statistics reductions against serial and pickled slices.
+
+The pickled baseline sends each worker a copy of its slice of the list, as
+a plain ProcessPoolExecutor.map over the data would.
+
+Usage: python benchmarks/bench_shared_statistics.py [--size N] [--workers W]
+"""
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from mathlib.shared_statistics import SharedDataset
+from mathlib.statistics import Statistics
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=5_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    numbers = [rng.gauss(0, 1) for _ in range(args.size)]
+
+    start = time.perf_counter()
+    serial = (Statistics.mean(numbers), Statistics.variance(numbers), Statistics.median(numbers))
+    serial_time = time.perf_counter() - start
+
+    step = -(-args.size // args.workers)
+    slices = [numbers[i:i + step] for i in range(0, args.size, step)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        list(pool.map(Statistics.variance, slices))
+    pickled_time = time.perf_counter() - start
+    pickled_bytes = sum(len(pickle.dumps(part)) for part in slices)
+
+    start = time.perf_counter()
+    with SharedDataset(numbers, workers=args.workers) as dataset:
+        setup_time = time.perf_counter() - start
+        shared = (dataset.mean(), dataset.variance(), dataset.median())
+    shared_time = time.perf_counter() - start
+    assert abs(shared[1] - serial[1]) < 1e-9 and shared[2] == serial[2]
+
+    print(f"{args.size} values, {args.workers} workers")
+    print(f"  serial mean/variance/median        {serial_time:8.3f} s")
+    print(f"  pickled slices, variance only      {pickled_time:8.3f} s"
+          f"  ({pickled_bytes / 1e6:.0f} MB sent to workers)")
+    print(f"  SharedDataset mean/variance/median {shared_time:8.3f} s"
+          f"  (setup {setup_time:.3f} s, {8 * args.size / 1e6:.0f} MB shared once)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Benchmark KD-tree nearest-neighbour queries against a brute-force scan.
+
+The brute-force baseline calls Geometry.distance_between_points for every
+candidate point, which is what callers had to do before the index existed.
+
+Usage: python benchmarks/bench_spatial.py [--queries Q] [--sizes N ...]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from mathlib.geometry import Geometry
+from mathlib.spatial import KDTree
+
+
+def brute_force_nearest(xs, ys, qx, qy):
+    """Return the index of the point closest to (qx, qy)."""
+    distance = Geometry.distance_between_points
+    return min(range(len(xs)), key=lambda i: distance(qx, qy, xs[i], ys[i]))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=200, help="queries per size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'points':>8}{'build s':>10}{'brute ms/q':>12}{'kdtree ms/q':>13}{'speedup':>10}")
+    for n in args.sizes:
+        coords = [rng.uniform(0, 1000) for _ in range(2 * n)]
+        queries = [rng.uniform(0, 1000) for _ in range(2 * args.queries)]
+        xs, ys = coords[0::2], coords[1::2]
+
+        start = time.perf_counter()
+        tree = KDTree(coords)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed = [i for (_, i), in tree.nearest_many(queries)]
+        tree_ms = (time.perf_counter() - start) / args.queries * 1000
+
+        start = time.perf_counter()
+        brute = [brute_force_nearest(xs, ys, queries[q], queries[q + 1])
+                 for q in range(0, len(queries), 2)]
+        brute_ms = (time.perf_counter() - start) / args.queries * 1000
+
+        assert indexed == brute
+        print(f"{n:>8}{build:>10.3f}{brute_ms:>12.3f}{tree_ms:>13.3f}{brute_ms / tree_ms:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
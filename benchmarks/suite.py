@@ -0,0 +1,164 @@
+"""
+Benchmark every public Calculator, Statistics and Geometry method at several sizes.
+
+Results can be saved as a JSON baseline and later runs compared against it;
+the exit code is 1 when a case is significantly slower than its baseline.
+Calculator and Geometry cases time a batch of ``size`` calls on varied
+inputs, Statistics cases time one call on a list of ``size`` values.
+
+With --memory every case is also run once under tracemalloc and its peak
+additional allocation is reported (and saved) in bytes per input element,
+which exposes hidden copies such as the ``sorted()`` list in median.
+
+Usage: python benchmarks/suite.py [--save FILE] [--compare FILE] [--filter TEXT] [--sizes 100,1000] [--memory]
+"""
+
+import argparse
+import inspect
+import random
+import re
+import sys
+from collections import deque
+from itertools import starmap
+
+from mathlib.benchmark import compare, load_baseline, measure_all, save_baseline
+from mathlib.memory import trace_memory
+from mathlib.calculator import Calculator
+from mathlib.geometry import Geometry
+from mathlib.statistics import Statistics
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+
+def positive(rng):
+    """Return a positive float."""
+    return rng.uniform(0.1, 100)
+
+
+# Argument generators for one call of each scalar method
+SCALAR_ARGS = {
+    "Calculator.add": lambda rng: (rng.uniform(-1e6, 1e6), rng.uniform(-1e6, 1e6)),
+    "Calculator.subtract": lambda rng: (rng.uniform(-1e6, 1e6), rng.uniform(-1e6, 1e6)),
+    "Calculator.multiply": lambda rng: (rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3)),
+    "Calculator.divide": lambda rng: (rng.uniform(-1e6, 1e6), positive(rng)),
+    "Calculator.power": lambda rng: (rng.randint(2, 9), rng.randint(0, 30)),
+    "Calculator.square_root": lambda rng: (positive(rng),),
+    "Calculator.factorial": lambda rng: (rng.randint(0, 50),),
+    "Calculator.modulo": lambda rng: (rng.randint(0, 10 ** 6), rng.randint(1, 1000)),
+    "Geometry.circle_area": lambda rng: (positive(rng),),
+    "Geometry.circle_circumference": lambda rng: (positive(rng),),
+    "Geometry.rectangle_area": lambda rng: (positive(rng), positive(rng)),
+    "Geometry.rectangle_perimeter": lambda rng: (positive(rng), positive(rng)),
+    "Geometry.triangle_area": lambda rng: (positive(rng), positive(rng)),
+    "Geometry.pythagorean_theorem": lambda rng: (positive(rng), positive(rng)),
+    "Geometry.sphere_volume": lambda rng: (positive(rng),),
+    "Geometry.sphere_surface_area": lambda rng: (positive(rng),),
+    "Geometry.cylinder_volume": lambda rng: (positive(rng), positive(rng)),
+    "Geometry.distance_between_points": lambda rng: tuple(rng.uniform(-100, 100) for _ in range(4)),
+}
+
+# Extra arguments after the data list for each Statistics method
+STATISTICS_ARGS = {
+    "Statistics.mean": (),
+    "Statistics.median": (),
+    "Statistics.mode": (),
+    "Statistics.variance": (),
+    "Statistics.standard_deviation": (),
+    "Statistics.range_value": (),
+    "Statistics.percentile": (90,),
+}
+
+
+def public_methods():
+    """Return every public method of the benchmarked classes, as "Class.method"."""
+    return {
+        f"{cls.__name__}.{name}": getattr(cls, name)
+        for cls in (Calculator, Statistics, Geometry)
+        for name, _ in inspect.getmembers(cls, inspect.isfunction)
+        if not name.startswith("_")
+    }
+
+
+def build_cases(sizes, seed=0):
+    """Build a zero-argument callable per (method, size) case.
+
+    Raises:
+        KeyError: If a public method has no argument generator
+    """
+    cases = {}
+    for name, func in public_methods().items():
+        for size in sizes:
+            rng = random.Random(f"{seed}:{name}:{size}")
+            if name in STATISTICS_ARGS:
+                # Integers keep Statistics.mode meaningful; other methods don't care
+                data = [rng.randint(0, size) for _ in range(size)]
+                extra = STATISTICS_ARGS[name]
+                cases[f"{name}[n={size}]"] = lambda f=func, d=data, e=extra: f(d, *e)
+            else:
+                # Results are discarded so --memory measures the calls, not a result list
+                calls = [SCALAR_ARGS[name](rng) for _ in range(size)]
+                cases[f"{name}[n={size}]"] = lambda f=func, c=calls: deque(starmap(f, c), maxlen=0)
+    return cases
+
+
+def bytes_per_element(cases):
+    """Run every case once under tracemalloc and divide its peak by the case size."""
+    result = {}
+    for name, case in cases.items():
+        size = int(re.search(r"\[n=(\d+)\]", name).group(1))
+        _, usage = trace_memory(case, sites=False)
+        result[name] = usage.peak / size
+    return result
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated input sizes")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains TEXT")
+    parser.add_argument("--repeat", type=int, default=7, help="samples per case")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown tolerated before failing (default: 0.10)")
+    parser.add_argument("--no-normalize", action="store_true",
+                        help="do not divide out machine-wide drift between runs")
+    parser.add_argument("--memory", action="store_true",
+                        help="also record peak bytes per element with tracemalloc")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    cases = {name: case for name, case in build_cases(sizes).items() if args.filter in name}
+    baseline = load_baseline(args.compare) if args.compare else {}
+
+    print(f"Timing {len(cases)} cases in {args.repeat} interleaved rounds", flush=True)
+    timings = measure_all(cases, repeat=args.repeat)
+    memory = bytes_per_element(cases) if args.memory else {}
+    for name, timing in timings.items():
+        line = f"{name:45} {timing.median * 1e6:12.2f} us  ±{timing.spread * 100:5.1f}%"
+        if name in memory:
+            line += f"  {memory[name]:9.1f} B/elem"
+        print(line)
+
+    if args.save:
+        save_baseline(args.save, timings, memory)
+        print(f"Saved {len(timings)} results to {args.save}")
+    if not args.compare:
+        return 0
+
+    results = compare(timings, baseline, threshold=args.threshold,
+                      normalize=not args.no_normalize)
+    regressions = [r for r in results if r.status == "regression"]
+    print(f"\nCompared with {args.compare} (threshold {args.threshold:.0%}):")
+    for result in results:
+        if result.status != "unchanged":
+            print(f"  {result.status:12} {result.name:45} {result.ratio:6.2f}x  p={result.p_value:.4f}")
+    print(f"  {len(regressions)} regression(s), "
+          f"{sum(r.status == 'improvement' for r in results)} improvement(s), "
+          f"{sum(r.status == 'unchanged' for r in results)} unchanged")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
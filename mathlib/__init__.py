@@ -5,4 +5,126 @@ This package contains various mathematical modules for calculations,
 statistics, and geometry operations.
 """
 
+import importlib as _importlib
+import os as _os
+
+# Recognised by type checkers without importing typing, which is slow to load
+TYPE_CHECKING = False
+
 __version__ = "0.1.0"
+
+# Public names and the module defining them. Nothing below is imported until
+# it is first accessed (PEP 562), so ``import mathlib`` stays cheap for
+# short-lived processes however many modules, indexes or optional backends
+# the package grows.
+_EXPORTS = {
+    "Calculator": "mathlib.calculator",
+    "Geometry": "mathlib.geometry",
+    "Statistics": "mathlib.statistics",
+    "BatchGeometry": "mathlib.batch_geometry",
+    "BatchValidationError": "mathlib.batch_geometry",
+    "BatchExecutor": "mathlib.executor",
+    "BivariateStatistics": "mathlib.bivariate",
+    "CoMoments": "mathlib.bivariate",
+    "LinearFit": "mathlib.bivariate",
+    "PersistentCache": "mathlib.cache",
+    "Distance": "mathlib.distance",
+    "PointSet": "mathlib.pointset",
+    "KDTree": "mathlib.spatial",
+    "SpatialHashGrid": "mathlib.spatial",
+    "GeoPoints": "mathlib.geodesic",
+    "Geodesic": "mathlib.geodesic",
+    "GeohashIndex": "mathlib.geodesic",
+    "Histogram": "mathlib.histogram",
+    "ShapeStore": "mathlib.shape_store",
+    "ShapeView": "mathlib.shape_store",
+    "ShapeCatalog": "mathlib.catalog",
+    "SharedDataset": "mathlib.shared_statistics",
+    "ColumnarReader": "mathlib.columnar",
+    "ColumnarWriter": "mathlib.columnar",
+    "ApproximateStatistics": "mathlib.sampling",
+    "Estimate": "mathlib.sampling",
+    "Reservoir": "mathlib.sampling",
+    "StratifiedSample": "mathlib.sampling",
+    "ComputeClient": "mathlib.server",
+    "ComputeServer": "mathlib.server",
+    "RPCError": "mathlib.server",
+    "TraceRecorder": "mathlib.trace",
+    "UncheckedCalculator": "mathlib.validated",
+    "UncheckedGeometry": "mathlib.batch_geometry",
+    "UncheckedStatistics": "mathlib.validated",
+    "ValidatedColumn": "mathlib.validated",
+}
+
+_SUBMODULES = {
+    "batch_geometry", "benchmark", "bivariate", "bootstrap", "cache", "calculator", "catalog",
+    "cli", "columnar", "distance", "executor", "geodesic", "geometry", "histogram",
+    "instrumentation", "memory", "pointset", "sampling", "server", "shape_store",
+    "shared_statistics", "spatial", "statistics", "trace", "validated",
+}
+
+# Listed literally, rather than derived from _EXPORTS, so that linters see the
+# TYPE_CHECKING imports below as re-exports
+__all__ = [
+    "ApproximateStatistics", "BatchExecutor", "BatchGeometry", "BatchValidationError",
+    "BivariateStatistics", "Calculator", "CoMoments", "ColumnarReader", "ColumnarWriter",
+    "ComputeClient", "ComputeServer", "Distance", "Estimate", "GeoPoints", "Geodesic",
+    "GeohashIndex", "Geometry", "Histogram", "KDTree", "LinearFit", "PersistentCache", "PointSet",
+    "RPCError", "Reservoir", "ShapeCatalog", "ShapeStore", "ShapeView", "SharedDataset",
+    "SpatialHashGrid", "Statistics", "StratifiedSample", "TraceRecorder", "UncheckedCalculator",
+    "UncheckedGeometry", "UncheckedStatistics", "ValidatedColumn",
+]
+
+if TYPE_CHECKING:
+    from mathlib.batch_geometry import BatchGeometry, BatchValidationError, UncheckedGeometry
+    from mathlib.bivariate import BivariateStatistics, CoMoments, LinearFit
+    from mathlib.cache import PersistentCache
+    from mathlib.calculator import Calculator
+    from mathlib.catalog import ShapeCatalog
+    from mathlib.columnar import ColumnarReader, ColumnarWriter
+    from mathlib.distance import Distance
+    from mathlib.executor import BatchExecutor
+    from mathlib.geodesic import GeohashIndex, Geodesic, GeoPoints
+    from mathlib.geometry import Geometry
+    from mathlib.histogram import Histogram
+    from mathlib.pointset import PointSet
+    from mathlib.sampling import ApproximateStatistics, Estimate, Reservoir, StratifiedSample
+    from mathlib.server import ComputeClient, ComputeServer, RPCError
+    from mathlib.shape_store import ShapeStore, ShapeView
+    from mathlib.shared_statistics import SharedDataset
+    from mathlib.spatial import KDTree, SpatialHashGrid
+    from mathlib.statistics import Statistics
+    from mathlib.trace import TraceRecorder
+    from mathlib.validated import UncheckedCalculator, UncheckedStatistics, ValidatedColumn
+
+
+def __getattr__(name: str):
+    """Import a public name or submodule on first access and cache it."""
+    if name in _EXPORTS:
+        value = getattr(_importlib.import_module(_EXPORTS[name]), name)
+    elif name in _SUBMODULES:
+        value = _importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
+
+
+_mode = _os.environ.get("MATHLIB_INSTRUMENT", "").lower()
+if _mode in ("1", "true", "yes", "on", "memory"):
+    from mathlib import instrumentation as _instrumentation
+
+    _instrumentation.enable(memory=_mode == "memory")
+
+if _os.environ.get("MATHLIB_TRACE"):
+    import atexit as _atexit
+
+    from mathlib.trace import TraceRecorder as _TraceRecorder
+
+    _recorder = _TraceRecorder(_os.environ["MATHLIB_TRACE"])
+    _recorder.start()
+    _atexit.register(_recorder.stop)
@@ -0,0 +1,341 @@
+"""
+Batch geometry module for computing shape metrics over columns of dimensions.
+"""
+import math
+import operator
+from array import array
+from itertools import repeat
+from typing import List, MutableSequence, Optional, Sequence, Union
+
+Column = Sequence[Union[int, float]]
+
+# Positions listed in a BatchValidationError message before it is truncated
+_MAX_REPORTED = 10
+
+
+class BatchValidationError(ValueError):
+    """Raised when elements of a batch fail validation.
+
+    Attributes:
+        reason: The validation message without the list of positions
+        indices: Sorted positions of every offending element
+    """
+
+    def __init__(self, message: str, indices: List[int]):
+        shown = ", ".join(str(i) for i in indices[:_MAX_REPORTED])
+        if len(indices) > _MAX_REPORTED:
+            shown += f", ... ({len(indices)} total)"
+        super().__init__(f"{message} (at indices {shown})")
+        self.reason = message
+        self.indices = indices
+
+
+def _check_non_negative(message: str, *columns: Column) -> int:
+    n = len(columns[0])
+    if any(len(column) != n for column in columns):
+        raise ValueError("Columns must have the same length")
+    # ValidatedColumns list the checks they already passed in .constraints.
+    # One comparison per value; unlike min(), a NaN cannot hide a negative.
+    if any(any(map(operator.lt, column, repeat(0))) for column in columns
+           if "non_negative" not in getattr(column, "constraints", ())):
+        bad = set()
+        for column in columns:
+            bad.update(i for i, value in enumerate(column) if value < 0)
+        raise BatchValidationError(message, sorted(bad))
+    return n
+
+
+def _store(values: List[float], n: int,
+           out: Optional[MutableSequence[float]]) -> MutableSequence[float]:
+    if out is None:
+        return array("d", values)
+    if len(out) < n:
+        raise ValueError("Output buffer is too small")
+    out[:n] = array("d", values)
+    return out
+
+
+class UncheckedGeometry:
+    """The BatchGeometry kernels without any argument checks.
+
+    Each method assumes its columns have the same length and hold valid
+    dimensions, for example because they are ValidatedColumns from
+    ``mathlib.validated.validate()``; invalid input gives meaningless
+    results instead of an error. BatchGeometry validates its arguments
+    and then calls these kernels.
+    """
+
+    @staticmethod
+    def circle_area(radii: Column,
+                    out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the areas of circles; see BatchGeometry.circle_area()."""
+        k = math.pi
+        return _store([k * (r * r) for r in radii], len(radii), out)
+
+    @staticmethod
+    def circle_circumference(radii: Column,
+                             out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the circumferences of circles; see BatchGeometry.circle_circumference()."""
+        k = 2 * math.pi
+        return _store([k * r for r in radii], len(radii), out)
+
+    @staticmethod
+    def rectangle_area(lengths: Column, widths: Column,
+                       out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the areas of rectangles; see BatchGeometry.rectangle_area()."""
+        return _store([a * b for a, b in zip(lengths, widths)], len(lengths), out)
+
+    @staticmethod
+    def rectangle_perimeter(lengths: Column, widths: Column,
+                            out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the perimeters of rectangles; see BatchGeometry.rectangle_perimeter()."""
+        return _store([2 * (a + b) for a, b in zip(lengths, widths)], len(lengths), out)
+
+    @staticmethod
+    def triangle_area(bases: Column, heights: Column,
+                      out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the areas of triangles; see BatchGeometry.triangle_area()."""
+        return _store([0.5 * b * h for b, h in zip(bases, heights)], len(bases), out)
+
+    @staticmethod
+    def pythagorean_theorem(a: Column, b: Column,
+                            out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the hypotenuses of right triangles; see BatchGeometry.pythagorean_theorem()."""
+        sqrt = math.sqrt
+        return _store([sqrt(x * x + y * y) for x, y in zip(a, b)], len(a), out)
+
+    @staticmethod
+    def sphere_volume(radii: Column,
+                      out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the volumes of spheres; see BatchGeometry.sphere_volume()."""
+        k = (4 / 3) * math.pi
+        return _store([k * (r * r * r) for r in radii], len(radii), out)
+
+    @staticmethod
+    def sphere_surface_area(radii: Column,
+                            out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the surface areas of spheres; see BatchGeometry.sphere_surface_area()."""
+        k = 4 * math.pi
+        return _store([k * (r * r) for r in radii], len(radii), out)
+
+    @staticmethod
+    def cylinder_volume(radii: Column, heights: Column,
+                        out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the volumes of cylinders; see BatchGeometry.cylinder_volume()."""
+        k = math.pi
+        return _store([k * (r * r) * h for r, h in zip(radii, heights)], len(radii), out)
+
+    @staticmethod
+    def distance_between_points(x1: Column, y1: Column, x2: Column, y2: Column,
+                                out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the distances between pairs of points; see BatchGeometry.distance_between_points()."""
+        sqrt = math.sqrt
+        return _store([sqrt((c - a) * (c - a) + (d - b) * (d - b))
+                       for a, b, c, d in zip(x1, y1, x2, y2)], len(x1), out)
+
+
+class BatchGeometry:
+    """Column-wise counterparts of the Geometry methods.
+
+    Each method takes equally sized sequences of dimensions (lists,
+    ``array('d')`` or memoryviews), validates every column in one pass and
+    returns the results as an ``array('d')``, so the per-element cost is a
+    single arithmetic expression instead of a method call plus argument
+    checks. Pass ``out`` to write the results into a preallocated buffer.
+    """
+
+    @staticmethod
+    def circle_area(radii: Column, out: Optional[MutableSequence[float]] = None
+                    ) -> MutableSequence[float]:
+        """Calculate the areas of many circles.
+
+        Args:
+            radii: The radii of the circles
+            out: Optional buffer of at least len(radii) floats to write into
+
+        Returns:
+            The areas of the circles
+
+        Raises:
+            BatchValidationError: If any radius is negative
+        """
+        _check_non_negative("Radius cannot be negative", radii)
+        return UncheckedGeometry.circle_area(radii, out=out)
+
+    @staticmethod
+    def circle_circumference(radii: Column, out: Optional[MutableSequence[float]] = None
+                             ) -> MutableSequence[float]:
+        """Calculate the circumferences of many circles.
+
+        Args:
+            radii: The radii of the circles
+            out: Optional buffer of at least len(radii) floats to write into
+
+        Returns:
+            The circumferences of the circles
+
+        Raises:
+            BatchValidationError: If any radius is negative
+        """
+        _check_non_negative("Radius cannot be negative", radii)
+        return UncheckedGeometry.circle_circumference(radii, out=out)
+
+    @staticmethod
+    def rectangle_area(lengths: Column, widths: Column,
+                       out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the areas of many rectangles.
+
+        Args:
+            lengths: The lengths of the rectangles
+            widths: The widths of the rectangles
+            out: Optional buffer of at least len(lengths) floats to write into
+
+        Returns:
+            The areas of the rectangles
+
+        Raises:
+            ValueError: If the columns differ in length
+            BatchValidationError: If any length or width is negative
+        """
+        _check_non_negative("Length and width cannot be negative", lengths, widths)
+        return UncheckedGeometry.rectangle_area(lengths, widths, out=out)
+
+    @staticmethod
+    def rectangle_perimeter(lengths: Column, widths: Column,
+                            out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the perimeters of many rectangles.
+
+        Args:
+            lengths: The lengths of the rectangles
+            widths: The widths of the rectangles
+            out: Optional buffer of at least len(lengths) floats to write into
+
+        Returns:
+            The perimeters of the rectangles
+
+        Raises:
+            ValueError: If the columns differ in length
+            BatchValidationError: If any length or width is negative
+        """
+        _check_non_negative("Length and width cannot be negative", lengths, widths)
+        return UncheckedGeometry.rectangle_perimeter(lengths, widths, out=out)
+
+    @staticmethod
+    def triangle_area(bases: Column, heights: Column,
+                      out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the areas of many triangles.
+
+        Args:
+            bases: The bases of the triangles
+            heights: The heights of the triangles
+            out: Optional buffer of at least len(bases) floats to write into
+
+        Returns:
+            The areas of the triangles
+
+        Raises:
+            ValueError: If the columns differ in length
+            BatchValidationError: If any base or height is negative
+        """
+        _check_non_negative("Base and height cannot be negative", bases, heights)
+        return UncheckedGeometry.triangle_area(bases, heights, out=out)
+
+    @staticmethod
+    def pythagorean_theorem(a: Column, b: Column,
+                            out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the hypotenuses of many right triangles.
+
+        Args:
+            a: Lengths of the first sides
+            b: Lengths of the second sides
+            out: Optional buffer of at least len(a) floats to write into
+
+        Returns:
+            The lengths of the hypotenuses
+
+        Raises:
+            ValueError: If the columns differ in length
+            BatchValidationError: If any side length is negative
+        """
+        _check_non_negative("Side lengths cannot be negative", a, b)
+        return UncheckedGeometry.pythagorean_theorem(a, b, out=out)
+
+    @staticmethod
+    def sphere_volume(radii: Column, out: Optional[MutableSequence[float]] = None
+                      ) -> MutableSequence[float]:
+        """Calculate the volumes of many spheres.
+
+        Args:
+            radii: The radii of the spheres
+            out: Optional buffer of at least len(radii) floats to write into
+
+        Returns:
+            The volumes of the spheres
+
+        Raises:
+            BatchValidationError: If any radius is negative
+        """
+        _check_non_negative("Radius cannot be negative", radii)
+        return UncheckedGeometry.sphere_volume(radii, out=out)
+
+    @staticmethod
+    def sphere_surface_area(radii: Column, out: Optional[MutableSequence[float]] = None
+                            ) -> MutableSequence[float]:
+        """Calculate the surface areas of many spheres.
+
+        Args:
+            radii: The radii of the spheres
+            out: Optional buffer of at least len(radii) floats to write into
+
+        Returns:
+            The surface areas of the spheres
+
+        Raises:
+            BatchValidationError: If any radius is negative
+        """
+        _check_non_negative("Radius cannot be negative", radii)
+        return UncheckedGeometry.sphere_surface_area(radii, out=out)
+
+    @staticmethod
+    def cylinder_volume(radii: Column, heights: Column,
+                        out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the volumes of many cylinders.
+
+        Args:
+            radii: The radii of the cylinder bases
+            heights: The heights of the cylinders
+            out: Optional buffer of at least len(radii) floats to write into
+
+        Returns:
+            The volumes of the cylinders
+
+        Raises:
+            ValueError: If the columns differ in length
+            BatchValidationError: If any radius or height is negative
+        """
+        _check_non_negative("Radius and height cannot be negative", radii, heights)
+        return UncheckedGeometry.cylinder_volume(radii, heights, out=out)
+
+    @staticmethod
+    def distance_between_points(x1: Column, y1: Column, x2: Column, y2: Column,
+                                out: Optional[MutableSequence[float]] = None
+                                ) -> MutableSequence[float]:
+        """Calculate the Euclidean distances between many pairs of 2D points.
+
+        Args:
+            x1: X coordinates of the first points
+            y1: Y coordinates of the first points
+            x2: X coordinates of the second points
+            y2: Y coordinates of the second points
+            out: Optional buffer of at least len(x1) floats to write into
+
+        Returns:
+            The distances between the pairs of points
+
+        Raises:
+            ValueError: If the columns differ in length
+        """
+        n = len(x1)
+        if len(y1) != n or len(x2) != n or len(y2) != n:
+            raise ValueError("Columns must have the same length")
+        return UncheckedGeometry.distance_between_points(x1, y1, x2, y2, out=out)
@@ -0,0 +1,277 @@
+"""
+Benchmark module for timing functions and comparing runs against a baseline.
+"""
+import json
+import math
+import platform
+import sys
+import time
+import timeit
+from statistics import NormalDist
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from mathlib import __version__
+
+# Each timed sample runs the function often enough to take at least this long
+_MIN_SAMPLE_TIME = 0.01
+
+
+class Timing(NamedTuple):
+    """Per-call times of one benchmark case.
+
+    Attributes:
+        samples: Seconds per call, one value per repetition
+        number: Calls averaged into each sample
+    """
+
+    samples: List[float]
+    number: int
+
+    @property
+    def median(self) -> float:
+        """Median seconds per call."""
+        ordered = sorted(self.samples)
+        mid = len(ordered) // 2
+        return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+    @property
+    def spread(self) -> float:
+        """Median absolute deviation relative to the median."""
+        median = self.median
+        deviations = sorted(abs(s - median) for s in self.samples)
+        mid = len(deviations) // 2
+        mad = deviations[mid] if len(deviations) % 2 else (deviations[mid - 1] + deviations[mid]) / 2
+        return mad / median if median else 0.0
+
+
+class Comparison(NamedTuple):
+    """The outcome of comparing one case against its baseline.
+
+    Attributes:
+        name: The case name
+        ratio: Current median divided by baseline median
+        p_value: One-sided Mann-Whitney p-value for "current is slower"
+        status: "regression", "improvement", "unchanged" or "new"
+    """
+
+    name: str
+    ratio: float
+    p_value: float
+    status: str
+
+
+def _calibrate(timer: timeit.Timer) -> int:
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= _MIN_SAMPLE_TIME:
+            return number
+        number *= 10 if elapsed < _MIN_SAMPLE_TIME / 10 else 2
+
+
+def measure(func: Callable[[], Any], repeat: int = 7, number: Optional[int] = None) -> Timing:
+    """Time a function.
+
+    Args:
+        func: Zero-argument callable to time
+        repeat: Number of samples
+        number: Calls per sample (calibrated to about 10 ms when omitted)
+
+    Returns:
+        The per-call time of every sample
+
+    Raises:
+        ValueError: If repeat or number is not positive
+    """
+    if repeat < 1 or (number is not None and number < 1):
+        raise ValueError("Repeat and number must be positive")
+    timer = timeit.Timer(func)
+    number = number or _calibrate(timer)
+    samples = [t / number for t in timer.repeat(repeat, number)]
+    return Timing(samples, number)
+
+
+def measure_all(cases: Dict[str, Callable[[], Any]], repeat: int = 7,
+                progress: Optional[Callable[[int], None]] = None) -> Dict[str, Timing]:
+    """Time many functions in interleaved rounds.
+
+    Each round takes one sample of every case, so a slowdown of the machine
+    part way through a run spreads over all cases instead of landing on
+    whichever case happened to be running, which keeps the samples of a
+    case representative of the whole run.
+
+    Args:
+        cases: Zero-argument callables by name
+        repeat: Number of rounds
+        progress: Called with the round number after each round
+
+    Returns:
+        The timing of every case, in the order of cases
+
+    Raises:
+        ValueError: If repeat is not positive
+    """
+    if repeat < 1:
+        raise ValueError("Repeat and number must be positive")
+    timers = {name: timeit.Timer(func) for name, func in cases.items()}
+    numbers = {name: _calibrate(timer) for name, timer in timers.items()}
+    samples: Dict[str, List[float]] = {name: [] for name in cases}
+    for round_number in range(repeat):
+        for name, timer in timers.items():
+            samples[name].append(timer.timeit(numbers[name]) / numbers[name])
+        if progress is not None:
+            progress(round_number + 1)
+    return {name: Timing(samples[name], numbers[name]) for name in cases}
+
+
+def mann_whitney_p(current: List[float], baseline: List[float]) -> float:
+    """One-sided Mann-Whitney U test that current values tend to be larger.
+
+    Uses the normal approximation with a tie correction, which is adequate
+    from about five samples per side.
+
+    Returns:
+        The p-value; small values mean current is significantly larger
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(combined)
+    ties = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, side) in zip(ranks, combined) if side == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 0.5
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 1 - NormalDist().cdf(z)
+
+
+def growth_exponent(sizes: List[int], seconds: List[float]) -> float:
+    """Fit the exponent k of seconds ~ c * size**k.
+
+    The slope of a least-squares line through (log size, log seconds): about
+    1 for linear work, 2 for quadratic work. Divide the times by a known
+    factor first (such as log n) to test against other growth rates.
+
+    Raises:
+        ValueError: If fewer than two distinct sizes are given or a value is
+            not positive
+    """
+    if len(sizes) != len(seconds) or len(set(sizes)) < 2:
+        raise ValueError("At least two distinct sizes are required")
+    if min(sizes) <= 0 or min(seconds) <= 0:
+        raise ValueError("Sizes and times must be positive")
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(t) for t in seconds]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    covariance = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    return covariance / sum((x - x_mean) ** 2 for x in xs)
+
+
+def compare(current: Dict[str, Timing], baseline: Dict[str, Timing],
+            threshold: float = 0.10, alpha: float = 0.01,
+            normalize: bool = True) -> List[Comparison]:
+    """Compare a run against a baseline.
+
+    A case is a regression only if its median slowed down by more than
+    threshold *and* the slowdown is statistically significant, so a noisy
+    sample or a tiny but consistent drift does not fail the gate.
+
+    Samples within one run cannot show how much a whole machine speeds up
+    or slows down between runs (frequency scaling, noisy neighbours). With
+    normalize, the median ratio over all shared cases is taken as that
+    drift and divided out, so only cases that slowed down relative to the
+    rest are reported. Use normalize=False when every case is expected to
+    change together.
+
+    Args:
+        current: Timings of the new run, by case name
+        baseline: Timings of the baseline run, by case name
+        threshold: Relative slowdown tolerated, e.g. 0.10 for 10%
+        alpha: Significance level of the Mann-Whitney test
+        normalize: Divide out the machine-wide drift between the two runs
+
+    Returns:
+        One Comparison per current case, in the order of current
+    """
+    shared = [current[name].median / baseline[name].median
+              for name in current if name in baseline and baseline[name].median]
+    drift = 1.0
+    if normalize and len(shared) >= 5:
+        shared.sort()
+        mid = len(shared) // 2
+        drift = shared[mid] if len(shared) % 2 else (shared[mid - 1] + shared[mid]) / 2
+    results = []
+    for name, timing in current.items():
+        base = baseline.get(name)
+        if base is None:
+            results.append(Comparison(name, math.nan, math.nan, "new"))
+            continue
+        scaled = [sample * drift for sample in base.samples]
+        ratio = timing.median / (base.median * drift) if base.median else math.inf
+        slower = mann_whitney_p(timing.samples, scaled)
+        if ratio > 1 + threshold and slower < alpha:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold) and 1 - slower < alpha:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        results.append(Comparison(name, ratio, slower, status))
+    return results
+
+
+def save_baseline(path: str, timings: Dict[str, Timing],
+                  bytes_per_element: Optional[Dict[str, float]] = None) -> None:
+    """Write timings and details of the environment to a JSON file.
+
+    Args:
+        path: Location of the file
+        timings: Timings by case name
+        bytes_per_element: Peak additional memory per input element by case
+            name, stored next to the timings of those cases
+    """
+    document = {
+        "meta": {
+            "mathlib": __version__,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {name: {"samples": t.samples, "number": t.number, "median": t.median}
+                    for name, t in timings.items()},
+    }
+    for name, value in (bytes_per_element or {}).items():
+        if name in document["results"]:
+            document["results"][name]["bytes_per_element"] = value
+    with open(path, "w") as handle:
+        json.dump(document, handle, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Timing]:
+    """Read timings written by save_baseline().
+
+    Raises:
+        ValueError: If the file is not a baseline
+    """
+    with open(path) as handle:
+        document = json.load(handle)
+    try:
+        return {name: Timing(list(entry["samples"]), entry["number"])
+                for name, entry in document["results"].items()}
+    except (AttributeError, KeyError, TypeError):
+        raise ValueError(f"Not a benchmark baseline: {path}") from None
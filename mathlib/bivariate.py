@@ -0,0 +1,264 @@
+"""
+Bivariate module for covariance, correlation and linear regression over paired values.
+"""
+import math
+from array import array
+from itertools import islice, zip_longest
+from typing import Iterable, NamedTuple, Optional, Sequence, Union
+
+Number = Union[int, float]
+
+# Pairs buffered from an iterator before they are folded into the totals
+_CHUNK = 65536
+
+_MISSING = object()
+
+# Inputs that are sliced into chunks rather than read through an iterator
+_SIZED = (Sequence, array, memoryview)
+
+
+class LinearFit(NamedTuple):
+    """A least-squares line y = slope * x + intercept.
+
+    Attributes:
+        slope: Change in y per unit of x
+        intercept: Value of y at x = 0
+        r_squared: Share of the variance of y explained by the line
+        n: Number of pairs the fit is based on
+    """
+
+    slope: float
+    intercept: float
+    r_squared: float
+    n: int
+
+    def predict(self, x: Number) -> float:
+        """Return the fitted y for an x."""
+        return self.slope * x + self.intercept
+
+
+class CoMoments:
+    """Streaming count, means and (co-)moments of paired values.
+
+    Pairs are folded in one pass: add() applies Welford's update for a
+    single pair, and extend() sums each chunk of pairs with two passes over
+    the buffered chunk before merging it in, which is both faster and more
+    accurate than updating pair by pair. Accumulators built over separate
+    chunks or in separate workers (they can be pickled) are combined with
+    merge(), using the pairwise formulas of Chan et al. extended with the
+    co-moment term.
+    """
+
+    def __init__(self):
+        """Create an empty accumulator."""
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def __repr__(self) -> str:
+        return (f"CoMoments(n={self.n}, mean_x={self.mean_x!r}, mean_y={self.mean_y!r}, "
+                f"m2_x={self.m2_x!r}, m2_y={self.m2_y!r}, c_xy={self.c_xy!r})")
+
+    def add(self, x: Number, y: Number) -> None:
+        """Fold in one pair."""
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def extend(self, xs: Iterable[Number], ys: Iterable[Number]) -> None:
+        """Fold in paired values from two iterables or buffers.
+
+        Raises:
+            ValueError: If the two run out at different lengths
+        """
+        if isinstance(xs, _SIZED) and isinstance(ys, _SIZED):
+            if len(xs) != len(ys):
+                raise ValueError("Columns must have the same length")
+            for start in range(0, len(xs), _CHUNK):
+                self._fold(xs[start:start + _CHUNK], ys[start:start + _CHUNK])
+            return
+        pairs = zip_longest(xs, ys, fillvalue=_MISSING)
+        while True:
+            chunk = list(islice(pairs, _CHUNK))
+            if not chunk:
+                return
+            # Only the pairs after the shorter input ran out hold the filler
+            if _MISSING in chunk[-1]:
+                raise ValueError("Columns must have the same length")
+            chunk_x, chunk_y = zip(*chunk)
+            self._fold(chunk_x, chunk_y)
+
+    def _fold(self, xs: Sequence[Number], ys: Sequence[Number]) -> None:
+        n = len(xs)
+        if not n:
+            return
+        mean_x = math.fsum(xs) / n
+        mean_y = math.fsum(ys) / n
+        dx = [x - mean_x for x in xs]
+        dy = [y - mean_y for y in ys]
+        part = CoMoments()
+        part.n, part.mean_x, part.mean_y = n, mean_x, mean_y
+        part.m2_x = math.fsum([d * d for d in dx])
+        part.m2_y = math.fsum([d * d for d in dy])
+        part.c_xy = math.fsum([a * b for a, b in zip(dx, dy)])
+        self._absorb(part)
+
+    def _absorb(self, other: "CoMoments") -> None:
+        if not other.n:
+            return
+        if not self.n:
+            self.n, self.mean_x, self.mean_y = other.n, other.mean_x, other.mean_y
+            self.m2_x, self.m2_y, self.c_xy = other.m2_x, other.m2_y, other.c_xy
+            return
+        n = self.n + other.n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.m2_x += other.m2_x + dx * dx * weight
+        self.m2_y += other.m2_y + dy * dy * weight
+        self.c_xy += other.c_xy + dx * dy * weight
+        self.n = n
+
+    def merge(self, other: "CoMoments") -> "CoMoments":
+        """Return an accumulator holding the pairs of both, leaving both unchanged."""
+        result = CoMoments()
+        result._absorb(self)
+        result._absorb(other)
+        return result
+
+    def _require(self, minimum: int, what: str) -> None:
+        if not self.n:
+            raise ValueError(f"Cannot calculate {what} of empty list")
+        if self.n < minimum:
+            raise ValueError(f"Cannot calculate sample {what} with only one data point")
+
+    def covariance(self, sample: bool = True) -> float:
+        """Calculate the sample (n - 1) or population (n) covariance.
+
+        Raises:
+            ValueError: If there are no pairs, or only one for sample covariance
+        """
+        self._require(2 if sample else 1, "covariance")
+        return self.c_xy / (self.n - 1 if sample else self.n)
+
+    def variance_x(self, sample: bool = True) -> float:
+        """Calculate the variance of the x values.
+
+        Raises:
+            ValueError: If there are no pairs, or only one for sample variance
+        """
+        self._require(2 if sample else 1, "variance")
+        return self.m2_x / (self.n - 1 if sample else self.n)
+
+    def variance_y(self, sample: bool = True) -> float:
+        """Calculate the variance of the y values.
+
+        Raises:
+            ValueError: If there are no pairs, or only one for sample variance
+        """
+        self._require(2 if sample else 1, "variance")
+        return self.m2_y / (self.n - 1 if sample else self.n)
+
+    def _finite(self) -> bool:
+        return math.isfinite(self.c_xy) and math.isfinite(self.m2_x) and math.isfinite(self.m2_y)
+
+    def correlation(self) -> float:
+        """Calculate the Pearson correlation coefficient.
+
+        Returns NaN when the pairs include NaN or infinite values.
+
+        Raises:
+            ValueError: If there are no pairs or either variable is constant
+        """
+        self._require(1, "correlation")
+        if not self._finite():
+            return math.nan
+        if self.m2_x <= 0 or self.m2_y <= 0:
+            raise ValueError("Correlation is undefined for constant data")
+        r = self.c_xy / math.sqrt(self.m2_x * self.m2_y)
+        return max(-1.0, min(1.0, r))
+
+    def linear_regression(self) -> LinearFit:
+        """Fit y = slope * x + intercept by ordinary least squares.
+
+        The fit is all NaN when the pairs include NaN or infinite values.
+
+        Raises:
+            ValueError: If there are no pairs or every x is the same
+        """
+        self._require(1, "regression")
+        if not self._finite():
+            return LinearFit(math.nan, math.nan, math.nan, self.n)
+        if self.m2_x <= 0:
+            raise ValueError("Regression is undefined when x is constant")
+        slope = self.c_xy / self.m2_x
+        intercept = self.mean_y - slope * self.mean_x
+        if self.m2_y <= 0:
+            r_squared = 1.0
+        else:
+            r_squared = min(1.0, self.c_xy * self.c_xy / (self.m2_x * self.m2_y))
+        return LinearFit(slope, intercept, r_squared, self.n)
+
+
+class BivariateStatistics:
+    """One-call covariance, correlation and regression of two columns."""
+
+    @staticmethod
+    def comoments(xs: Iterable[Number], ys: Iterable[Number]) -> CoMoments:
+        """Accumulate paired values in one pass.
+
+        Raises:
+            ValueError: If the columns differ in length
+        """
+        moments = CoMoments()
+        moments.extend(xs, ys)
+        return moments
+
+    @staticmethod
+    def covariance(xs: Iterable[Number], ys: Iterable[Number], sample: bool = True) -> float:
+        """Calculate the covariance of two columns.
+
+        Raises:
+            ValueError: If the columns differ in length or are too short
+        """
+        return BivariateStatistics.comoments(xs, ys).covariance(sample)
+
+    @staticmethod
+    def correlation(xs: Iterable[Number], ys: Iterable[Number]) -> float:
+        """Calculate the Pearson correlation of two columns.
+
+        Raises:
+            ValueError: If the columns differ in length, are empty or constant
+        """
+        return BivariateStatistics.comoments(xs, ys).correlation()
+
+    @staticmethod
+    def linear_regression(xs: Iterable[Number], ys: Iterable[Number]) -> LinearFit:
+        """Fit ys = slope * xs + intercept by least squares.
+
+        Raises:
+            ValueError: If the columns differ in length, are empty or xs is constant
+        """
+        return BivariateStatistics.comoments(xs, ys).linear_regression()
+
+    @staticmethod
+    def merge(parts: Iterable[CoMoments]) -> Optional[CoMoments]:
+        """Combine accumulators from separate chunks or workers.
+
+        Returns:
+            The combined accumulator, or None if parts is empty
+        """
+        result = None
+        for part in parts:
+            result = part if result is None else result.merge(part)
+        return result
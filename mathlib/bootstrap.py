@@ -0,0 +1,225 @@
+"""
+Bootstrap module for resampled confidence intervals of Statistics estimators.
+"""
+import math
+import random
+import sys
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from statistics import NormalDist
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Union
+
+from mathlib.sampling import Estimate
+from mathlib.statistics import Statistics
+from mathlib.validated import UncheckedStatistics
+
+Number = Union[int, float]
+
+# Resamples drawn from one seed; the blocks, not the workers, are seeded so
+# that the result does not depend on the number of processes
+_BLOCK = 64
+
+# Estimators computed from resample indices without copying the values
+_FAST = ("mean", "median", "percentile", "variance", "standard_deviation", "range_value")
+
+# Estimators read from the sorted data by rank
+_ORDER = ("median", "percentile", "range_value")
+
+# Array typecode of an unsigned 32-bit integer
+_WORD = "I" if array("I").itemsize == 4 else "L"
+
+
+def _kind(estimator: Callable) -> Optional[str]:
+    for cls in (Statistics, UncheckedStatistics):
+        for name in _FAST:
+            if estimator is getattr(cls, name):
+                return name
+    return None
+
+
+def _from_order(kind: str, n: int, pick: Callable[[int], Number], args: tuple) -> Number:
+    # pick(r) is the r-th smallest of n values; the arithmetic repeats the
+    # Statistics methods so the results are identical
+    if kind == "median":
+        return (pick(n // 2 - 1) + pick(n // 2)) / 2 if n % 2 == 0 else pick(n // 2)
+    if kind == "range_value":
+        return pick(n - 1) - pick(0)
+    k = (n - 1) * (args[0] / 100)
+    f = math.floor(k)
+    c = math.ceil(k)
+    if f == c:
+        return pick(int(k))
+    return pick(int(f)) * (c - k) + pick(int(c)) * (k - f)
+
+
+def _indices(rng: random.Random, n: int) -> List[int]:
+    # One call into the generator for all n draws, 32 random bits per index;
+    # the modulo bias is below n / 2**32
+    words = array(_WORD, rng.getrandbits(32 * n).to_bytes(4 * n, sys.byteorder))
+    return [word % n for word in words]
+
+
+def _estimate(kind: Optional[str], estimator: Callable, args: tuple, data: List[Number],
+              indices: List[int]) -> Number:
+    # For the order statistics data is sorted, so ranks follow from index counts
+    n = len(indices)
+    if kind is None:
+        return estimator([data[i] for i in indices], *args)
+    if kind == "mean":
+        return sum(map(data.__getitem__, indices)) / n
+    if kind == "variance" or kind == "standard_deviation":
+        mean = sum(map(data.__getitem__, indices)) / n
+        sample = args[0] if args else True
+        variance = sum([(data[i] - mean) ** 2 for i in indices]) / (n - 1 if sample else n)
+        return math.sqrt(variance) if kind == "standard_deviation" else variance
+    if kind == "range_value":
+        return data[max(indices)] - data[min(indices)]
+    counts = [0] * n
+    for i in indices:
+        counts[i] += 1
+    ranks = list(accumulate(counts))
+    return _from_order(kind, n, lambda r: data[bisect_right(ranks, r)], args)
+
+
+def _resample_blocks(data: List[Number], kind: Optional[str], estimator: Callable, args: tuple,
+                     seed: int, blocks: List[int], resamples: int) -> List[List[Number]]:
+    n = len(data)
+    results = []
+    for block in blocks:
+        rng = random.Random(f"{seed}:{block}")
+        count = min(_BLOCK, resamples - block * _BLOCK)
+        results.append([_estimate(kind, estimator, args, data, _indices(rng, n))
+                        for _ in range(count)])
+    return results
+
+
+def _jackknife(kind: Optional[str], estimator: Callable, args: tuple,
+               data: List[Number]) -> List[Number]:
+    n = len(data)
+    if kind == "mean":
+        total = sum(data)
+        return [(total - x) / (n - 1) for x in data]
+    if kind == "variance" or kind == "standard_deviation":
+        mean = math.fsum(data) / n
+        m2 = math.fsum((x - mean) ** 2 for x in data)
+        divisor = n - 2 if (args[0] if args else True) else n - 1
+        values = [max(m2 - (x - mean) ** 2 * n / (n - 1), 0.0) / divisor for x in data]
+        return [math.sqrt(v) for v in values] if kind == "standard_deviation" else values
+    if kind is not None:
+        # Leaving out the j-th smallest shifts every later rank down by one
+        return [_from_order(kind, n - 1, lambda r, j=j: data[r] if r < j else data[r + 1], args)
+                for j in range(n)]
+    return [estimator(data[:i] + data[i + 1:], *args) for i in range(n)]
+
+
+def _acceleration(values: List[Number]) -> float:
+    mean = math.fsum(values) / len(values)
+    deviations = [mean - v for v in values]
+    spread = math.fsum(d * d for d in deviations)
+    if spread <= 0:
+        return 0.0
+    return math.fsum(d ** 3 for d in deviations) / (6 * spread ** 1.5)
+
+
+def _bca_levels(estimates: Sequence[Number], value: Number, alpha: float,
+                jackknife: Optional[List[Number]]) -> List[float]:
+    normal = NormalDist()
+    b = len(estimates)
+    below = sum(1 for e in estimates if e < value) + sum(1 for e in estimates if e == value) / 2
+    proportion = min(max(below / b, 1 / (2 * b)), 1 - 1 / (2 * b)) if b > 1 else 0.5
+    bias = normal.inv_cdf(proportion)
+    acceleration = _acceleration(jackknife) if jackknife else 0.0
+    levels = []
+    for level in (alpha, 1 - alpha):
+        z = bias + normal.inv_cdf(level)
+        denominator = 1 - acceleration * z
+        if denominator <= 0:
+            levels.append(0.0 if level < 0.5 else 1.0)
+        else:
+            levels.append(normal.cdf(bias + z / denominator))
+    return levels
+
+
+def bootstrap(data: Iterable[Number], estimator: Callable[..., Number], *args: Any,
+              resamples: int = 2000, confidence: float = 0.95, method: str = "percentile",
+              seed: Optional[int] = None, processes: int = 1) -> Estimate:
+    """Estimate a confidence interval for a statistic by resampling the data.
+
+    Every resample is a list of n random indices into the data, drawn with
+    replacement. For Statistics (or UncheckedStatistics) mean, median,
+    percentile, variance, standard_deviation and range_value the values are
+    never copied or sorted: the data is sorted once, the median and
+    percentiles are selected by counting how often each index was drawn,
+    and the other estimators read the data through the indices. Their
+    results are identical to calling the estimator on the resample. Any
+    other estimator is called on a copy of each resample.
+
+    Resamples are drawn in blocks of 64 with one seed per block, so a given
+    seed gives the same interval for any number of processes.
+
+    Args:
+        data: The observed values
+        estimator: A function of a list of numbers returning a number, such
+            as Statistics.median
+        *args: Further arguments for the estimator, e.g. the p of
+            Statistics.percentile
+        resamples: Number of bootstrap resamples
+        confidence: Confidence level of the interval, e.g. 0.95
+        method: "percentile", or "bca" for bias-corrected and accelerated
+            intervals (which adds a jackknife pass over the data; for
+            estimators without a fast path that is n calls on n - 1 values)
+        seed: Seed for reproducible intervals
+        processes: Worker processes; above 1 the estimator and its arguments
+            must be picklable
+
+    Returns:
+        An Estimate whose value is the estimator on the full data
+
+    Raises:
+        ValueError: If data is empty, resamples or processes is not
+            positive, confidence is not between 0 and 1, method is unknown,
+            or the estimator rejects the data
+    """
+    data = list(data)
+    if not data:
+        raise ValueError("Cannot bootstrap an empty list")
+    if resamples < 1:
+        raise ValueError("Number of resamples must be positive")
+    if processes < 1:
+        raise ValueError("Number of processes must be positive")
+    if method not in ("percentile", "bca"):
+        raise ValueError("Method must be 'percentile' or 'bca'")
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1")
+    value = estimator(data, *args)
+    kind = _kind(estimator)
+    if kind in _ORDER:
+        data.sort()
+    if seed is None:
+        seed = random.randrange(1 << 63)
+
+    blocks = list(range(-(-resamples // _BLOCK)))
+    workers = min(processes, len(blocks))
+    if workers == 1:
+        shares = [_resample_blocks(data, kind, estimator, args, seed, blocks, resamples)]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_resample_blocks, data, kind, estimator, args, seed,
+                                   blocks[i::workers], resamples) for i in range(workers)]
+            shares = [future.result() for future in futures]
+    estimates = []
+    for block in blocks:
+        estimates.extend(shares[block % workers][block // workers])
+
+    alpha = (1 - confidence) / 2
+    if method == "bca":
+        # Leave-one-out estimates need at least two remaining values
+        jackknife = _jackknife(kind, estimator, args, data) if len(data) > 2 else None
+        lower, upper = _bca_levels(estimates, value, alpha, jackknife)
+    else:
+        lower, upper = alpha, 1 - alpha
+    return Estimate(value, Statistics.percentile(estimates, 100 * lower),
+                    Statistics.percentile(estimates, 100 * upper), confidence, len(data))
+
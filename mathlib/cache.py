@@ -0,0 +1,311 @@
+"""
+Persistent cache module for sharing computation results across processes.
+"""
+import contextlib
+import functools
+import hashlib
+import marshal
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from mathlib import __version__
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS entries ("
+    " key TEXT PRIMARY KEY,"
+    " operation TEXT NOT NULL,"
+    " version TEXT NOT NULL,"
+    " value BLOB NOT NULL,"
+    " size INTEGER NOT NULL,"
+    " accessed REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)",
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO meta (name, value) VALUES ('total_bytes', 0)",
+)
+
+# Number of least recently used entries removed per eviction query
+_EVICTION_BATCH = 64
+
+
+def _encode(value: Any) -> bytes:
+    try:
+        return marshal.dumps(value)
+    except ValueError:
+        raise TypeError("Cannot cache objects of unsupported types") from None
+
+
+def _canonical(value: Any) -> str:
+    # A text form that depends only on the value, unlike marshal, whose
+    # output changes with reference counts. Types are kept apart (1, 1.0 and
+    # True differ) and integers are written in hex, which is linear in size.
+    kind = type(value)
+    if kind is float:
+        return float.__repr__(value)
+    if kind is int:
+        return hex(value)
+    if kind is list:
+        return "[" + ",".join(map(_canonical, value)) + "]"
+    if kind is tuple:
+        return "(" + ",".join(map(_canonical, value)) + ")"
+    if value is None or kind is bool or kind is str or kind is bytes or kind is complex:
+        return repr(value)
+    if kind is dict:
+        items = sorted(_canonical(k) + ":" + _canonical(v) for k, v in value.items())
+        return "{" + ",".join(items) + "}"
+    if kind is set or kind is frozenset:
+        return kind.__name__ + "{" + ",".join(sorted(map(_canonical, value))) + "}"
+    raise TypeError("Cannot cache objects of unsupported types")
+
+
+def operation_name(func: Callable) -> str:
+    """Return the cache operation name for a callable.
+
+    Args:
+        func: A function or static method, e.g. ``Calculator.factorial``
+
+    Returns:
+        The qualified name of the callable, e.g. ``"Calculator.factorial"``
+
+    Raises:
+        ValueError: If the callable is a lambda or a local function, whose
+            qualified names are shared by unrelated functions
+    """
+    name = getattr(func, "__qualname__", None) or repr(func)
+    if "<lambda>" in name or "<locals>" in name:
+        raise ValueError(f"Cannot derive a cache operation name for {name}; pass operation=")
+    return name
+
+
+class PersistentCache:
+    """An on-disk result cache backed by SQLite in WAL mode.
+
+    Entries are keyed by operation name, library version and a hash of the
+    call arguments, so results survive between short-lived processes and
+    are invalidated automatically when the library version changes. Keys
+    hash a canonical text form of the arguments, so equal arguments always
+    share an entry. Values are encoded with ``marshal``, which handles
+    arbitrarily large integers in linear time; like ``pickle`` it must only
+    be used on cache files you trust.
+
+    Every thread gets its own connection and writes run inside
+    ``BEGIN IMMEDIATE`` transactions, so threads and processes can share
+    one cache file. When the stored values exceed ``max_bytes`` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024,
+                 version: str = __version__, timeout: float = 30.0):
+        """Open or create a cache file.
+
+        Args:
+            path: Location of the SQLite database file
+            max_bytes: Upper bound on the total size of stored values
+            version: Version string mixed into every key
+            timeout: Seconds to wait for a lock held by another process
+
+        Raises:
+            ValueError: If max_bytes is not positive
+        """
+        if max_bytes <= 0:
+            raise ValueError("Cache size must be positive")
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.version = version
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        with self._transaction() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def __enter__(self) -> "PersistentCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        row = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return row[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def key(self, operation: str, args: Sequence[Any] = (),
+            kwargs: Optional[Dict[str, Any]] = None) -> str:
+        """Build the cache key for a call.
+
+        Args:
+            operation: Name of the operation, e.g. ``"Calculator.factorial"``
+            args: Positional arguments of the call
+            kwargs: Keyword arguments of the call
+
+        Returns:
+            A hex digest identifying the operation, version and inputs
+
+        Raises:
+            TypeError: If an argument cannot be encoded
+        """
+        payload = (operation, self.version, tuple(args), sorted((kwargs or {}).items()))
+        return hashlib.sha256(_canonical(payload).encode()).hexdigest()
+
+    def get(self, operation: str, args: Sequence[Any] = (),
+            kwargs: Optional[Dict[str, Any]] = None, default: Any = None) -> Any:
+        """Look up a cached result.
+
+        Args:
+            operation: Name of the operation
+            args: Positional arguments of the call
+            kwargs: Keyword arguments of the call
+            default: Value returned when there is no entry
+
+        Returns:
+            The cached result, or default if it is not cached
+        """
+        key = self.key(operation, args, kwargs)
+        conn = self._connection()
+        row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return default
+        with self._lock:
+            self.hits += 1
+        conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return marshal.loads(row[0])
+
+    def set(self, operation: str, args: Sequence[Any], value: Any,
+            kwargs: Optional[Dict[str, Any]] = None) -> None:
+        """Store a result, evicting least recently used entries if needed.
+
+        Args:
+            operation: Name of the operation
+            args: Positional arguments of the call
+            value: Result to store (numbers, strings, lists, tuples and dicts)
+            kwargs: Keyword arguments of the call
+
+        Raises:
+            TypeError: If the arguments or value cannot be encoded
+        """
+        key = self.key(operation, args, kwargs)
+        encoded = _encode(value)
+        size = len(encoded)
+        if size > self.max_bytes:
+            return
+        with self._transaction() as conn:
+            row = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            previous = row[0] if row else 0
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, operation, version, value, size, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, operation, self.version, encoded, size, time.time()))
+            total = self._adjust_total(conn, size - previous)
+            if total > self.max_bytes:
+                self._evict(conn, total, keep=key)
+
+    def memoize(self, func: Callable, operation: Optional[str] = None) -> Callable:
+        """Wrap a function so its results are read from and written to the cache.
+
+        Args:
+            func: The function to wrap, e.g. ``Calculator.factorial``
+            operation: Cache operation name, defaults to the function's qualified name
+
+        Returns:
+            A function with the same signature that consults the cache first
+
+        Raises:
+            ValueError: If operation is not given and func is a lambda or a
+                local function
+        """
+        name = operation or operation_name(func)
+        missing = object()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = self.get(name, args, kwargs, default=missing)
+            if result is missing:
+                result = func(*args, **kwargs)
+                self.set(name, args, result, kwargs)
+            return result
+
+        return wrapper
+
+    def total_bytes(self) -> int:
+        """Return the total size of the stored values in bytes."""
+        row = self._connection().execute(
+            "SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()
+        return row[0]
+
+    def purge_stale(self) -> int:
+        """Remove entries written by other library versions.
+
+        Returns:
+            The number of entries removed
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE version != ?",
+                (self.version,)).fetchone()
+            conn.execute("DELETE FROM entries WHERE version != ?", (self.version,))
+            self._adjust_total(conn, -row[1])
+        return row[0]
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("UPDATE meta SET value = 0 WHERE name = 'total_bytes'")
+
+    def close(self) -> None:
+        """Close the connections opened by this cache."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    @staticmethod
+    def _adjust_total(conn: sqlite3.Connection, delta: int) -> int:
+        conn.execute("UPDATE meta SET value = value + ? WHERE name = 'total_bytes'", (delta,))
+        return conn.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection, total: int, keep: str) -> None:
+        while total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM entries WHERE key != ? ORDER BY accessed LIMIT ?",
+                (keep, _EVICTION_BATCH)).fetchall()
+            if not rows:
+                break
+            freed = 0
+            for key, size in rows:
+                if total - freed <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                freed += size
+            total = self._adjust_total(conn, -freed)
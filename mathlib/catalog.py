@@ -0,0 +1,206 @@
+"""
+Catalog module for range and top-k queries over precomputed shape metrics.
+"""
+import bisect
+import operator
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+from mathlib.geometry import Geometry
+from mathlib.shape_store import METRICS, ShapeStore
+
+Number = Union[int, float]
+
+
+def _check_not_nan(values: array) -> None:
+    # NaN compares false with everything, which would break the sorted order
+    if any(map(operator.ne, values, values)):
+        raise ValueError("Metric values cannot be NaN")
+
+
+class ShapeCatalog:
+    """An index of shapes sorted by one metric, e.g. area or volume.
+
+    Each shape's metric is computed once, with the Geometry formulas, when
+    it is added. Values and shape ids are kept in two parallel sorted
+    arrays, so range queries are two binary searches plus a slice, top-k is
+    a slice from either end, and inserts and deletes shift the arrays in
+    place instead of rebuilding the index.
+    """
+
+    def __init__(self, metric: str):
+        """Create an empty catalog.
+
+        Args:
+            metric: "area", "perimeter" or "volume"
+
+        Raises:
+            ValueError: If no kind of shape defines the metric
+        """
+        if not any(metric in metrics for metrics in METRICS.values()):
+            raise ValueError(f"Unknown metric: {metric}")
+        self.metric = metric
+        self._values = array("d")
+        self._ids = array("q")
+        self._by_id: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, shape_id: int) -> bool:
+        return shape_id in self._by_id
+
+    def _method(self, kind: str) -> str:
+        if kind not in METRICS:
+            raise ValueError(f"Unknown shape kind: {kind}")
+        method = METRICS[kind].get(self.metric)
+        if method is None:
+            raise ValueError(f"A {kind} has no {self.metric}")
+        return method
+
+    def insert(self, shape_id: int, value: Number) -> None:
+        """Insert a shape with an already computed metric value.
+
+        Raises:
+            ValueError: If the id is already in the catalog or the value is NaN
+            TypeError: If the id is not an integer or the value is not a number
+        """
+        # Convert both before touching either array, so they stay parallel
+        entry_id = array("q", [shape_id])
+        entry_value = array("d", [value])
+        _check_not_nan(entry_value)
+        if shape_id in self._by_id:
+            raise ValueError(f"Shape id already present: {shape_id}")
+        i = bisect.bisect_right(self._values, entry_value[0])
+        self._values[i:i] = entry_value
+        self._ids[i:i] = entry_id
+        self._by_id[shape_id] = entry_value[0]
+
+    def add(self, shape_id: int, kind: str, *dimensions: Number) -> float:
+        """Compute a shape's metric and insert it.
+
+        Args:
+            shape_id: Caller-chosen integer id
+            kind: The kind of shape, e.g. "circle"
+            *dimensions: The shape's dimensions, as passed to the Geometry method
+
+        Returns:
+            The computed metric value
+
+        Raises:
+            ValueError: If the kind lacks the metric, a dimension is
+                negative or the id is already present
+        """
+        value = getattr(Geometry, self._method(kind))(*dimensions)
+        self.insert(shape_id, value)
+        return value
+
+    def extend(self, shape_ids: Iterable[int], values: Iterable[Number]) -> None:
+        """Insert many shapes with precomputed values in one merge.
+
+        Raises:
+            ValueError: If an id is repeated or already present, a value is
+                NaN or the inputs differ in length
+            TypeError: If an id is not an integer or a value is not a number
+        """
+        ids = array("q", shape_ids)
+        values = array("d", values)
+        if len(ids) != len(values):
+            raise ValueError("Shape ids and values must have the same length")
+        _check_not_nan(values)
+        new = list(zip(values, ids))
+        if len(set(ids)) != len(ids) or any(shape_id in self._by_id for shape_id in ids):
+            raise ValueError("Shape ids must be unique")
+        entries = sorted(list(zip(self._values, self._ids)) + new, key=lambda entry: entry[0])
+        self._values = array("d", [value for value, _ in entries])
+        self._ids = array("q", [shape_id for _, shape_id in entries])
+        self._by_id.update((shape_id, float(value)) for value, shape_id in new)
+
+    def extend_from_store(self, store: ShapeStore, kind: str, id_offset: int = 0) -> None:
+        """Insert every shape of one kind from a ShapeStore.
+
+        Shapes get ids ``id_offset + index`` where index is their position
+        within the kind in the store.
+
+        Raises:
+            ValueError: If the kind lacks the metric or an id collides
+        """
+        self._method(kind)
+        values = store.metric(kind, self.metric)
+        self.extend(range(id_offset, id_offset + len(values)), values)
+
+    def remove(self, shape_id: int) -> None:
+        """Remove a shape.
+
+        Raises:
+            KeyError: If the id is not in the catalog
+        """
+        value = self._by_id.pop(shape_id)
+        i = bisect.bisect_left(self._values, value)
+        while self._ids[i] != shape_id:
+            i += 1
+        del self._values[i]
+        del self._ids[i]
+
+    def value(self, shape_id: int) -> float:
+        """Return the stored metric of a shape.
+
+        Raises:
+            KeyError: If the id is not in the catalog
+        """
+        return self._by_id[shape_id]
+
+    def _bounds(self, low: Number, high: Number) -> Tuple[int, int]:
+        if low > high:
+            raise ValueError("Lower bound cannot exceed upper bound")
+        return bisect.bisect_left(self._values, low), bisect.bisect_right(self._values, high)
+
+    def range(self, low: Number, high: Number) -> array:
+        """Find the shapes whose metric lies in the closed range [low, high].
+
+        Returns:
+            The matching ids as an ``array('q')``, in ascending metric order
+
+        Raises:
+            ValueError: If low is greater than high
+        """
+        start, stop = self._bounds(low, high)
+        return self._ids[start:stop]
+
+    def count_range(self, low: Number, high: Number) -> int:
+        """Count the shapes whose metric lies in [low, high] without copying ids.
+
+        Raises:
+            ValueError: If low is greater than high
+        """
+        start, stop = self._bounds(low, high)
+        return stop - start
+
+    def top_k(self, k: int, largest: bool = True) -> List[Tuple[float, int]]:
+        """Return the k shapes with the largest (or smallest) metric.
+
+        Args:
+            k: Number of shapes to return
+            largest: If False, return the smallest values instead
+
+        Returns:
+            Up to k ``(value, id)`` pairs, most extreme first
+
+        Raises:
+            ValueError: If k is negative
+        """
+        if k < 0:
+            raise ValueError("k cannot be negative")
+        if largest:
+            start = max(0, len(self._ids) - k)
+            pairs = zip(self._values[start:], self._ids[start:])
+            return list(reversed(list(pairs)))
+        return list(zip(self._values[:k], self._ids[:k]))
+
+    def values(self) -> Sequence[float]:
+        """Return a copy of the sorted metric values.
+
+        A copy rather than a view, since a live view of the array would
+        make later insertions fail with BufferError.
+        """
+        return array("d", self._values)
@@ -0,0 +1,376 @@
+"""
+Command line module for streaming batch computations over CSV or NDJSON.
+
+Usage:
+    mathlib row OPERATION [FILE ...] [--columns a,b] [--workers N] [--chunk-size N]
+    mathlib reduce OPERATION[,OPERATION ...] [FILE ...] [--columns a,b]
+
+``row`` applies a Calculator or Geometry operation to every row and writes
+each input row back with the result appended. ``reduce`` applies
+Statistics operations to whole columns. Input is read from the files, or
+from stdin when none are given, one chunk at a time.
+"""
+import argparse
+import csv
+import inspect
+import io
+import json
+import math
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from mathlib.calculator import Calculator
+from mathlib.geometry import Geometry
+from mathlib.shared_statistics import Moments, _combine, _moments
+from mathlib.statistics import Statistics
+
+ROW_OPERATIONS: Dict[str, Callable] = {
+    name: getattr(cls, name)
+    for cls in (Calculator, Geometry)
+    for name, _ in inspect.getmembers(cls, inspect.isfunction)
+}
+REDUCTIONS = ("mean", "median", "mode", "variance", "standard_deviation", "range_value", "percentile")
+# Reductions that need every value of the column rather than its moments
+_ORDER_STATISTICS = {"median", "mode", "percentile"}
+
+_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+class CLIError(Exception):
+    """Raised for invalid input; reported as ``mathlib: error: <message>``."""
+
+
+def _number(value: Any) -> Any:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    raise ValueError(f"Not a number: {value!r}")
+
+
+def _open_inputs(paths: List[str]) -> Iterator[TextIO]:
+    if not paths:
+        yield sys.stdin
+        return
+    for path in paths:
+        if path == "-":
+            yield sys.stdin
+        else:
+            with open(path, newline="") as stream:
+                yield stream
+
+
+def _records(paths: List[str], fmt: str) -> Tuple[Optional[List[str]], Iterator[Any]]:
+    """Return the CSV header (None for NDJSON) and an iterator of raw records.
+
+    CSV records are lists of strings, NDJSON records are unparsed lines so
+    that decoding happens in the workers.
+    """
+    streams = _open_inputs(paths)
+    if fmt == "ndjson":
+        lines = (line for stream in streams for line in stream if line.strip())
+        return None, lines
+
+    readers = (csv.reader(stream) for stream in streams)
+    first = next(readers)
+    header = next(first, None)
+    if header is None:
+        raise CLIError("Input has no header row")
+
+    def rows() -> Iterator[List[str]]:
+        yield from first
+        for reader in readers:
+            if next(reader, header) != header:
+                raise CLIError("Input files have different columns")
+            yield from reader
+
+    return header, rows()
+
+
+def _chunks(records: Iterable[Any], size: int) -> Iterator[Tuple[int, List[Any]]]:
+    records = iter(records)
+    start = 1
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _ordered_map(func: Callable, tasks: Iterable[Any], workers: int) -> Iterator[Any]:
+    """Yield func(task) in task order while keeping at most 2 * workers tasks in flight."""
+    if workers == 1:
+        yield from map(func, tasks)
+        return
+    # Imported here so single-process runs do not load multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as pool:
+        pending: deque = deque()
+        for task in tasks:
+            pending.append(pool.submit(func, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _fields(record: Any, columns: List[Any], fmt: str) -> Tuple[Any, List[Any]]:
+    if fmt == "csv":
+        if columns and len(record) <= max(columns):
+            raise ValueError(f"Missing column: row has only {len(record)} field(s)")
+        return record, [_number(record[i]) for i in columns]
+    obj = json.loads(record)
+    if not isinstance(obj, dict):
+        raise ValueError("Expected a JSON object")
+    try:
+        return obj, [_number(obj[c]) for c in columns]
+    except KeyError as error:
+        raise ValueError(f"Missing column: {error.args[0]}") from None
+
+
+def _apply_chunk(task: Tuple) -> Tuple[str, int, List[Tuple[int, str]]]:
+    fmt, operation, columns, start, chunk = task
+    func = ROW_OPERATIONS[operation]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    written = 0
+    errors = []
+    for number, record in enumerate(chunk, start):
+        try:
+            parsed, args = _fields(record, columns, fmt)
+            result = func(*args)
+            # Serialized inside the try: integers beyond the conversion limit
+            # raise ValueError. writerow() converts every field before writing.
+            if fmt == "csv":
+                writer.writerow(parsed + [result])
+            else:
+                parsed[operation] = result
+                buffer.write(json.dumps(parsed) + "\n")
+        except (ValueError, TypeError, OverflowError) as error:
+            errors.append((number, str(error)))
+            continue
+        written += 1
+    return buffer.getvalue(), written, errors
+
+
+def _reduce_chunk(task: Tuple) -> Tuple[List[Tuple[Optional[Moments], Optional[array], bool]],
+                                        int, List[Tuple[int, str]]]:
+    fmt, columns, keep_values, start, chunk = task
+    values = [array("d") for _ in columns]
+    integral = [True] * len(columns)
+    errors = []
+    for number, record in enumerate(chunk, start):
+        try:
+            _, fields = _fields(record, columns, fmt)
+            # Converted before appending, so a failing field leaves no column longer
+            row = array("d", fields)
+        except (ValueError, TypeError, OverflowError) as error:
+            errors.append((number, str(error)))
+            continue
+        for i, (column, field, value) in enumerate(zip(values, fields, row)):
+            column.append(value)
+            integral[i] = integral[i] and type(field) is int
+    partials = [(_moments(column) if column else None, column if keep_values else None, exact)
+                for column, exact in zip(values, integral)]
+    return partials, len(chunk) - len(errors), errors
+
+
+def _resolve_columns(requested: Optional[str], header: Optional[List[str]], fmt: str,
+                     peek: Optional[str], count: Optional[int]) -> Tuple[List[str], List[Any]]:
+    """Return the column names and how to look them up in a record."""
+    if requested:
+        names = requested.split(",")
+    elif header is not None:
+        names = header if count is None else header[:count]
+    elif peek is not None:
+        keys = list(json.loads(peek))
+        names = keys if count is None else keys[:count]
+    else:
+        names = []
+    if count is not None and len(names) != count:
+        raise CLIError(f"Operation needs {count} column(s), got {len(names)}")
+    if fmt == "ndjson":
+        return names, names
+    missing = [name for name in names if name not in header]
+    if missing:
+        raise CLIError(f"Unknown column: {missing[0]}")
+    return names, [header.index(name) for name in names]
+
+
+def _finish_reduction(operation: str, moments: Optional[Moments],
+                      values: array, p: float) -> Any:
+    # values holds a column of integers as array("q"), so that median, mode
+    # and percentile return integers where Statistics would
+    if operation in _ORDER_STATISTICS:
+        if operation == "percentile":
+            return Statistics.percentile(values, p)
+        return getattr(Statistics, operation)(values)
+    if moments is None:
+        return getattr(Statistics, operation)([])
+    n, mean, m2, low, high = moments
+    if operation == "mean":
+        return mean
+    if operation == "range_value":
+        return high - low
+    if n == 1:
+        return Statistics.variance([mean])
+    variance = m2 / (n - 1)
+    return variance if operation == "variance" else math.sqrt(variance)
+
+
+def _check_errors(errors: List[Tuple[int, str]], skip: bool, stderr: TextIO) -> int:
+    if errors and not skip:
+        number, message = errors[0]
+        raise CLIError(f"row {number}: {message}")
+    for number, message in errors:
+        print(f"mathlib: skipped row {number}: {message}", file=stderr)
+    return len(errors)
+
+
+def _run_row(args: argparse.Namespace, output: TextIO, stderr: TextIO) -> int:
+    func = ROW_OPERATIONS[args.operation]
+    arity = len(inspect.signature(func).parameters)
+    header, records = _records(args.files, args.format)
+    peek = None
+    if header is None:
+        peek = next(records, None)
+        if peek is not None:
+            records = _prepend(peek, records)
+    _, columns = _resolve_columns(args.columns, header, args.format, peek, arity)
+    if header is not None:
+        csv.writer(output, lineterminator="\n").writerow(header + [args.operation])
+
+    rows = 0
+    tasks = ((args.format, args.operation, columns, start, chunk)
+             for start, chunk in _chunks(records, args.chunk_size))
+    for text, written, errors in _ordered_map(_apply_chunk, tasks, args.workers):
+        rows += written + _check_errors(errors, args.skip_errors, stderr)
+        output.write(text)
+        output.flush()
+    return rows
+
+
+def _run_reduce(args: argparse.Namespace, output: TextIO, stderr: TextIO) -> int:
+    operations = args.operation.split(",")
+    unknown = [op for op in operations if op not in REDUCTIONS]
+    if unknown:
+        raise CLIError(f"Unknown reduction: {unknown[0]}")
+    header, records = _records(args.files, args.format)
+    peek = None
+    if header is None:
+        peek = next(records, None)
+        if peek is not None:
+            records = _prepend(peek, records)
+    names, columns = _resolve_columns(args.columns, header, args.format, peek, None)
+    keep_values = any(op in _ORDER_STATISTICS for op in operations)
+
+    rows = 0
+    moments: List[Optional[Moments]] = [None] * len(names)
+    values = [array("d") for _ in names]
+    integral = [True] * len(names)
+    tasks = ((args.format, columns, keep_values, start, chunk)
+             for start, chunk in _chunks(records, args.chunk_size))
+    for partials, counted, errors in _ordered_map(_reduce_chunk, tasks, args.workers):
+        rows += counted + _check_errors(errors, args.skip_errors, stderr)
+        for i, (partial, chunk_values, exact) in enumerate(partials):
+            if partial is not None:
+                moments[i] = partial if moments[i] is None else _combine(moments[i], partial)
+            if chunk_values is not None:
+                values[i].extend(chunk_values)
+            integral[i] = integral[i] and exact
+    if keep_values:
+        for i, exact in enumerate(integral):
+            if exact:
+                try:
+                    values[i] = array("q", map(int, values[i]))
+                except OverflowError:
+                    pass
+
+    results = [[_finish_reduction(op, moments[i], values[i], args.percentile)
+                for op in operations] for i in range(len(names))]
+    if args.format == "csv":
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(["column"] + operations)
+        writer.writerows([name] + row for name, row in zip(names, results))
+    else:
+        for name, row in zip(names, results):
+            output.write(json.dumps(dict(column=name, **dict(zip(operations, row)))) + "\n")
+    return rows
+
+
+def _prepend(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    yield first
+    yield from rest
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mathlib", description="Stream CSV or NDJSON rows through mathlib operations.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    row = commands.add_parser("row", help="apply a Calculator or Geometry operation to each row")
+    row.add_argument("operation", choices=sorted(ROW_OPERATIONS), metavar="OPERATION",
+                     help="e.g. add, power, circle_area, cylinder_volume")
+    reduce = commands.add_parser("reduce", help="apply Statistics reductions to columns")
+    reduce.add_argument("operation", metavar="OPERATION[,OPERATION...]",
+                        help="any of: " + ", ".join(REDUCTIONS))
+    reduce.add_argument("--percentile", type=float, default=50.0,
+                        help="p for the percentile reduction (default: 50)")
+
+    for sub in (row, reduce):
+        sub.add_argument("files", nargs="*", metavar="FILE", help="input files (default: stdin)")
+        sub.add_argument("--format", choices=["csv", "ndjson"],
+                         help="input format (default: from the file extension, else csv)")
+        sub.add_argument("--columns", help="comma-separated input columns (default: the first ones)")
+        sub.add_argument("--chunk-size", type=int, default=1000, help="rows per task (default: 1000)")
+        sub.add_argument("--workers", type=int, default=1,
+                         help="worker processes; 1 computes in this process (default: 1)")
+        sub.add_argument("--skip-errors", action="store_true",
+                         help="report invalid rows on stderr and continue")
+        sub.add_argument("-o", "--output", help="output file (default: stdout)")
+        sub.add_argument("-q", "--quiet", action="store_true", help="do not print the throughput report")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    args = _parser().parse_args(argv)
+    if args.chunk_size < 1 or args.workers < 1:
+        print("mathlib: error: chunk size and workers must be positive", file=sys.stderr)
+        return 2
+    if args.format is None:
+        extension = os.path.splitext(args.files[0])[1].lower() if args.files else ""
+        args.format = _FORMATS.get(extension, "csv")
+
+    run = _run_row if args.command == "row" else _run_reduce
+    start = time.perf_counter()
+    try:
+        if args.output:
+            with open(args.output, "w", newline="") as output:
+                rows = run(args, output, sys.stderr)
+        else:
+            rows = run(args, sys.stdout, sys.stderr)
+    except (CLIError, ValueError, OSError) as error:
+        print(f"mathlib: error: {error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        rate = rows / elapsed if elapsed > 0 else float("inf")
+        print(f"mathlib: {rows} rows in {elapsed:.3f} s ({rate:,.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""
+Columnar module for an on-disk block format with per-block summary footers.
+
+File layout (little-endian):
+
+    magic      8 bytes   b"MLCOL01\\n"
+    header     16 bytes  row count (u64), rows per block (u32), column count (u32)
+    columns    per column: name length (u16), UTF-8 name, type code (b"d" or b"q")
+    padding    zero bytes up to a multiple of 8
+    groups     per group of ``block_size`` rows, one block per column in order:
+               ``block_size`` 8-byte values (zero padded) followed by a footer
+               of count (i64), sum, M2, min and max (f64)
+
+Every block has the same size, so the position of any block is computed
+from its group and column number.
+"""
+import math
+import mmap
+import struct
+from array import array
+from typing import BinaryIO, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from mathlib.shared_statistics import Moments, _combine, _moments
+
+MAGIC = b"MLCOL01\n"
+_HEADER = struct.Struct("<QII")
+_FOOTER = struct.Struct("<qdddd")
+TYPECODES = ("d", "q")
+
+Number = Union[int, float]
+
+
+def _block_moments(values: Sequence[Number]) -> Moments:
+    if not len(values):
+        return 0, 0.0, 0.0, math.inf, -math.inf
+    n, mean, m2, low, high = _moments(values)
+    return n, mean, m2, float(low), float(high)
+
+
+class ColumnarWriter:
+    """Writes columns of float64 ("d") or int64 ("q") values in blocks.
+
+    Rows can be appended in chunks of any size; a group of blocks is written
+    each time ``block_size`` rows have been buffered. Use it as a context
+    manager or call close(), which writes the last, partial group and the
+    final row count.
+    """
+
+    def __init__(self, path: str, columns: Sequence[Tuple[str, str]], block_size: int = 65536):
+        """Create a file and write its header.
+
+        Args:
+            path: Location of the file
+            columns: (name, type code) pairs, with type code "d" or "q"
+            block_size: Rows per block
+
+        Raises:
+            ValueError: If there are no columns, a name repeats, a type code is
+                unsupported or block_size is not positive
+        """
+        if block_size < 1:
+            raise ValueError("Block size must be positive")
+        if not columns:
+            raise ValueError("At least one column is required")
+        names = [name for name, _ in columns]
+        if len(set(names)) != len(names):
+            raise ValueError("Column names must be unique")
+        for _, typecode in columns:
+            if typecode not in TYPECODES:
+                raise ValueError(f"Unsupported column type: {typecode}")
+        self.columns = list(columns)
+        self.block_size = block_size
+        self.rows = 0
+        self._buffers = [array(typecode) for _, typecode in columns]
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        header = bytearray(MAGIC + _HEADER.pack(0, block_size, len(columns)))
+        for name, typecode in columns:
+            encoded = name.encode()
+            header += struct.pack("<H", len(encoded)) + encoded + typecode.encode()
+        header += bytes(-len(header) % 8)
+        self._file.write(header)
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def append(self, columns: Dict[str, Sequence[Number]]) -> None:
+        """Append rows given as one sequence per column.
+
+        Nothing is appended if any column is rejected.
+
+        Raises:
+            ValueError: If columns are missing or differ in length
+            TypeError: If a value is not a number
+            OverflowError: If a value does not fit its column's type
+        """
+        if sorted(columns) != sorted(name for name, _ in self.columns):
+            raise ValueError("Expected columns: " + ", ".join(name for name, _ in self.columns))
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("Columns must have the same length")
+        # Convert every column before extending any buffer, so rows stay aligned
+        converted = [array(typecode, columns[name]) for name, typecode in self.columns]
+        for buffer, values in zip(self._buffers, converted):
+            buffer.extend(values)
+        self.rows += lengths.pop()
+        start = 0
+        while len(self._buffers[0]) - start >= self.block_size:
+            self._write_group(start, self.block_size)
+            start += self.block_size
+        # Drop the written rows once, rather than copying the rest per group
+        if start:
+            for buffer in self._buffers:
+                del buffer[:start]
+
+    def _write_group(self, start: int, count: int) -> None:
+        for buffer in self._buffers:
+            block = buffer[start:start + count]
+            moments = _block_moments(block)
+            self._file.write(block.tobytes())
+            self._file.write(bytes(8 * (self.block_size - count)))
+            n, mean, m2, low, high = moments
+            self._file.write(_FOOTER.pack(n, mean * n, m2, low, high))
+
+    def close(self) -> None:
+        """Write the remaining rows and the row count, then close the file."""
+        if self._file is None:
+            return
+        if len(self._buffers[0]):
+            self._write_group(0, len(self._buffers[0]))
+        self._file.seek(len(MAGIC))
+        self._file.write(_HEADER.pack(self.rows, self.block_size, len(self.columns)))
+        self._file.close()
+        self._file = None
+
+
+def write_columnar(path: str, columns: Dict[str, Sequence[Number]], block_size: int = 65536) -> None:
+    """Write a whole dataset in one call.
+
+    Columns of ``array('q')`` are stored as int64; everything else as float64.
+    """
+    spec = [(name, "q" if isinstance(values, array) and values.typecode == "q" else "d")
+            for name, values in columns.items()]
+    with ColumnarWriter(path, spec, block_size) as writer:
+        writer.append(columns)
+
+
+class ColumnarReader:
+    """Memory-maps a columnar file and answers range queries from block footers.
+
+    ``summary``, ``mean``, ``variance`` and ``range_value`` combine the
+    footers of blocks that lie entirely inside the requested row range and
+    only read the values of the (at most two) partial blocks at its edges.
+    """
+
+    def __init__(self, path: str):
+        """Open and map a file.
+
+        Raises:
+            ValueError: If the file is not in the columnar format
+        """
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Not a columnar file") from None
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError("Not a columnar file")
+        offset = len(MAGIC)
+        self.rows, self.block_size, count = _HEADER.unpack_from(self._map, offset)
+        offset += _HEADER.size
+        self.columns: Dict[str, str] = {}
+        self._positions: Dict[str, int] = {}
+        for position in range(count):
+            (length,) = struct.unpack_from("<H", self._map, offset)
+            name = bytes(self._map[offset + 2:offset + 2 + length]).decode()
+            self.columns[name] = chr(self._map[offset + 2 + length])
+            self._positions[name] = position
+            offset += 3 + length
+        self._data = offset + (-offset % 8)
+        self._block_bytes = 8 * self.block_size + _FOOTER.size
+        self.blocks = -(-self.rows // self.block_size)
+
+    def __enter__(self) -> "ColumnarReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._file.close()
+
+    def _offset(self, name: str, block: int) -> int:
+        if name not in self._positions:
+            raise ValueError(f"Unknown column: {name}")
+        group = block * len(self.columns) + self._positions[name]
+        return self._data + group * self._block_bytes
+
+    def _count(self, block: int) -> int:
+        return min(self.block_size, self.rows - block * self.block_size)
+
+    def footer(self, name: str, block: int) -> Moments:
+        """Return (count, mean, M2, min, max) of one block without reading its values.
+
+        Raises:
+            ValueError: If the column is unknown
+            IndexError: If the block does not exist
+        """
+        if not 0 <= block < self.blocks:
+            raise IndexError("Block index out of range")
+        n, total, m2, low, high = _FOOTER.unpack_from(
+            self._map, self._offset(name, block) + 8 * self.block_size)
+        return n, total / n, m2, low, high
+
+    def _scan(self, name: str, block: int, start: int, stop: int) -> Moments:
+        offset = self._offset(name, block)
+        with memoryview(self._map)[offset:offset + 8 * self.block_size] as raw, \
+                raw.cast(self.columns[name]) as values, values[start:stop] as part:
+            return _block_moments(part)
+
+    def _bounds(self, start: int, stop: Optional[int]) -> Tuple[int, int]:
+        stop = self.rows if stop is None else min(stop, self.rows)
+        if start < 0 or start > stop:
+            raise ValueError("Row range is invalid")
+        return start, stop
+
+    def blocks_scanned(self, start: int = 0, stop: Optional[int] = None) -> int:
+        """Count the partial blocks a query over [start, stop) has to read."""
+        start, stop = self._bounds(start, stop)
+        if start == stop:
+            return 0
+        first, last = start // self.block_size, (stop - 1) // self.block_size
+        edges = {first, last}
+        return sum(1 for b in edges
+                   if start > b * self.block_size or stop < b * self.block_size + self._count(b))
+
+    def summary(self, name: str, start: int = 0, stop: Optional[int] = None) -> Optional[Moments]:
+        """Combine (count, mean, M2, min, max) over the rows [start, stop).
+
+        Returns:
+            The merged moments, or None if the range is empty
+
+        Raises:
+            ValueError: If the column is unknown or the range is invalid
+        """
+        start, stop = self._bounds(start, stop)
+        self._offset(name, 0)
+        total: Optional[Moments] = None
+        if start == stop:
+            return None
+        size = self.block_size
+        for block in range(start // size, (stop - 1) // size + 1):
+            base = block * size
+            lo = max(start - base, 0)
+            hi = min(stop - base, self._count(block))
+            if lo == 0 and hi == self._count(block):
+                part = self.footer(name, block)
+            else:
+                part = self._scan(name, block, lo, hi)
+            total = part if total is None else _combine(total, part)
+        return total
+
+    def mean(self, name: str, start: int = 0, stop: Optional[int] = None) -> float:
+        """Calculate the mean of a column over the rows [start, stop).
+
+        Raises:
+            ValueError: If the range is empty or invalid, or the column is unknown
+        """
+        moments = self.summary(name, start, stop)
+        if moments is None:
+            raise ValueError("Cannot calculate mean of empty list")
+        return moments[1]
+
+    def variance(self, name: str, start: int = 0, stop: Optional[int] = None,
+                 sample: bool = True) -> float:
+        """Calculate the variance of a column over the rows [start, stop).
+
+        Raises:
+            ValueError: If the range is empty (or has one row for sample
+                variance) or invalid, or the column is unknown
+        """
+        moments = self.summary(name, start, stop)
+        if moments is None:
+            raise ValueError("Cannot calculate variance of empty list")
+        n, _, m2, _, _ = moments
+        if sample and n == 1:
+            raise ValueError("Cannot calculate sample variance with only one data point")
+        return m2 / (n - 1 if sample else n)
+
+    def range_value(self, name: str, start: int = 0, stop: Optional[int] = None) -> float:
+        """Calculate max - min of a column over the rows [start, stop).
+
+        Raises:
+            ValueError: If the range is empty or invalid, or the column is unknown
+        """
+        moments = self.summary(name, start, stop)
+        if moments is None:
+            raise ValueError("Cannot calculate range of empty list")
+        return moments[4] - moments[3]
+
+    def read(self, name: str, start: int = 0, stop: Optional[int] = None) -> array:
+        """Copy the values of a column over the rows [start, stop) into an array.
+
+        Raises:
+            ValueError: If the column is unknown or the range is invalid
+        """
+        start, stop = self._bounds(start, stop)
+        result = array(self.columns.get(name, "d"))
+        for chunk in self._iter_blocks(name, start, stop):
+            result.frombytes(chunk)
+        return result
+
+    def _iter_blocks(self, name: str, start: int, stop: int) -> Iterator[bytes]:
+        self._offset(name, 0)
+        size = self.block_size
+        if start == stop:
+            return
+        for block in range(start // size, (stop - 1) // size + 1):
+            base = block * size
+            lo = max(start - base, 0)
+            hi = min(stop - base, self._count(block))
+            offset = self._offset(name, block)
+            yield self._map[offset + 8 * lo:offset + 8 * hi]
@@ -0,0 +1,192 @@
+"""
+Distance module for Euclidean distances between points of any dimension.
+"""
+import math
+import os
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from typing import List, MutableSequence, Optional, Sequence, Tuple, Union
+
+Number = Union[int, float]
+Point = Tuple[float, ...]
+
+# Points shared with process pool workers by _init_worker
+_worker_points: List[Point] = []
+
+
+def _split_points(coords: Sequence[Number], dims: int) -> List[Point]:
+    if dims < 1:
+        raise ValueError("Points must have at least one dimension")
+    if len(coords) % dims:
+        raise ValueError(f"Coordinate buffer length must be a multiple of {dims}")
+    return list(zip(*[iter(coords)] * dims))
+
+
+def _pdist_rows(points: List[Point], start: int, stop: int) -> array:
+    dist = math.dist
+    out = array("d")
+    for i in range(start, stop):
+        out.extend(map(dist, repeat(points[i]), points[i + 1:]))
+    return out
+
+
+def _init_worker(points: List[Point]) -> None:
+    global _worker_points
+    _worker_points = points
+
+
+def _pdist_rows_in_worker(start: int, stop: int) -> array:
+    return _pdist_rows(_worker_points, start, stop)
+
+
+def _row_offset(i: int, n: int) -> int:
+    return i * n - i * (i + 1) // 2
+
+
+class Distance:
+    """A class for Euclidean distance calculations in N dimensions.
+
+    Points are tuples or flat coordinate buffers ``[x0, y0, z0, x1, ...]``
+    with a given number of dimensions. In 2D the results agree with
+    ``Geometry.distance_between_points``; ``math.dist`` is used throughout,
+    which avoids overflow and is at least as accurate.
+
+    Pairwise distances are returned in condensed form: the upper triangle
+    of the distance matrix, row by row, as an ``array('d')`` of
+    ``n * (n - 1) // 2`` values. Use condensed_index() to locate a pair.
+    """
+
+    @staticmethod
+    def euclidean(p: Sequence[Number], q: Sequence[Number]) -> float:
+        """Calculate the Euclidean distance between two points.
+
+        Args:
+            p: Coordinates of the first point
+            q: Coordinates of the second point
+
+        Returns:
+            The distance between the points
+
+        Raises:
+            ValueError: If the points differ in dimension
+        """
+        if len(p) != len(q):
+            raise ValueError("Points must have the same number of dimensions")
+        return math.dist(p, q)
+
+    @staticmethod
+    def norm(v: Sequence[Number]) -> float:
+        """Calculate the Euclidean length of a vector."""
+        return math.hypot(*v)
+
+    @staticmethod
+    def one_to_many(point: Sequence[Number], coords: Sequence[Number],
+                    out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate the distances from one point to many.
+
+        Args:
+            point: Coordinates of the reference point
+            coords: Flat buffer of the other points, with len(point) coordinates each
+            out: Optional buffer to write the distances into
+
+        Returns:
+            The distance to each point, in buffer order
+
+        Raises:
+            ValueError: If the buffer is malformed or out is too small
+        """
+        points = _split_points(coords, len(point))
+        distances = array("d", map(math.dist, repeat(tuple(point)), points))
+        if out is None:
+            return distances
+        if len(out) < len(distances):
+            raise ValueError("Output buffer is too small")
+        out[:len(distances)] = distances
+        return out
+
+    @staticmethod
+    def condensed_index(i: int, j: int, n: int) -> int:
+        """Return the position of pair (i, j) in a condensed distance array.
+
+        Raises:
+            ValueError: If i equals j or either index is out of range
+        """
+        if i == j:
+            raise ValueError("A point has no entry for its distance to itself")
+        if not (0 <= i < n and 0 <= j < n):
+            raise ValueError("Point index out of range")
+        if i > j:
+            i, j = j, i
+        return _row_offset(i, n) + (j - i - 1)
+
+    @staticmethod
+    def pdist(coords: Sequence[Number], dims: int) -> array:
+        """Calculate the distances between every pair of points.
+
+        Args:
+            coords: Flat buffer of point coordinates
+            dims: Number of coordinates per point
+
+        Returns:
+            The condensed distance matrix
+
+        Raises:
+            ValueError: If the buffer is malformed
+        """
+        points = _split_points(coords, dims)
+        return _pdist_rows(points, 0, len(points))
+
+    @staticmethod
+    def pdist_parallel(coords: Sequence[Number], dims: int, workers: Optional[int] = None,
+                       tiles: Optional[int] = None, use_processes: bool = False) -> array:
+        """Calculate the condensed distance matrix in tiles across a worker pool.
+
+        Rows of the upper triangle get shorter as i grows, so tiles are row
+        ranges chosen to hold roughly equal numbers of pairs. Each tile is a
+        contiguous slice of the condensed result.
+
+        Args:
+            coords: Flat buffer of point coordinates
+            dims: Number of coordinates per point
+            workers: Pool size, defaults to the number of CPUs
+            tiles: Number of tiles, defaults to four per worker
+            use_processes: Use a process pool instead of a thread pool
+
+        Returns:
+            The condensed distance matrix, identical to pdist()
+
+        Raises:
+            ValueError: If the buffer is malformed or workers/tiles is not positive
+        """
+        if (workers is not None and workers < 1) or (tiles is not None and tiles < 1):
+            raise ValueError("Workers and tiles must be positive")
+        points = _split_points(coords, dims)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if tiles is None:
+            tiles = 4 * workers
+        n = len(points)
+        total = n * (n - 1) // 2
+        bounds = [0]
+        for t in range(1, tiles):
+            target = total * t // tiles
+            row = bounds[-1]
+            while row < n and _row_offset(row, n) < target:
+                row += 1
+            bounds.append(row)
+        bounds.append(n)
+        ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+        out = array("d", bytes(8 * total))
+        executor: Executor
+        if use_processes:
+            executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(points,))
+            futures = [executor.submit(_pdist_rows_in_worker, a, b) for a, b in ranges]
+        else:
+            executor = ThreadPoolExecutor(workers)
+            futures = [executor.submit(_pdist_rows, points, a, b) for a, b in ranges]
+        with executor:
+            for (a, b), future in zip(ranges, futures):
+                out[_row_offset(a, n):_row_offset(b, n)] = future.result()
+        return out
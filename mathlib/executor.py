@@ -0,0 +1,158 @@
+"""
+Executor module for running batch operations on a pool of threads.
+"""
+import os
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, MutableSequence, Optional, Sequence, Tuple
+
+from mathlib.batch_geometry import BatchValidationError, _store
+from mathlib.cache import PersistentCache
+
+# Chunks handed out per worker when no chunk size is given, so that a
+# slow chunk does not leave the other threads idle at the end of a batch
+_CHUNKS_PER_WORKER = 4
+
+
+def gil_enabled() -> bool:
+    """Report whether the running interpreter holds a global interpreter lock.
+
+    Returns:
+        False on a free-threaded build with the GIL disabled, True otherwise
+    """
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else check()
+
+
+class BatchExecutor:
+    """Splits batch operations into chunks and runs them on a thread pool.
+
+    With the GIL, threads only overlap where the work releases it, such as
+    cache lookups in SQLite. On free-threaded CPython the chunks run on all
+    cores. Results always come back in input order. The executor keeps no
+    shared mutable state besides the pool itself, and the optional
+    PersistentCache gives every thread its own connection.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                 cache: Optional[PersistentCache] = None):
+        """Start a thread pool.
+
+        Args:
+            workers: Number of threads (defaults to the number of CPUs)
+            chunk_size: Elements per task (defaults to a few chunks per worker)
+            cache: Optional cache consulted by ``map`` before calling the function
+
+        Raises:
+            ValueError: If workers or chunk_size is not positive
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Number of workers must be positive")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    def __enter__(self) -> "BatchExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Wait for running tasks and stop the worker threads."""
+        self._pool.shutdown(wait=True)
+
+    def _chunks(self, columns: Sequence[Sequence[Any]],
+                chunk_size: Optional[int]) -> List[Tuple[int, int]]:
+        n = len(columns[0])
+        if any(len(column) != n for column in columns):
+            raise ValueError("Columns must have the same length")
+        size = self.chunk_size if chunk_size is None else chunk_size
+        if size is None:
+            size = max(1, -(-n // (self.workers * _CHUNKS_PER_WORKER)))
+        elif size < 1:
+            raise ValueError("Chunk size must be positive")
+        return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+    def map(self, func: Callable, *columns: Sequence[Any],
+            chunk_size: Optional[int] = None) -> List[Any]:
+        """Call a scalar operation once per row of the columns.
+
+        For example ``map(Calculator.power, bases, exponents)``,
+        ``map(Geometry.circle_area, radii)`` or
+        ``map(Statistics.mean, datasets)``.
+
+        Args:
+            func: The operation to apply
+            *columns: Equally sized sequences, one per positional argument
+            chunk_size: Elements per task, overriding the executor default
+
+        Returns:
+            The results in input order
+
+        Raises:
+            ValueError: If the columns differ in length, or a cache is set and
+                func is a lambda or local function (memoize it with an
+                explicit operation name instead)
+            Exception: The first error raised by func, in input order
+        """
+        if not columns:
+            raise ValueError("At least one column is required")
+        if self.cache is not None:
+            func = self.cache.memoize(func)
+
+        def run(start: int, stop: int) -> List[Any]:
+            return [func(*args) for args in zip(*(column[start:stop] for column in columns))]
+
+        futures = [self._pool.submit(run, start, stop)
+                   for start, stop in self._chunks(columns, chunk_size)]
+        results: List[Any] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def map_batch(self, kernel: Callable, *columns: Sequence[float],
+                  out: Optional[MutableSequence[float]] = None,
+                  chunk_size: Optional[int] = None) -> MutableSequence[float]:
+        """Run a column kernel such as ``BatchGeometry.circle_area`` in chunks.
+
+        Args:
+            kernel: A function taking equally sized columns and returning an array
+            *columns: The input columns
+            out: Optional preallocated buffer for the results
+            chunk_size: Elements per task, overriding the executor default
+
+        Returns:
+            The results as an ``array('d')``, or out if given
+
+        Raises:
+            BatchValidationError: If elements of any chunk fail validation,
+                listing their positions in the whole batch
+            ValueError: If the columns differ in length or out is too small
+        """
+        if not columns:
+            raise ValueError("At least one column is required")
+        chunks = self._chunks(columns, chunk_size)
+        futures = [self._pool.submit(kernel, *(column[start:stop] for column in columns))
+                   for start, stop in chunks]
+        result = array("d")
+        reason = None
+        bad: List[int] = []
+        for (start, _), future in zip(chunks, futures):
+            try:
+                values = future.result()
+            except BatchValidationError as error:
+                reason = error.reason
+                bad.extend(start + i for i in error.indices)
+                continue
+            if reason is None:
+                result.extend(values)
+        if reason is not None:
+            raise BatchValidationError(reason, bad)
+        return _store(result, len(columns[0]), out)
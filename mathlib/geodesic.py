@@ -0,0 +1,451 @@
+"""
+Geodesic module for distances and indexing on latitude/longitude points.
+"""
+import bisect
+import math
+from array import array
+from typing import Dict, Hashable, List, MutableSequence, Optional, Sequence, Tuple, Union
+
+Number = Union[int, float]
+
+# Mean Earth radius in kilometres (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+
+# WGS-84 ellipsoid, used by Vincenty's formulae
+WGS84_A = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+
+# Length of one degree of latitude on the mean sphere, in kilometres
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+_MAX_PRECISION = 12
+
+
+def _check_coordinate(lat: Number, lon: Number) -> None:
+    if not -90 <= lat <= 90:
+        raise ValueError("Latitude must be between -90 and 90")
+    if not -180 <= lon <= 180:
+        raise ValueError("Longitude must be between -180 and 180")
+
+
+def _reduced_latitude(lat_radians: float) -> float:
+    return math.atan((1 - WGS84_F) * math.tan(lat_radians))
+
+
+def _vincenty(sin_u1: float, cos_u1: float, sin_u2: float, cos_u2: float, big_l: float,
+              tolerance: float, max_iterations: int) -> float:
+    # Distance between two points given the sines and cosines of their
+    # reduced latitudes and their longitude difference in radians
+    f = WGS84_F
+    lam = big_l
+    for _ in range(max_iterations):
+        sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+        sin_sigma = math.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        if sin_sigma == 0:
+            return 0.0
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = math.atan2(sin_sigma, cos_sigma)
+        sin_alpha = cos_u1 * cos_u2 * sin_lam / sin_sigma
+        cos2_alpha = 1 - sin_alpha ** 2
+        cos_2sm = cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha if cos2_alpha else 0.0
+        c = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+        previous = lam
+        lam = big_l + (1 - c) * f * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2sm + c * cos_sigma * (-1 + 2 * cos_2sm ** 2)))
+        if abs(lam - previous) < tolerance:
+            break
+    else:
+        raise ValueError("Vincenty formula failed to converge")
+    u_sq = cos2_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+    a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = b * sin_sigma * (cos_2sm + b / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sm ** 2)
+        - b / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)))
+    return WGS84_B * a * (sigma - delta_sigma)
+
+
+def _cell_degrees(precision: int) -> Tuple[float, float]:
+    bits = 5 * precision
+    return 180 / 2 ** (bits // 2), 360 / 2 ** ((bits + 1) // 2)
+
+
+class GeoPoints:
+    """A batch of latitude/longitude points with precomputed trigonometry.
+
+    Radian coordinates, the cos(latitude) table and the sines and cosines
+    of the reduced latitudes used by Vincenty's formulae are computed once,
+    so each batch distance costs one pass of arithmetic per point.
+    """
+
+    def __init__(self, lats: Sequence[Number], lons: Sequence[Number]):
+        """Prepare a batch of points.
+
+        Args:
+            lats: Latitudes in degrees
+            lons: Longitudes in degrees
+
+        Raises:
+            ValueError: If the columns differ in length or hold invalid coordinates
+        """
+        if len(lats) != len(lons):
+            raise ValueError("Columns must have the same length")
+        # Compared one by one, since min() and max() let NaN through
+        if not all(-90 <= lat <= 90 for lat in lats):
+            raise ValueError("Latitude must be between -90 and 90")
+        if not all(-180 <= lon <= 180 for lon in lons):
+            raise ValueError("Longitude must be between -180 and 180")
+        radians = math.radians
+        self.lats = array("d", lats)
+        self.lons = array("d", lons)
+        self.lat_radians = array("d", map(radians, lats))
+        self.lon_radians = array("d", map(radians, lons))
+        self.cos_lats = array("d", map(math.cos, self.lat_radians))
+        reduced = list(map(_reduced_latitude, self.lat_radians))
+        self._sin_reduced = array("d", map(math.sin, reduced))
+        self._cos_reduced = array("d", map(math.cos, reduced))
+
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    def haversine_from(self, lat: Number, lon: Number, radius: float = EARTH_RADIUS_KM,
+                       out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate great-circle distances from one point to every point in the batch.
+
+        Args:
+            lat: Latitude of the reference point in degrees
+            lon: Longitude of the reference point in degrees
+            radius: Sphere radius, which sets the unit of the result
+            out: Optional buffer to write the distances into
+
+        Returns:
+            The distance to each point, in batch order
+
+        Raises:
+            ValueError: If the reference point is invalid or out is too small
+        """
+        _check_coordinate(lat, lon)
+        phi = math.radians(lat)
+        lam = math.radians(lon)
+        cos_phi = math.cos(phi)
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+        two_r = 2 * radius
+        distances = array("d", [
+            two_r * asin(min(1.0, sqrt(sin((p - phi) / 2) ** 2
+                                       + cos_phi * c * sin((q - lam) / 2) ** 2)))
+            for p, q, c in zip(self.lat_radians, self.lon_radians, self.cos_lats)
+        ])
+        if out is None:
+            return distances
+        if len(out) < len(distances):
+            raise ValueError("Output buffer is too small")
+        out[:len(distances)] = distances
+        return out
+
+    def vincenty_from(self, lat: Number, lon: Number, tolerance: float = 1e-12,
+                      max_iterations: int = 200) -> array:
+        """Calculate ellipsoidal distances in kilometres from one point to every point.
+
+        Only the reference point is validated; the batch's reduced latitudes
+        were computed when it was created.
+
+        Raises:
+            ValueError: If the reference point is invalid or the iteration does
+                not converge for a point (nearly antipodal points)
+        """
+        _check_coordinate(lat, lon)
+        u1 = _reduced_latitude(math.radians(lat))
+        sin_u1, cos_u1 = math.sin(u1), math.cos(u1)
+        radians = math.radians
+        return array("d", [
+            _vincenty(sin_u1, cos_u1, sin_u2, cos_u2, radians(q - lon), tolerance, max_iterations)
+            for sin_u2, cos_u2, q in zip(self._sin_reduced, self._cos_reduced, self.lons)
+        ])
+
+
+class Geodesic:
+    """A class for geodesic distance calculations on latitude/longitude coordinates.
+
+    Coordinates are in degrees and distances in kilometres unless another
+    sphere radius is given. Unlike ``Geometry.distance_between_points``,
+    these follow the curvature of the Earth.
+    """
+
+    @staticmethod
+    def haversine(lat1: Number, lon1: Number, lat2: Number, lon2: Number,
+                  radius: float = EARTH_RADIUS_KM) -> float:
+        """Calculate the great-circle distance between two points on a sphere.
+
+        Args:
+            lat1: Latitude of the first point
+            lon1: Longitude of the first point
+            lat2: Latitude of the second point
+            lon2: Longitude of the second point
+            radius: Sphere radius, which sets the unit of the result
+
+        Returns:
+            The distance between the points
+
+        Raises:
+            ValueError: If a coordinate is out of range
+        """
+        _check_coordinate(lat1, lon1)
+        _check_coordinate(lat2, lon2)
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        dphi = phi2 - phi1
+        dlam = math.radians(lon2 - lon1)
+        a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+        return 2 * radius * math.asin(min(1.0, math.sqrt(a)))
+
+    @staticmethod
+    def vincenty(lat1: Number, lon1: Number, lat2: Number, lon2: Number,
+                 tolerance: float = 1e-12, max_iterations: int = 200) -> float:
+        """Calculate the distance between two points on the WGS-84 ellipsoid.
+
+        Args:
+            lat1: Latitude of the first point
+            lon1: Longitude of the first point
+            lat2: Latitude of the second point
+            lon2: Longitude of the second point
+            tolerance: Convergence threshold on the longitude difference, in radians
+            max_iterations: Iteration limit
+
+        Returns:
+            The distance between the points in kilometres
+
+        Raises:
+            ValueError: If a coordinate is out of range or the iteration does
+                not converge (nearly antipodal points)
+        """
+        _check_coordinate(lat1, lon1)
+        _check_coordinate(lat2, lon2)
+        u1 = _reduced_latitude(math.radians(lat1))
+        u2 = _reduced_latitude(math.radians(lat2))
+        return _vincenty(math.sin(u1), math.cos(u1), math.sin(u2), math.cos(u2),
+                         math.radians(lon2 - lon1), tolerance, max_iterations)
+
+    @staticmethod
+    def geohash_encode(lat: Number, lon: Number, precision: int = 9) -> str:
+        """Encode a point as a geohash string.
+
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+            precision: Number of base-32 characters
+
+        Returns:
+            The geohash of the cell containing the point
+
+        Raises:
+            ValueError: If a coordinate or the precision is out of range
+        """
+        _check_coordinate(lat, lon)
+        if not 1 <= precision <= _MAX_PRECISION:
+            raise ValueError(f"Precision must be between 1 and {_MAX_PRECISION}")
+        lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+        chars = []
+        bits = 0
+        value = 0
+        even = True
+        while len(chars) < precision:
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                if lon >= mid:
+                    value = value * 2 + 1
+                    lon_lo = mid
+                else:
+                    value *= 2
+                    lon_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if lat >= mid:
+                    value = value * 2 + 1
+                    lat_lo = mid
+                else:
+                    value *= 2
+                    lat_hi = mid
+            even = not even
+            bits += 1
+            if bits == 5:
+                chars.append(_BASE32[value])
+                bits = 0
+                value = 0
+        return "".join(chars)
+
+    @staticmethod
+    def geohash_decode(geohash: str) -> Tuple[float, float, float, float]:
+        """Decode a geohash to the centre of its cell.
+
+        Args:
+            geohash: A geohash string
+
+        Returns:
+            ``(lat, lon, lat_error, lon_error)`` where the errors are half the
+            cell height and width in degrees
+
+        Raises:
+            ValueError: If the string is empty or contains invalid characters
+        """
+        if not geohash:
+            raise ValueError("Geohash cannot be empty")
+        lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+        even = True
+        for char in geohash:
+            try:
+                value = _DECODE[char]
+            except KeyError:
+                raise ValueError(f"Invalid geohash character: {char!r}") from None
+            for shift in range(4, -1, -1):
+                bit = (value >> shift) & 1
+                if even:
+                    mid = (lon_lo + lon_hi) / 2
+                    if bit:
+                        lon_lo = mid
+                    else:
+                        lon_hi = mid
+                else:
+                    mid = (lat_lo + lat_hi) / 2
+                    if bit:
+                        lat_lo = mid
+                    else:
+                        lat_hi = mid
+                even = not even
+        return ((lat_lo + lat_hi) / 2, (lon_lo + lon_hi) / 2,
+                (lat_hi - lat_lo) / 2, (lon_hi - lon_lo) / 2)
+
+    @staticmethod
+    def geohash_neighbors(geohash: str) -> List[str]:
+        """Return the geohashes of the up to eight cells surrounding a cell.
+
+        Longitude wraps around the antimeridian; cells beyond a pole are omitted.
+        """
+        lat, lon, lat_err, lon_err = Geodesic.geohash_decode(geohash)
+        neighbors = []
+        for dlat in (-1, 0, 1):
+            for dlon in (-1, 0, 1):
+                if dlat == dlon == 0:
+                    continue
+                n_lat = lat + 2 * lat_err * dlat
+                if not -90 < n_lat < 90:
+                    continue
+                n_lon = (lon + 2 * lon_err * dlon + 180) % 360 - 180
+                neighbors.append(Geodesic.geohash_encode(n_lat, n_lon, len(geohash)))
+        return neighbors
+
+
+class GeohashIndex:
+    """An index of keyed points for radius queries using geohash prefixes.
+
+    Points are kept sorted by full-precision geohash. A radius query picks
+    the longest prefix whose cells are at least as large as the radius and
+    scans only the query cell and its eight neighbours, each of which is a
+    contiguous range of the sorted hashes, before confirming candidates
+    with the haversine distance.
+    """
+
+    def __init__(self, precision: int = 9):
+        """Create an empty index.
+
+        Args:
+            precision: Geohash length stored for each point
+
+        Raises:
+            ValueError: If the precision is out of range
+        """
+        if not 1 <= precision <= _MAX_PRECISION:
+            raise ValueError(f"Precision must be between 1 and {_MAX_PRECISION}")
+        self.precision = precision
+        self._points: Dict[Hashable, Tuple[float, float, str]] = {}
+        self._hashes: List[str] = []
+        self._keys: List[Hashable] = []
+        self._pending: List[Tuple[str, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _flush(self) -> None:
+        if self._pending:
+            entries = sorted(list(zip(self._hashes, self._keys)) + self._pending,
+                             key=lambda entry: entry[0])
+            self._hashes = [geohash for geohash, _ in entries]
+            self._keys = [key for _, key in entries]
+            self._pending = []
+
+    def add(self, key: Hashable, lat: Number, lon: Number) -> None:
+        """Add or replace a point.
+
+        Points are buffered and merged into the sorted hashes by the next query.
+
+        Raises:
+            ValueError: If a coordinate is out of range
+        """
+        geohash = Geodesic.geohash_encode(lat, lon, self.precision)
+        if key in self._points:
+            self.remove(key)
+        self._points[key] = (lat, lon, geohash)
+        self._pending.append((geohash, key))
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a point.
+
+        Raises:
+            KeyError: If the key is not present
+        """
+        _, _, geohash = self._points.pop(key)
+        self._flush()
+        i = bisect.bisect_left(self._hashes, geohash)
+        while self._keys[i] != key:
+            i += 1
+        del self._hashes[i]
+        del self._keys[i]
+
+    def _prefix_length(self, lat: float, radius: float) -> int:
+        # The circle reaches its widest longitude span at its most poleward latitude
+        reach = min(90.0, abs(lat) + radius / KM_PER_DEGREE)
+        cos_lat = math.cos(math.radians(reach))
+        for precision in range(self.precision, 0, -1):
+            lat_deg, lon_deg = _cell_degrees(precision)
+            if lat_deg * KM_PER_DEGREE >= radius and lon_deg * KM_PER_DEGREE * cos_lat >= radius:
+                return precision
+        return 0
+
+    def within_radius(self, lat: Number, lon: Number,
+                      radius: float) -> List[Tuple[float, Hashable]]:
+        """Find every point within a great-circle distance of a query point.
+
+        Args:
+            lat: Latitude of the query point
+            lon: Longitude of the query point
+            radius: The maximum distance in kilometres, inclusive
+
+        Returns:
+            ``(distance, key)`` pairs, closest first
+
+        Raises:
+            ValueError: If radius is negative or a coordinate is out of range
+        """
+        if radius < 0:
+            raise ValueError("Radius cannot be negative")
+        _check_coordinate(lat, lon)
+        self._flush()
+        precision = self._prefix_length(lat, radius)
+        if precision == 0:
+            candidates = list(self._points)
+        else:
+            cell = Geodesic.geohash_encode(lat, lon, precision)
+            candidates = []
+            for prefix in set([cell] + Geodesic.geohash_neighbors(cell)):
+                start = bisect.bisect_left(self._hashes, prefix)
+                stop = bisect.bisect_left(self._hashes, prefix + "~", start)
+                candidates.extend(self._keys[start:stop])
+        found = []
+        for key in candidates:
+            p_lat, p_lon, _ = self._points[key]
+            d = Geodesic.haversine(lat, lon, p_lat, p_lon)
+            if d <= radius:
+                found.append((d, key))
+        found.sort(key=lambda item: item[0])
+        return found
@@ -0,0 +1,275 @@
+"""
+Histogram module for binned counts with ECDF and percentile lookups.
+"""
+import math
+import operator
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import partial
+from itertools import accumulate
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+Number = Union[int, float]
+
+# Values sorted at a time by extend(), at least; more for many bins
+_CHUNK = 8192
+
+
+def _check_not_nan(values: Sequence[Number]) -> None:
+    # NaN compares unequal to itself; it has no bin and would break the sorting
+    if any(map(operator.ne, values, values)):
+        raise ValueError("Histogram values cannot be NaN")
+
+
+class Histogram:
+    """Counts of values in sorted bins.
+
+    Bin i holds values from ``edges[i]`` up to, but excluding,
+    ``edges[i + 1]``; the last bin also holds the last edge. Values outside
+    the edges are counted as underflow and overflow. Counts are kept in an
+    ``array('Q')`` and batches are binned without a Python loop per value.
+
+    ECDF and percentile lookups binary-search cumulative counts, which are
+    rebuilt once after the counts change, and interpolate linearly within a
+    bin. Histograms with the same edges merge exactly, so they can be built
+    over separate chunks or in separate processes (they can be pickled).
+    """
+
+    def __init__(self, edges: Iterable[Number]):
+        """Create an empty histogram.
+
+        Args:
+            edges: Strictly increasing, finite bin edges, at least two
+
+        Raises:
+            ValueError: If the edges are not valid
+        """
+        edges = tuple(float(edge) for edge in edges)
+        if len(edges) < 2:
+            raise ValueError("At least two bin edges are required")
+        if not all(map(math.isfinite, edges)) or any(a >= b for a, b in zip(edges, edges[1:])):
+            raise ValueError("Bin edges must be finite and strictly increasing")
+        self.edges = edges
+        self.counts = array("Q", bytes(8 * (len(edges) - 1)))
+        self.underflow = 0
+        self.overflow = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._cumulative: Optional[List[int]] = None
+
+    @classmethod
+    def fixed(cls, low: Number, high: Number, bins: int) -> "Histogram":
+        """Create a histogram of equally wide bins from low to high.
+
+        Raises:
+            ValueError: If bins is not positive or low is not below high
+        """
+        if bins < 1:
+            raise ValueError("Number of bins must be positive")
+        if not low < high:
+            raise ValueError("Low must be less than high")
+        width = (high - low) / bins
+        return cls([low + i * width for i in range(bins)] + [high])
+
+    @classmethod
+    def log_scale(cls, low: Number, high: Number, sub_buckets: int = 16) -> "Histogram":
+        """Create log-linear (HDR-style) bins covering low to high.
+
+        Every power of two is split into sub_buckets equally wide bins, so a
+        bin is never wider than 1 / sub_buckets of its lower edge and the
+        relative error of a percentile stays bounded across many orders of
+        magnitude.
+
+        Raises:
+            ValueError: If low is not positive, low is not below high or
+                sub_buckets is not positive
+        """
+        if sub_buckets < 1:
+            raise ValueError("Number of sub-buckets must be positive")
+        if not 0 < low < high:
+            raise ValueError("Log-scale bins need 0 < low < high")
+        first = math.floor(math.log2(low))
+        last = math.ceil(math.log2(high))
+        # Divide before scaling so edges near the largest float do not overflow
+        edges = [math.ldexp((sub_buckets + i) / sub_buckets, exponent)
+                 for exponent in range(first, last) for i in range(sub_buckets)]
+        edges.append(math.ldexp(1.0, last) if last < sys.float_info.max_exp else sys.float_info.max)
+        start = bisect_right(edges, low) - 1
+        stop = bisect_left(edges, high) + 1
+        return cls(edges[start:stop])
+
+    @classmethod
+    def quantile(cls, values: Iterable[Number], bins: int) -> "Histogram":
+        """Create bins holding about equally many of the values, and count them.
+
+        Edges are placed at quantiles of the values, so dense regions get
+        narrow bins. Repeated values can merge quantiles, leaving fewer bins.
+
+        Raises:
+            ValueError: If bins is not positive, there are fewer than two
+                distinct values or a value is NaN
+        """
+        if bins < 1:
+            raise ValueError("Number of bins must be positive")
+        values = list(values)
+        _check_not_nan(values)
+        ordered = sorted(values)
+        n = len(ordered)
+        edges = list(dict.fromkeys(ordered[round(i * (n - 1) / bins)] for i in range(bins + 1))) \
+            if n else []
+        if len(edges) < 2:
+            raise ValueError("Quantile bins need at least two distinct values")
+        histogram = cls(edges)
+        histogram.extend(values)
+        return histogram
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __repr__(self) -> str:
+        return (f"Histogram(bins={len(self.counts)}, range=[{self.edges[0]!r}, {self.edges[-1]!r}], "
+                f"total={self.total})")
+
+    @property
+    def total(self) -> int:
+        """Number of values added, including underflow and overflow."""
+        return self.underflow + sum(self.counts) + self.overflow
+
+    def add(self, value: Number) -> None:
+        """Count one value.
+
+        Raises:
+            ValueError: If the value is NaN
+        """
+        if value != value:
+            raise ValueError("Histogram values cannot be NaN")
+        edges = self.edges
+        position = bisect_right(edges, value)
+        if position == 0:
+            self.underflow += 1
+        elif position < len(edges) or value == edges[-1]:
+            self.counts[position - 1 if position < len(edges) else -1] += 1
+        else:
+            self.overflow += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._cumulative = None
+
+    def extend(self, values: Iterable[Number]) -> None:
+        """Count a batch of values.
+
+        Each chunk of the batch is sorted and every edge is bisected into
+        it; the differences between neighbouring positions are the counts.
+        Sorting floats is faster than bisecting every value into the edges.
+
+        Raises:
+            ValueError: If any value is NaN, in which case nothing is counted
+        """
+        if not isinstance(values, (list, tuple, array)):
+            values = list(values)
+        _check_not_nan(values)
+        edges = self.edges
+        step = max(_CHUNK, 16 * len(edges))
+        for start in range(0, len(values), step):
+            ordered = sorted(values[start:start + step])
+            positions = list(map(partial(bisect_left, ordered), edges[:-1]))
+            # The last bin is closed, so values equal to the last edge belong in it
+            positions.append(bisect_right(ordered, edges[-1]))
+            self.underflow += positions[0]
+            self.overflow += len(ordered) - positions[-1]
+            self.counts = array("Q", map(operator.add, self.counts,
+                                         map(operator.sub, positions[1:], positions[:-1])))
+            self.min = min(self.min, ordered[0])
+            self.max = max(self.max, ordered[-1])
+            self._cumulative = None
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Return a histogram holding the counts of both, leaving both unchanged.
+
+        Raises:
+            ValueError: If the histograms have different edges
+        """
+        if self.edges != other.edges:
+            raise ValueError("Histograms must have the same bin edges")
+        result = Histogram.__new__(Histogram)
+        result.edges = self.edges
+        result.counts = array("Q", map(operator.add, self.counts, other.counts))
+        result.underflow = self.underflow + other.underflow
+        result.overflow = self.overflow + other.overflow
+        result.min = min(self.min, other.min)
+        result.max = max(self.max, other.max)
+        result._cumulative = None
+        return result
+
+    def bins(self) -> List[Tuple[float, float, int]]:
+        """Return (low edge, high edge, count) for every bin."""
+        return list(zip(self.edges, self.edges[1:], self.counts))
+
+    def _cumulative_counts(self) -> List[int]:
+        # cumulative[i] is the number of values below edges[i]
+        if self._cumulative is None:
+            self._cumulative = list(accumulate(self.counts, initial=self.underflow))
+        return self._cumulative
+
+    def cdf(self, x: Number) -> float:
+        """Estimate the fraction of values less than or equal to x.
+
+        Values are assumed to be spread evenly within their bin; underflow
+        values between the smallest value and the first edge, and overflow
+        values between the last edge and the largest value, or over the
+        observed range when every value lies outside the edges.
+
+        Raises:
+            ValueError: If the histogram is empty
+        """
+        total = self.total
+        if not total:
+            raise ValueError("Cannot calculate ECDF of empty histogram")
+        if x < self.min:
+            return 0.0
+        if x >= self.max:
+            return 1.0
+        edges = self.edges
+        cumulative = self._cumulative_counts()
+        if x < edges[0]:
+            high = min(edges[0], self.max)
+            return self.underflow * (x - self.min) / (high - self.min) / total
+        if x >= edges[-1]:
+            low = max(edges[-1], self.min)
+            return (cumulative[-1] + self.overflow * (x - low) / (self.max - low)) / total
+        i = bisect_right(edges, x) - 1
+        low, high = edges[i], edges[i + 1]
+        return (cumulative[i] + self.counts[i] * (x - low) / (high - low)) / total
+
+    def percentile(self, p: float) -> float:
+        """Estimate the p-th percentile, the inverse of cdf().
+
+        Raises:
+            ValueError: If the histogram is empty or p is not between 0 and 100
+        """
+        total = self.total
+        if not total:
+            raise ValueError("Cannot calculate percentile of empty histogram")
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        rank = total * p / 100
+        edges = self.edges
+        cumulative = self._cumulative_counts()
+        if rank <= self.underflow:
+            if not self.underflow:
+                return max(edges[0], self.min)
+            low, high = self.min, min(edges[0], self.max)
+            value = low + (high - low) * rank / self.underflow
+        elif rank > cumulative[-1]:
+            low, high = max(edges[-1], self.min), self.max
+            value = low + (high - low) * (rank - cumulative[-1]) / self.overflow
+        else:
+            i = bisect_left(cumulative, rank, 1) - 1
+            low, high = edges[i], edges[i + 1]
+            value = low + (high - low) * (rank - cumulative[i]) / self.counts[i]
+        return min(max(value, self.min), self.max)
+
+    def percentiles(self, ps: Sequence[float]) -> List[float]:
+        """Estimate several percentiles at once."""
+        return [self.percentile(p) for p in ps]
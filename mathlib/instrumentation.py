@@ -0,0 +1,330 @@
+"""
+Instrumentation module for per-operation call counts and latency histograms.
+
+Instrumentation is off by default and then costs nothing: enable() replaces
+the public methods of Calculator, Geometry, Statistics and BatchGeometry
+with timing wrappers, and disable() puts the original methods back. Setting
+the environment variable ``MATHLIB_INSTRUMENT=1`` enables it when mathlib is
+imported.
+
+Calls are grouped by operation (``"Statistics.percentile"``) and by input
+size, rounded up to a power of two, so ``snapshot()["Statistics.percentile"]
+["by_size"]["1024"]`` describes calls on 513 to 1024 values. Only calls made
+through the class are seen; functions captured before enable() (such as
+``mathlib.server.METHODS``) keep calling the originals.
+
+``enable(memory=True)`` (or ``MATHLIB_INSTRUMENT=memory``) also records the
+peak additional memory of every call and where it was allocated, using
+tracemalloc. This slows calls down considerably, and the recorded latencies
+include the tracing overhead.
+"""
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from mathlib.memory import MemoryUsage, in_trace, trace_memory
+
+# Sub-buckets per power of two; 16 keeps every bucket within about 6%
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS
+
+
+def _bucket(nanoseconds: int) -> int:
+    if nanoseconds < _SUB_COUNT:
+        return nanoseconds
+    shift = nanoseconds.bit_length() - _SUB_BITS - 1
+    return (shift + 1) * _SUB_COUNT + (nanoseconds >> shift) - _SUB_COUNT
+
+
+def _upper_bound(bucket: int) -> int:
+    if bucket < _SUB_COUNT:
+        return bucket
+    shift = bucket // _SUB_COUNT - 1
+    return ((bucket % _SUB_COUNT + _SUB_COUNT + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """A log-linear (HDR-style) histogram of durations.
+
+    Durations are kept in nanosecond buckets whose width grows with their
+    value, so the relative error of a reported percentile is bounded
+    (about 6%) from nanoseconds to hours while memory stays proportional
+    to the number of distinct buckets hit.
+    """
+
+    def __init__(self):
+        """Create an empty histogram."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._counts: Dict[int, int] = {}
+
+    def record(self, seconds: float) -> None:
+        """Add one duration."""
+        bucket = _bucket(max(int(seconds * 1e9), 0))
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Return the upper bound, in seconds, of the bucket holding the p-th percentile.
+
+        Raises:
+            ValueError: If the histogram is empty or p is not between 0 and 100
+        """
+        if not self.count:
+            raise ValueError("Cannot calculate percentile of empty list")
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                return min(_upper_bound(bucket) / 1e9, self.max)
+        return self.max
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Return (upper bound in seconds, cumulative count) for every non-empty bucket."""
+        result = []
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            result.append((_upper_bound(bucket) / 1e9, seen))
+        return result
+
+
+class _MemoryStats:
+    def __init__(self):
+        self.calls = 0
+        self.elements = 0
+        self.total_peak = 0
+        self.max_peak = 0
+        self.sites: Dict[str, int] = {}
+
+    def record(self, usage: MemoryUsage, elements: int) -> None:
+        self.calls += 1
+        self.elements += elements
+        self.total_peak += usage.peak
+        self.max_peak = max(self.max_peak, usage.peak)
+        for site, size in usage.sites:
+            self.sites[site] = max(self.sites.get(site, 0), size)
+
+    def summary(self) -> Dict[str, Any]:
+        sites = sorted(self.sites.items(), key=lambda item: -item[1])[:5]
+        return {
+            "peak_bytes": self.max_peak,
+            "mean_peak_bytes": self.total_peak / self.calls,
+            "bytes_per_element": self.total_peak / self.elements if self.elements else None,
+            "sites": [list(site) for site in sites],
+        }
+
+
+class _Operation:
+    def __init__(self):
+        self.errors = 0
+        self.by_size: Dict[int, LatencyHistogram] = {}
+        self.memory: Dict[int, _MemoryStats] = {}
+
+
+_lock = threading.Lock()
+_operations: Dict[str, _Operation] = {}
+_originals: List[Tuple[type, str, Any]] = []
+
+
+def _length(args: tuple) -> int:
+    if not args or isinstance(args[0], (str, bytes)):
+        return 0
+    try:
+        return len(args[0])
+    except TypeError:
+        return 0
+
+
+def _size_class(n: int) -> int:
+    return 1 << (n - 1).bit_length() if n else 0
+
+
+def _record(name: str, n: int, seconds: float, failed: bool,
+            usage: Optional[MemoryUsage] = None) -> None:
+    size = _size_class(n)
+    with _lock:
+        operation = _operations.get(name)
+        if operation is None:
+            operation = _operations[name] = _Operation()
+        histogram = operation.by_size.get(size)
+        if histogram is None:
+            histogram = operation.by_size[size] = LatencyHistogram()
+        histogram.record(seconds)
+        operation.errors += failed
+        if usage is not None:
+            memory = operation.memory.get(size)
+            if memory is None:
+                memory = operation.memory[size] = _MemoryStats()
+            memory.record(usage, n)
+
+
+def _wrap(name: str, func: Callable) -> Callable:
+    clock = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        failed = True
+        start = clock()
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            _record(name, _length(args), clock() - start, failed)
+
+    return wrapper
+
+
+def _wrap_memory(name: str, func: Callable) -> Callable:
+    clock = time.perf_counter
+    timed = _wrap(name, func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if in_trace():
+            # Memory of nested calls is part of the outer call's peak
+            return timed(*args, **kwargs)
+        usage = None
+        start = clock()
+        try:
+            result, usage = trace_memory(func, *args, **kwargs)
+            return result
+        finally:
+            _record(name, _length(args), clock() - start, usage is None, usage)
+
+    return wrapper
+
+
+def _default_targets() -> List[type]:
+    from mathlib.batch_geometry import BatchGeometry
+    from mathlib.calculator import Calculator
+    from mathlib.geometry import Geometry
+    from mathlib.statistics import Statistics
+    return [Calculator, Geometry, Statistics, BatchGeometry]
+
+
+def enabled() -> bool:
+    """Return whether instrumentation is on."""
+    return bool(_originals)
+
+
+def enable(targets: Optional[Iterable[type]] = None, memory: bool = False) -> None:
+    """Start recording calls to the public static methods of the targets.
+
+    Calling enable() while instrumentation is on has no effect; disable()
+    first to change the targets or the memory mode.
+
+    Args:
+        targets: Classes to instrument (defaults to Calculator, Geometry,
+            Statistics and BatchGeometry)
+        memory: Also record the peak memory and allocation sites of each call
+    """
+    wrap = _wrap_memory if memory else _wrap
+    with _lock:
+        if _originals:
+            return
+        for cls in targets if targets is not None else _default_targets():
+            for name, attribute in list(vars(cls).items()):
+                if name.startswith("_") or not isinstance(attribute, staticmethod):
+                    continue
+                _originals.append((cls, name, attribute))
+                wrapped = wrap(f"{cls.__name__}.{name}", attribute.__func__)
+                setattr(cls, name, staticmethod(wrapped))
+
+
+def disable() -> None:
+    """Stop recording and restore the original methods; recorded data is kept."""
+    with _lock:
+        while _originals:
+            cls, name, attribute = _originals.pop()
+            setattr(cls, name, attribute)
+
+
+def reset() -> None:
+    """Discard everything recorded so far."""
+    with _lock:
+        _operations.clear()
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Return the recorded data as plain dictionaries.
+
+    Returns:
+        For each operation: ``calls``, ``errors``, ``seconds`` (total) and
+        ``by_size``, which maps the size class (as a string, "0" for calls
+        without a sized first argument) to ``calls``, ``seconds``, ``p50``,
+        ``p90``, ``p99`` and ``max``; in memory mode also ``peak_bytes``
+        (largest), ``mean_peak_bytes``, ``bytes_per_element`` (mean peak over
+        mean input length) and ``sites`` (up to five [site, bytes] pairs)
+    """
+    with _lock:
+        result = {}
+        for name in sorted(_operations):
+            operation = _operations[name]
+            by_size = {}
+            for size in sorted(operation.by_size):
+                histogram = operation.by_size[size]
+                by_size[str(size)] = {
+                    "calls": histogram.count,
+                    "seconds": histogram.total,
+                    "p50": histogram.percentile(50),
+                    "p90": histogram.percentile(90),
+                    "p99": histogram.percentile(99),
+                    "max": histogram.max,
+                }
+                if size in operation.memory:
+                    by_size[str(size)].update(operation.memory[size].summary())
+            result[name] = {
+                "calls": sum(entry["calls"] for entry in by_size.values()),
+                "errors": operation.errors,
+                "seconds": sum(entry["seconds"] for entry in by_size.values()),
+                "by_size": by_size,
+            }
+        return result
+
+
+def to_prometheus(prefix: str = "mathlib") -> str:
+    """Render the recorded data in the Prometheus text exposition format.
+
+    Each operation and size class becomes a ``<prefix>_operation_seconds``
+    histogram labelled with ``operation`` and ``size``; failed calls are
+    counted in ``<prefix>_operation_errors_total``. In memory mode the
+    largest peak per call is exported as ``<prefix>_operation_peak_bytes``.
+    """
+    lines = [
+        f"# HELP {prefix}_operation_seconds Latency of mathlib operations.",
+        f"# TYPE {prefix}_operation_seconds histogram",
+    ]
+    errors = []
+    peaks = []
+    with _lock:
+        for name in sorted(_operations):
+            operation = _operations[name]
+            for size in sorted(operation.by_size):
+                histogram = operation.by_size[size]
+                labels = f'operation="{name}",size="{size}"'
+                for upper, count in histogram.buckets():
+                    lines.append(f'{prefix}_operation_seconds_bucket{{{labels},le="{upper:.9g}"}} {count}')
+                lines.append(f'{prefix}_operation_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{prefix}_operation_seconds_sum{{{labels}}} {histogram.total:.9g}")
+                lines.append(f"{prefix}_operation_seconds_count{{{labels}}} {histogram.count}")
+                if size in operation.memory:
+                    peaks.append(f"{prefix}_operation_peak_bytes{{{labels}}} {operation.memory[size].max_peak}")
+            errors.append(f'{prefix}_operation_errors_total{{operation="{name}"}} {operation.errors}')
+    lines.append(f"# HELP {prefix}_operation_errors_total Calls of mathlib operations that raised.")
+    lines.append(f"# TYPE {prefix}_operation_errors_total counter")
+    lines.extend(errors)
+    if peaks:
+        lines.append(f"# HELP {prefix}_operation_peak_bytes Largest additional memory held by one call.")
+        lines.append(f"# TYPE {prefix}_operation_peak_bytes gauge")
+        lines.extend(peaks)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,126 @@
+"""
+Memory module for measuring the peak allocation of a call with tracemalloc.
+"""
+import os
+import sys
+import threading
+import tracemalloc
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+
+# Allocation sites reported per call
+_TOP_SITES = 5
+
+# Growth over the last snapshot, as a fraction, before a new one is taken
+_SNAPSHOT_GROWTH = 0.25
+
+# Snapshots are not taken until a call has allocated this many bytes
+_MIN_SNAPSHOT_BYTES = 4096
+
+# Allocations made by the measuring code itself are not reported as sites
+_IGNORED = {
+    tracemalloc.__file__,
+    __file__,
+    os.path.join(os.path.dirname(__file__), "instrumentation.py"),
+}
+
+_local = threading.local()
+
+
+class MemoryUsage(NamedTuple):
+    """Memory allocated by one call, on top of what was allocated before it.
+
+    Attributes:
+        peak: Largest number of additional bytes held at any point of the call
+        sites: Up to five ("file:line", bytes) pairs for the lines holding the
+            most memory close to the peak, largest first
+    """
+
+    peak: int
+    sites: List[Tuple[str, int]]
+
+
+def _top_sites(snapshot: tracemalloc.Snapshot,
+               before: Optional[tracemalloc.Snapshot]) -> List[Tuple[str, int]]:
+    if before is None:
+        stats = [(stat.traceback[0], stat.size) for stat in snapshot.statistics("lineno")]
+    else:
+        stats = [(stat.traceback[0], stat.size_diff)
+                 for stat in snapshot.compare_to(before, "lineno") if stat.size_diff > 0]
+    stats = [(frame, size) for frame, size in stats if frame.filename not in _IGNORED]
+    stats.sort(key=lambda item: -item[1])
+    return [(f"{frame.filename}:{frame.lineno}", size) for frame, size in stats[:_TOP_SITES]]
+
+
+def _profiler_active() -> bool:
+    if sys.getprofile() is not None:
+        return True
+    # From Python 3.12 cProfile registers with sys.monitoring instead
+    monitoring = getattr(sys, "monitoring", None)
+    return monitoring is not None and monitoring.get_tool(monitoring.PROFILER_ID) is not None
+
+
+def in_trace() -> bool:
+    """Return whether the current thread is inside a trace_memory() call."""
+    return getattr(_local, "active", False)
+
+
+def trace_memory(func: Callable[..., Any], *args: Any, sites: bool = True,
+                 **kwargs: Any) -> Tuple[Any, MemoryUsage]:
+    """Call a function and measure the peak memory it allocated.
+
+    Tracing is started for the call if it is not already running. To find
+    allocation sites a profile hook watches the traced size as functions
+    return and snapshots the allocations each time it has grown by a
+    quarter, so hidden copies such as a ``sorted()`` list are caught while
+    they are still alive. That makes the call much slower; pass
+    sites=False to measure the peak alone. Sites are not collected while
+    another profiler (such as cProfile) is installed, or before Python 3.9.
+    Calls nested inside a traced call run without being measured.
+
+    Args:
+        func: The function to call
+        *args: Positional arguments for func
+        sites: Whether to collect allocation sites
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The function's result and its MemoryUsage
+    """
+    if in_trace():
+        return func(*args, **kwargs), MemoryUsage(0, [])
+    reset_peak = getattr(tracemalloc, "reset_peak", None)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _local.active = True
+    try:
+        before = None if started or not sites or reset_peak is None else tracemalloc.take_snapshot()
+        baseline = tracemalloc.get_traced_memory()[0]
+        if reset_peak is not None:
+            reset_peak()
+        state = {"peak": 0, "level": _MIN_SNAPSHOT_BYTES, "sites": []}
+
+        def hook(frame, event, arg):
+            if event != "return" and event != "c_return":
+                return
+            current, peak = tracemalloc.get_traced_memory()
+            if current - baseline > state["level"]:
+                state["peak"] = max(state["peak"], peak - baseline)
+                state["sites"] = _top_sites(tracemalloc.take_snapshot(), before)
+                state["level"] = (current - baseline) * (1 + _SNAPSHOT_GROWTH)
+                reset_peak()
+
+        hooked = sites and sys.version_info >= (3, 9) and not _profiler_active()
+        if hooked:
+            sys.setprofile(hook)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            if hooked:
+                sys.setprofile(None)
+        peak = max(state["peak"], tracemalloc.get_traced_memory()[1] - baseline)
+        return result, MemoryUsage(max(peak, 0), state["sites"])
+    finally:
+        _local.active = False
+        if started:
+            tracemalloc.stop()
@@ -0,0 +1,189 @@
+"""
+Point set module for algorithms over whole collections of 2D points.
+"""
+import math
+from typing import List, Sequence, Tuple, Union
+
+Number = Union[int, float]
+
+# Subproblems at or below this size are solved by comparing every pair
+_BRUTE_FORCE_SIZE = 8
+
+
+def _check_points(coords: Sequence[Number], dims: int = 2) -> int:
+    if len(coords) % dims:
+        raise ValueError(f"Coordinate buffer length must be a multiple of {dims}")
+    return len(coords) // dims
+
+
+def _cross(ox: float, oy: float, ax: float, ay: float, bx: float, by: float) -> float:
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+def _closest_brute_force(points: List[Tuple[float, float, int]]) -> Tuple[float, int, int]:
+    best = (math.inf, -1, -1)
+    for a in range(len(points)):
+        ax, ay, ai = points[a]
+        for b in range(a + 1, len(points)):
+            bx, by, bi = points[b]
+            d = math.hypot(bx - ax, by - ay)
+            if d < best[0]:
+                best = (d, ai, bi)
+    return best
+
+
+def _closest_recursive(by_x: List[Tuple[float, float, int]]
+                       ) -> Tuple[Tuple[float, int, int], List[Tuple[float, float, int]]]:
+    n = len(by_x)
+    if n <= _BRUTE_FORCE_SIZE:
+        return _closest_brute_force(by_x), sorted(by_x, key=lambda p: p[1])
+    mid = n // 2
+    mid_x = by_x[mid][0]
+    left, left_by_y = _closest_recursive(by_x[:mid])
+    right, right_by_y = _closest_recursive(by_x[mid:])
+    best = min(left, right)
+    # Both halves are already sorted by y, so this sort is a linear merge
+    by_y = sorted(left_by_y + right_by_y, key=lambda p: p[1])
+    strip = [p for p in by_y if abs(p[0] - mid_x) < best[0]]
+    for a in range(len(strip)):
+        ax, ay, ai = strip[a]
+        for b in range(a + 1, len(strip)):
+            bx, by, bi = strip[b]
+            if by - ay >= best[0]:
+                break
+            d = math.hypot(bx - ax, by - ay)
+            if d < best[0]:
+                best = (d, ai, bi)
+    return best, by_y
+
+
+class PointSet:
+    """A class for algorithms over sets of 2D points.
+
+    Points are passed as a flat coordinate buffer ``[x0, y0, x1, y1, ...]``
+    (a list, ``array('d')`` or memoryview) and referred to by their
+    position in it. Distances are Euclidean, the same metric as
+    ``Geometry.distance_between_points``.
+    """
+
+    @staticmethod
+    def bounding_box(coords: Sequence[Number], dims: int = 2
+                     ) -> Tuple[Tuple[Number, ...], Tuple[Number, ...]]:
+        """Calculate the axis-aligned bounding box of a set of points.
+
+        Args:
+            coords: Flat buffer of point coordinates
+            dims: Number of coordinates per point
+
+        Returns:
+            The minimum and maximum corners of the box
+
+        Raises:
+            ValueError: If there are no points or the buffer is malformed
+        """
+        if not _check_points(coords, dims):
+            raise ValueError("Cannot calculate bounding box of empty point set")
+        axes = [coords[axis::dims] for axis in range(dims)]
+        return tuple(min(axis) for axis in axes), tuple(max(axis) for axis in axes)
+
+    @staticmethod
+    def convex_hull(coords: Sequence[Number]) -> List[int]:
+        """Calculate the convex hull of a set of points with Andrew's monotone chain.
+
+        Args:
+            coords: Flat buffer of point coordinates
+
+        Returns:
+            Indices of the hull vertices in counter-clockwise order, starting
+            from the lowest-leftmost point. Points lying on a hull edge are
+            not included.
+
+        Raises:
+            ValueError: If there are no points or the buffer is malformed
+        """
+        n = _check_points(coords)
+        if n == 0:
+            raise ValueError("Cannot calculate convex hull of empty point set")
+        xs, ys = coords[0::2], coords[1::2]
+        order = sorted(range(n), key=lambda i: (xs[i], ys[i]))
+        # Drop duplicates so coincident points cannot appear twice on the hull
+        unique = [order[0]]
+        for i in order[1:]:
+            if xs[i] != xs[unique[-1]] or ys[i] != ys[unique[-1]]:
+                unique.append(i)
+        if len(unique) < 3:
+            return unique
+
+        def chain(indices: List[int]) -> List[int]:
+            hull: List[int] = []
+            for i in indices:
+                while len(hull) >= 2 and _cross(xs[hull[-2]], ys[hull[-2]], xs[hull[-1]],
+                                                ys[hull[-1]], xs[i], ys[i]) <= 0:
+                    hull.pop()
+                hull.append(i)
+            return hull
+
+        lower = chain(unique)
+        upper = chain(reversed(unique))
+        return lower[:-1] + upper[:-1]
+
+    @staticmethod
+    def closest_pair(coords: Sequence[Number]) -> Tuple[float, int, int]:
+        """Find the two closest points with divide and conquer in O(n log n).
+
+        Args:
+            coords: Flat buffer of point coordinates
+
+        Returns:
+            A ``(distance, i, j)`` tuple with i < j
+
+        Raises:
+            ValueError: If there are fewer than two points or the buffer is malformed
+        """
+        n = _check_points(coords)
+        if n < 2:
+            raise ValueError("Closest pair requires at least two points")
+        by_x = sorted(zip(coords[0::2], coords[1::2], range(n)))
+        (distance, i, j), _ = _closest_recursive(by_x)
+        return distance, min(i, j), max(i, j)
+
+    @staticmethod
+    def polygon_area(coords: Sequence[Number], signed: bool = False) -> float:
+        """Calculate the area of a simple polygon with the shoelace formula.
+
+        Args:
+            coords: Flat buffer of vertex coordinates, in order around the polygon
+            signed: If True, return a negative area for clockwise vertex order
+
+        Returns:
+            The area of the polygon
+
+        Raises:
+            ValueError: If there are fewer than three vertices or the buffer is malformed
+        """
+        n = _check_points(coords)
+        if n < 3:
+            raise ValueError("A polygon requires at least three vertices")
+        xs, ys = coords[0::2], coords[1::2]
+        twice_area = math.fsum(xs[i - 1] * ys[i] - xs[i] * ys[i - 1] for i in range(n))
+        area = twice_area / 2
+        return area if signed else abs(area)
+
+    @staticmethod
+    def polygon_perimeter(coords: Sequence[Number]) -> float:
+        """Calculate the perimeter of a closed polygon.
+
+        Args:
+            coords: Flat buffer of vertex coordinates, in order around the polygon
+
+        Returns:
+            The total length of the polygon's edges, including the closing edge
+
+        Raises:
+            ValueError: If there are fewer than two vertices or the buffer is malformed
+        """
+        n = _check_points(coords)
+        if n < 2:
+            raise ValueError("A polygon requires at least two vertices")
+        xs, ys = coords[0::2], coords[1::2]
+        return math.fsum(math.hypot(xs[i] - xs[i - 1], ys[i] - ys[i - 1]) for i in range(n))
@@ -0,0 +1,342 @@
+"""
+Sampling module for approximate statistics with confidence intervals.
+"""
+import math
+import random
+from bisect import bisect_left, insort
+from itertools import islice
+from statistics import NormalDist
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+from mathlib.shared_statistics import _combine, _moments
+from mathlib.statistics import Statistics
+
+Number = Union[int, float]
+
+# Values per block of a _SortedSample before the block is split
+_BLOCK = 1024
+
+
+class Estimate(NamedTuple):
+    """An approximate statistic with a confidence interval.
+
+    Attributes:
+        value: The point estimate
+        low: Lower end of the confidence interval
+        high: Upper end of the confidence interval
+        confidence: Confidence level of the interval, e.g. 0.95
+        n: Number of sampled values the estimate is based on
+    """
+
+    value: float
+    low: float
+    high: float
+    confidence: float
+    n: int
+
+    @property
+    def margin(self) -> float:
+        """Half the width of the confidence interval."""
+        return (self.high - self.low) / 2
+
+
+def _z(confidence: float) -> float:
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+class _SortedSample:
+    # A growing sample kept as short sorted blocks, so that adding a value
+    # and looking one up by rank never touch the whole sample
+
+    def __init__(self):
+        self._blocks: List[List[Number]] = []
+        self._maxes: List[Number] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, rank: int) -> Number:
+        for block in self._blocks:
+            if rank < len(block):
+                return block[rank]
+            rank -= len(block)
+        raise IndexError("Rank out of range")
+
+    def add(self, value: Number) -> None:
+        self._len += 1
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            return
+        i = min(bisect_left(self._maxes, value), len(self._blocks) - 1)
+        block = self._blocks[i]
+        insort(block, value)
+        self._maxes[i] = block[-1]
+        if len(block) > 2 * _BLOCK:
+            self._blocks[i:i + 1] = [block[:_BLOCK], block[_BLOCK:]]
+            self._maxes[i:i + 1] = [block[_BLOCK - 1], block[-1]]
+
+
+def _percentile_estimate(ordered: Sequence[Number], p: float, z: float,
+                         confidence: float) -> Estimate:
+    # ordered holds the sample in sorted order; the value is interpolated
+    # exactly as Statistics.percentile does
+    n = len(ordered)
+    q = p / 100
+    k = (n - 1) * q
+    f = math.floor(k)
+    c = math.ceil(k)
+    value = ordered[f] if f == c else ordered[f] * (c - k) + ordered[c] * (k - f)
+    spread = z * math.sqrt(n * q * (1 - q))
+    lower = math.floor(n * q - spread)
+    upper = math.ceil(n * q + spread)
+    low = ordered[lower] if lower >= 0 else -math.inf
+    high = ordered[upper] if upper < n else math.inf
+    return Estimate(value, min(low, value), max(high, value), confidence, n)
+
+
+class Reservoir:
+    """A fixed-size uniform sample of a stream, maintained with Algorithm L.
+
+    Instead of drawing a random number for every item, Algorithm L draws
+    how many items to skip before the next replacement, so after the
+    reservoir fills the cost grows with ``k * log(n / k)`` rather than n.
+    ``sample`` is a plain list and can be passed to any Statistics method.
+    """
+
+    def __init__(self, k: int, seed: Optional[int] = None):
+        """Create an empty reservoir.
+
+        Args:
+            k: Number of items to keep
+            seed: Seed for reproducible samples
+
+        Raises:
+            ValueError: If k is not positive
+        """
+        if k < 1:
+            raise ValueError("Reservoir size must be positive")
+        self.k = k
+        self.sample: List[Number] = []
+        self.seen = 0
+        self._random = random.Random(seed)
+        self._w = 1.0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self.sample)
+
+    def _advance(self) -> None:
+        rng = self._random
+        self._w *= math.exp(math.log(rng.random() or 1e-300) / self.k)
+        skip = math.floor(math.log(rng.random() or 1e-300) / math.log1p(-self._w))
+        self._next = self.seen + skip
+
+    def add(self, item: Number) -> None:
+        """Offer one item to the reservoir."""
+        self.extend((item,))
+
+    def extend(self, items: Iterable[Number]) -> None:
+        """Offer a stream of items, skipping over those that will not be kept."""
+        iterator = iter(items)
+        if len(self.sample) < self.k:
+            for item in islice(iterator, self.k - len(self.sample)):
+                self.sample.append(item)
+                self.seen += 1
+            if len(self.sample) < self.k:
+                return
+            self._advance()
+        while True:
+            gap = self._next - self.seen
+            if gap:
+                skipped = sum(1 for _ in islice(iterator, gap))
+                self.seen += skipped
+                if skipped < gap:
+                    return
+            item = next(iterator, _END)
+            if item is _END:
+                return
+            self.sample[self._random.randrange(self.k)] = item
+            self.seen += 1
+            self._advance()
+
+
+_END = object()
+
+
+class StratifiedSample:
+    """Separate reservoirs per stratum, combined with population weights.
+
+    Strata with very different values (regions, product lines, sensors)
+    get their own sample, so a rare stratum is not drowned out by a large
+    one. Estimates weight each stratum by the number of items it received.
+    """
+
+    def __init__(self, k: int, seed: Optional[int] = None):
+        """Create an empty stratified sample.
+
+        Args:
+            k: Number of items kept per stratum
+            seed: Seed for reproducible samples
+
+        Raises:
+            ValueError: If k is not positive
+        """
+        if k < 1:
+            raise ValueError("Reservoir size must be positive")
+        self.k = k
+        self.strata: Dict[Hashable, Reservoir] = {}
+        self._random = random.Random(seed)
+
+    def add(self, stratum: Hashable, item: Number) -> None:
+        """Offer an item belonging to a stratum."""
+        self.extend(stratum, (item,))
+
+    def extend(self, stratum: Hashable, items: Iterable[Number]) -> None:
+        """Offer many items of one stratum."""
+        reservoir = self.strata.get(stratum)
+        if reservoir is None:
+            reservoir = self.strata[stratum] = Reservoir(self.k, self._random.randrange(2 ** 32))
+        reservoir.extend(items)
+
+    def mean(self, confidence: float = 0.95) -> Estimate:
+        """Estimate the population mean with a confidence interval.
+
+        Raises:
+            ValueError: If nothing has been sampled or confidence is invalid
+        """
+        z = _z(confidence)
+        total = sum(reservoir.seen for reservoir in self.strata.values())
+        if not total:
+            raise ValueError("Cannot calculate mean of empty list")
+        value = variance = 0.0
+        n = 0
+        for reservoir in self.strata.values():
+            weight = reservoir.seen / total
+            sample = reservoir.sample
+            value += weight * Statistics.mean(sample)
+            if len(sample) > 1:
+                fpc = 1 - len(sample) / reservoir.seen
+                variance += weight * weight * Statistics.variance(sample) / len(sample) * fpc
+            n += len(sample)
+        margin = z * math.sqrt(variance)
+        return Estimate(value, value - margin, value + margin, confidence, n)
+
+
+class ApproximateStatistics:
+    """Statistics estimated from samples, with confidence intervals.
+
+    Each method takes a sample (for example ``Reservoir.sample``) and
+    computes the point estimate with the matching Statistics method.
+    """
+
+    @staticmethod
+    def mean(sample: Sequence[Number], population: Optional[int] = None,
+             confidence: float = 0.95) -> Estimate:
+        """Estimate the mean with a normal-approximation interval.
+
+        Args:
+            sample: A uniform random sample
+            population: Size of the population, for the finite population correction
+            confidence: Confidence level of the interval
+
+        Raises:
+            ValueError: If the sample is empty or confidence is invalid
+        """
+        z = _z(confidence)
+        value = Statistics.mean(sample)
+        n = len(sample)
+        if n < 2:
+            return Estimate(value, -math.inf, math.inf, confidence, n)
+        fpc = 1 - n / population if population else 1.0
+        margin = z * math.sqrt(Statistics.variance(sample) / n * max(fpc, 0.0))
+        return Estimate(value, value - margin, value + margin, confidence, n)
+
+    @staticmethod
+    def percentile(sample: Sequence[Number], p: float, confidence: float = 0.95) -> Estimate:
+        """Estimate the p-th percentile with a distribution-free interval.
+
+        The interval lies between two order statistics of the sample whose
+        ranks come from the normal approximation to the binomial
+        distribution, so no assumption is made about the data's shape.
+
+        Raises:
+            ValueError: If the sample is empty, p is not between 0 and 100 or
+                confidence is invalid
+        """
+        z = _z(confidence)
+        if not len(sample):
+            raise ValueError("Cannot calculate percentile of empty list")
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        return _percentile_estimate(sorted(sample), p, z, confidence)
+
+    @staticmethod
+    def median(sample: Sequence[Number], confidence: float = 0.95) -> Estimate:
+        """Estimate the median; see percentile()."""
+        return ApproximateStatistics.percentile(sample, 50, confidence)
+
+    @staticmethod
+    def sample_until(data: Sequence[Number], tolerance: float, statistic: str = "mean",
+                     p: float = 50, confidence: float = 0.95, batch: int = 1000,
+                     max_samples: Optional[int] = None, seed: Optional[int] = None) -> Estimate:
+        """Sample random rows until the interval's margin is within a tolerance.
+
+        Rows are drawn with replacement in batches from a random-access
+        sequence (a list, an ``array``, a memoryview or a mapped column), so
+        the cost depends on the tolerance, not on the size of the data. The
+        estimate is updated with each batch rather than recomputed: the mean
+        from running moments, percentiles from a sample kept in sorted blocks.
+
+        Args:
+            data: The full dataset
+            tolerance: Largest acceptable margin (half the interval width)
+            statistic: "mean", "median" or "percentile"
+            p: Percentile for statistic="percentile"
+            confidence: Confidence level of the interval
+            batch: Rows drawn between checks of the margin
+            max_samples: Stop after this many rows even if the tolerance is not met
+                (defaults to the size of the data)
+            seed: Seed for reproducible sampling
+
+        Returns:
+            The first estimate whose margin is within tolerance, or the last one
+
+        Raises:
+            ValueError: If the data is empty, tolerance or batch is not
+                positive, or the statistic is unknown
+        """
+        if not len(data):
+            raise ValueError(f"Cannot calculate {statistic} of empty list")
+        if tolerance <= 0 or batch < 1:
+            raise ValueError("Tolerance and batch must be positive")
+        if statistic not in ("mean", "median", "percentile"):
+            raise ValueError(f"Unknown statistic: {statistic}")
+        z = _z(confidence)
+        q = 50 if statistic == "median" else p
+        if statistic != "mean" and not 0 <= q <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        limit = len(data) if max_samples is None else max_samples
+        rng = random.Random(seed)
+        size = len(data)
+        moments = None
+        ordered = _SortedSample()
+        n = 0
+        while True:
+            draw = max(1, min(batch, limit - n))
+            values = [data[rng.randrange(size)] for _ in range(draw)]
+            n += draw
+            if statistic == "mean":
+                moments = _moments(values) if moments is None else _combine(moments, _moments(values))
+                _, mean, m2, _, _ = moments
+                margin = z * math.sqrt(m2 / (n - 1) / n) if n > 1 else math.inf
+                result = Estimate(mean, mean - margin, mean + margin, confidence, n)
+            else:
+                for value in values:
+                    ordered.add(value)
+                result = _percentile_estimate(ordered, q, z, confidence)
+            if result.margin <= tolerance or n >= limit:
+                return result
@@ -0,0 +1,405 @@
+"""
+Server module exposing mathlib operations as a line-delimited JSON-RPC service.
+
+Each line sent over a TCP or Unix socket is a JSON-RPC 2.0 request such as
+``{"jsonrpc": "2.0", "id": 1, "method": "Geometry.circle_area", "params": [2]}``
+and each response is written back as one line. Responses to pipelined
+requests may arrive out of order; match them by id.
+
+Usage: python -m mathlib.server [--host HOST] [--port PORT | --unix PATH] [--workers N]
+"""
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mathlib.calculator import Calculator
+from mathlib.geometry import Geometry
+from mathlib.statistics import Statistics
+
+METHODS: Dict[str, Callable] = {
+    f"{cls.__name__}.{name}": getattr(cls, name)
+    for cls in (Calculator, Geometry, Statistics)
+    for name, _ in inspect.getmembers(cls, inspect.isfunction)
+}
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+OPERATION_ERROR = -32000
+
+# Largest accepted request line, so Statistics datasets fit in one request
+_MAX_LINE = 16 * 1024 * 1024
+
+Call = Tuple[str, Any]
+Outcome = Tuple[bool, Any]
+
+
+def _run_batch(calls: List[Call]) -> List[Outcome]:
+    """Run a batch of calls, returning (True, result) or (False, (code, message)) for each."""
+    outcomes = []
+    for method, params in calls:
+        func = METHODS[method]
+        try:
+            result = func(**params) if isinstance(params, dict) else func(*params)
+        except TypeError as error:
+            outcomes.append((False, (INVALID_PARAMS, str(error))))
+        except (ValueError, ArithmeticError) as error:
+            outcomes.append((False, (OPERATION_ERROR, str(error))))
+        else:
+            outcomes.append((True, result))
+    return outcomes
+
+
+class RPCError(Exception):
+    """An error response from the compute server.
+
+    Attributes:
+        code: The JSON-RPC error code
+    """
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class ComputeServer:
+    """An asyncio JSON-RPC server that micro-batches calls onto a process pool.
+
+    Requests from all connections go into one bounded queue. A batching
+    task takes the first waiting call, collects more until ``max_batch``
+    calls are gathered or ``max_delay`` seconds have passed, and runs the
+    whole batch as one job on the pool, so small requests pay for one
+    inter-process round trip between them.
+
+    Backpressure: at most ``workers`` batches run at once. When they are
+    busy the queue fills, and once it holds ``max_pending`` calls the
+    server stops reading from connections until there is room, which in
+    turn fills the clients' socket buffers.
+
+    If a worker process dies, the batches on the pool fail with an
+    operation error and the pool is replaced, so later calls still run.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_batch: int = 64,
+                 max_delay: float = 0.002, max_pending: int = 1024):
+        """Configure the server; call start() to listen.
+
+        Args:
+            workers: Size of the process pool; 0 runs batches in the event
+                loop thread, which suits tests and tiny workloads
+            max_batch: Largest number of calls in one batch
+            max_delay: Longest time in seconds a call waits for its batch to fill
+            max_pending: Calls queued before the server stops reading requests
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 0 or max_batch < 1 or max_pending < 1 or max_delay < 0:
+            raise ValueError("Server limits must be positive")
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.batches = 0
+        self.calls = 0
+        self._pool: Optional[Executor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._running: Optional[asyncio.Semaphore] = None
+        self._handlers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0,
+                    path: Optional[str] = None) -> None:
+        """Start listening on a TCP port, or on a Unix socket if path is given."""
+        self._queue = asyncio.Queue(self.max_pending)
+        self._running = asyncio.Semaphore(max(1, self.workers))
+        if self.workers:
+            self._pool = ProcessPoolExecutor(self.workers)
+        self._batcher = asyncio.ensure_future(self._batch_loop())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path, limit=_MAX_LINE)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=_MAX_LINE)
+
+    @property
+    def address(self) -> Any:
+        """The bound address, e.g. ``("127.0.0.1", 54321)`` or a socket path."""
+        return self._server.sockets[0].getsockname()
+
+    async def close(self) -> None:
+        """Stop accepting connections, cancel batching and shut down the pool."""
+        if self._server is not None:
+            self._server.close()
+            # Closing the transports ends each handler's read loop cleanly
+            for writer in list(self._handlers.values()):
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            await asyncio.gather(self._batcher, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    async def __aenter__(self) -> "ComputeServer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._running.acquire()
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Call, asyncio.Future]]) -> None:
+        pool = self._pool
+        try:
+            calls = [call for call, _ in batch]
+            if pool is None:
+                outcomes = _run_batch(calls)
+            else:
+                try:
+                    outcomes = await asyncio.get_running_loop().run_in_executor(
+                        pool, _run_batch, calls)
+                except BrokenProcessPool:
+                    # Every batch on the pool fails together; only the first replaces it
+                    if self._pool is pool:
+                        pool.shutdown(wait=False)
+                        self._pool = ProcessPoolExecutor(self.workers)
+                    raise
+            self.batches += 1
+            self.calls += len(batch)
+            for (_, future), outcome in zip(batch, outcomes):
+                if not future.done():
+                    future.set_result(outcome)
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result((False, (OPERATION_ERROR, f"Batch failed: {error}")))
+        finally:
+            self._running.release()
+
+    async def _submit(self, request: Any) -> Any:
+        """Queue a request, waiting while the queue is full.
+
+        Returns:
+            The call's future, or an error response for an invalid request
+        """
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        method = request["method"]
+        params = request.get("params", [])
+        if method not in METHODS:
+            return _error(request.get("id"), METHOD_NOT_FOUND, f"Method not found: {method}")
+        if not isinstance(params, (list, dict)):
+            return _error(request.get("id"), INVALID_PARAMS, "Params must be an array or object")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((method, params), future))
+        return future
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        handler = asyncio.current_task()
+        self._handlers[handler] = writer
+        tasks = set()
+        lock = asyncio.Lock()
+
+        async def send(response: Dict[str, Any]) -> None:
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        async def reply(request: Dict[str, Any], future: asyncio.Future) -> None:
+            ok, value = await future
+            if "id" not in request:
+                return
+            if ok:
+                try:
+                    await send({"jsonrpc": "2.0", "id": request["id"], "result": value})
+                    return
+                except (TypeError, ValueError) as error:
+                    # json.dumps fails before anything is written, e.g. on huge ints
+                    value = (OPERATION_ERROR, f"Cannot encode result: {error}")
+            await send(_error(request["id"], *value))
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await send(_error(None, INVALID_REQUEST, "Request too large"))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await send(_error(None, PARSE_ERROR, "Parse error"))
+                    continue
+                # Waiting here while the queue is full is what stops the reads
+                submitted = await self._submit(request)
+                if isinstance(submitted, dict):
+                    await send(submitted)
+                    continue
+                task = asyncio.ensure_future(reply(request, submitted))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            del self._handlers[handler]
+            writer.close()
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class ComputeClient:
+    """An asyncio client for ComputeServer that pipelines calls on one connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 0,
+                      path: Optional[str] = None) -> "ComputeClient":
+        """Connect over TCP, or over a Unix socket if path is given."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=_MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=_MAX_LINE)
+        return cls(reader, writer)
+
+    async def __aenter__(self) -> "ComputeClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the connection and fail any calls still waiting."""
+        self._writer.close()
+        self._receiver.cancel()
+        await asyncio.gather(self._receiver, return_exceptions=True)
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed"))
+            self._pending.clear()
+
+    async def call(self, method: str, *params: Any) -> Any:
+        """Call a method such as ``"Statistics.mean"`` and return its result.
+
+        Raises:
+            RPCError: If the server returns an error
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": list(params)}
+        self._writer.write(json.dumps(request).encode() + b"\n")
+        await self._writer.drain()
+        response = await future
+        if "error" in response:
+            raise RPCError(response["error"]["code"], response["error"]["message"])
+        return response["result"]
+
+
+async def measure_latency(client: ComputeClient, calls: List[Tuple[str, List[Any]]],
+                          concurrency: int) -> List[float]:
+    """Send calls with a fixed number in flight and time each one.
+
+    Args:
+        client: A connected client
+        calls: (method, params) pairs to send
+        concurrency: Number of calls in flight at any time
+
+    Returns:
+        The latency of every call in seconds, in completion order
+    """
+    latencies: List[float] = []
+    queue = iter(calls)
+
+    async def worker() -> None:
+        for method, params in queue:
+            start = time.perf_counter()
+            await client.call(method, *params)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = ComputeServer(workers=args.workers, max_batch=args.max_batch,
+                           max_delay=args.max_delay / 1000, max_pending=args.max_pending)
+    await server.start(args.host, args.port, args.unix)
+    print(f"mathlib server listening on {server.address}", file=sys.stderr)
+    async with server:
+        await asyncio.Event().wait()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-delay", type=float, default=2.0, help="batching latency cap in ms")
+    parser.add_argument("--max-pending", type=int, default=1024)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
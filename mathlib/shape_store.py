@@ -0,0 +1,284 @@
+"""
+Shape store module holding large collections of shapes in columnar arrays.
+"""
+import math
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from mathlib.batch_geometry import BatchGeometry, Column, _check_non_negative
+from mathlib.geometry import Geometry
+
+# Dimension columns stored for each kind of shape
+DIMENSIONS: Dict[str, Tuple[str, ...]] = {
+    "circle": ("radius",),
+    "rectangle": ("length", "width"),
+    "triangle": ("base", "height"),
+    "sphere": ("radius",),
+    "cylinder": ("radius", "height"),
+}
+
+# Geometry method implementing each metric, per kind of shape
+METRICS: Dict[str, Dict[str, str]] = {
+    "circle": {"area": "circle_area", "perimeter": "circle_circumference"},
+    "rectangle": {"area": "rectangle_area", "perimeter": "rectangle_perimeter"},
+    "triangle": {"area": "triangle_area"},
+    "sphere": {"area": "sphere_surface_area", "volume": "sphere_volume"},
+    "cylinder": {"volume": "cylinder_volume"},
+}
+
+_MESSAGES = {
+    "circle": "Radius cannot be negative",
+    "rectangle": "Length and width cannot be negative",
+    "triangle": "Base and height cannot be negative",
+    "sphere": "Radius cannot be negative",
+    "cylinder": "Radius and height cannot be negative",
+}
+
+
+class ShapeView:
+    """A lightweight view of one shape in a ShapeStore.
+
+    Dimensions and metrics are read from the store on attribute access,
+    e.g. ``view.radius`` or ``view.area``.
+    """
+
+    __slots__ = ("_store", "kind", "index")
+
+    def __init__(self, store: "ShapeStore", kind: str, index: int):
+        self._store = store
+        self.kind = kind
+        self.index = index
+
+    def __getattr__(self, name: str) -> float:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        dimensions = DIMENSIONS[self.kind]
+        if name in dimensions:
+            return self._store._columns[self.kind][dimensions.index(name)][self.index]
+        method = METRICS[self.kind].get(name)
+        if method is None:
+            raise AttributeError(f"{self.kind} has no attribute {name!r}")
+        return getattr(Geometry, method)(*self.dimensions())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ShapeView):
+            return NotImplemented
+        return (self._store is other._store and self.kind == other.kind
+                and self.index == other.index)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value
+                           in zip(DIMENSIONS[self.kind], self.dimensions()))
+        return f"ShapeView({self.kind}, {fields})"
+
+    def dimensions(self) -> Tuple[float, ...]:
+        """Return the dimensions of the shape in DIMENSIONS order."""
+        return tuple(column[self.index] for column in self._store._columns[self.kind])
+
+
+class ShapeStore:
+    """A struct-of-arrays container for circles, rectangles, triangles, spheres and cylinders.
+
+    Each kind of shape keeps one ``array('d')`` per dimension, costing 8
+    bytes per dimension per shape instead of a full Python object. Shapes
+    are identified by their kind and their index within that kind. Metrics
+    ("area", "perimeter" and "volume") are computed column-wise with the
+    BatchGeometry kernels; a sphere's area is its surface area.
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, Tuple[array, ...]] = {
+            kind: tuple(array("d") for _ in names) for kind, names in DIMENSIONS.items()
+        }
+
+    def __len__(self) -> int:
+        return sum(len(columns[0]) for columns in self._columns.values())
+
+    def _kind_columns(self, kind: str) -> Tuple[array, ...]:
+        try:
+            return self._columns[kind]
+        except KeyError:
+            raise ValueError(f"Unknown shape kind: {kind}") from None
+
+    def add(self, kind: str, *dimensions: Union[int, float]) -> int:
+        """Add one shape to the store.
+
+        Args:
+            kind: The kind of shape, e.g. "circle"
+            *dimensions: The shape's dimensions in DIMENSIONS order
+
+        Returns:
+            The index of the new shape within its kind
+
+        Raises:
+            ValueError: If the kind is unknown, the number of dimensions is
+                wrong or any dimension is negative
+        """
+        columns = self._kind_columns(kind)
+        if len(dimensions) != len(columns):
+            raise ValueError(f"A {kind} requires {len(columns)} dimension(s)")
+        if any(value < 0 for value in dimensions):
+            raise ValueError(_MESSAGES[kind])
+        # Convert every dimension before appending any, so columns stay aligned
+        values = array("d", dimensions)
+        for column, value in zip(columns, values):
+            column.append(value)
+        return len(columns[0]) - 1
+
+    def extend(self, kind: str, *columns: Column) -> range:
+        """Add many shapes of one kind from dimension columns.
+
+        Args:
+            kind: The kind of shape, e.g. "rectangle"
+            *columns: One sequence per dimension, in DIMENSIONS order
+
+        Returns:
+            The indices of the new shapes within their kind
+
+        Raises:
+            ValueError: If the kind is unknown or the columns are malformed
+            BatchValidationError: If any dimension is negative
+        """
+        targets = self._kind_columns(kind)
+        if len(columns) != len(targets):
+            raise ValueError(f"A {kind} requires {len(targets)} dimension(s)")
+        n = _check_non_negative(_MESSAGES[kind], *columns)
+        start = len(targets[0])
+        # Convert every column before extending any, so columns stay aligned
+        converted = [column if isinstance(column, array) and column.typecode == "d"
+                     else array("d", column) for column in columns]
+        for target, column in zip(targets, converted):
+            target.extend(column)
+        return range(start, start + n)
+
+    def count(self, kind: Optional[str] = None) -> int:
+        """Return the number of shapes, optionally of a single kind."""
+        if kind is None:
+            return len(self)
+        return len(self._kind_columns(kind)[0])
+
+    def column(self, kind: str, dimension: str) -> memoryview:
+        """Return a read-only view of one dimension column.
+
+        Args:
+            kind: The kind of shape
+            dimension: The dimension name, e.g. "radius"
+
+        Returns:
+            A memoryview over the stored values. Release it before adding
+            shapes of the same kind; resizing a viewed array raises BufferError.
+
+        Raises:
+            ValueError: If the kind or dimension is unknown
+        """
+        columns = self._kind_columns(kind)
+        if dimension not in DIMENSIONS[kind]:
+            raise ValueError(f"A {kind} has no dimension {dimension}")
+        return memoryview(columns[DIMENSIONS[kind].index(dimension)]).toreadonly()
+
+    def view(self, kind: str, index: int) -> ShapeView:
+        """Return a view of a single shape.
+
+        Raises:
+            IndexError: If there is no shape at that index
+        """
+        if not -self.count(kind) <= index < self.count(kind):
+            raise IndexError("Shape index out of range")
+        return ShapeView(self, kind, index % self.count(kind))
+
+    def views(self, kind: str, indices: Optional[Sequence[int]] = None) -> Iterator[ShapeView]:
+        """Iterate over views of the shapes of one kind, or of selected indices."""
+        if indices is None:
+            indices = range(self.count(kind))
+        for index in indices:
+            yield ShapeView(self, kind, index)
+
+    def metric(self, kind: str, metric: str, out: Optional[array] = None) -> array:
+        """Compute a metric for every shape of one kind.
+
+        Args:
+            kind: The kind of shape
+            metric: "area", "perimeter" or "volume"
+            out: Optional buffer to write the results into
+
+        Returns:
+            The metric of each shape, in index order
+
+        Raises:
+            ValueError: If the kind is unknown or has no such metric
+        """
+        columns = self._kind_columns(kind)
+        method = METRICS[kind].get(metric)
+        if method is None:
+            raise ValueError(f"A {kind} has no {metric}")
+        return getattr(BatchGeometry, method)(*columns, out=out)
+
+    def total(self, metric: str, kind: Optional[str] = None) -> float:
+        """Sum a metric over one kind, or over every kind that defines it.
+
+        Args:
+            metric: "area", "perimeter" or "volume"
+            kind: Restrict the total to a single kind of shape
+
+        Returns:
+            The total of the metric
+
+        Raises:
+            ValueError: If the metric is not defined for the kind, or for any kind
+        """
+        if kind is not None:
+            return math.fsum(self.metric(kind, metric))
+        kinds = [k for k, metrics in METRICS.items() if metric in metrics]
+        if not kinds:
+            raise ValueError(f"Unknown metric: {metric}")
+        return math.fsum(math.fsum(self.metric(k, metric)) for k in kinds)
+
+    def select(self, kind: str, metric: str, low: float = -math.inf,
+               high: float = math.inf) -> array:
+        """Find the shapes whose metric lies in the closed range [low, high].
+
+        Args:
+            kind: The kind of shape
+            metric: "area", "perimeter" or "volume"
+            low: Smallest accepted value
+            high: Largest accepted value
+
+        Returns:
+            The matching indices as an ``array('q')``
+        """
+        values = self.metric(kind, metric)
+        return array("q", [i for i, value in enumerate(values) if low <= value <= high])
+
+    def aggregate(self, kind: str, metric: str,
+                  indices: Optional[Sequence[int]] = None) -> Dict[str, float]:
+        """Summarise a metric over the shapes of one kind.
+
+        Args:
+            kind: The kind of shape
+            metric: "area", "perimeter" or "volume"
+            indices: Optional subset of shapes, e.g. the result of select()
+
+        Returns:
+            A dict with count, total, mean, min and max of the metric
+
+        Raises:
+            ValueError: If there are no shapes to summarise
+        """
+        values: Union[array, List[float]] = self.metric(kind, metric)
+        if indices is not None:
+            values = [values[i] for i in indices]
+        if not values:
+            raise ValueError("Cannot aggregate an empty selection")
+        total = math.fsum(values)
+        return {
+            "count": len(values),
+            "total": total,
+            "mean": total / len(values),
+            "min": min(values),
+            "max": max(values),
+        }
+
+    def nbytes(self) -> int:
+        """Return the number of bytes used by the dimension columns."""
+        return sum(column.itemsize * len(column)
+                   for columns in self._columns.values() for column in columns)
@@ -0,0 +1,330 @@
+"""
+Shared statistics module for reducing large datasets across worker processes.
+"""
+import math
+import os
+from array import array
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+Number = Union[int, float]
+# (count, mean, sum of squared deviations, minimum, maximum) of one slice
+Moments = Tuple[int, float, float, float, float]
+
+# Bins per refinement round when selecting an order statistic
+_SELECT_BINS = 1024
+# Once this few values remain in the selection window they are sorted directly
+_SELECT_LIMIT = 65536
+
+# Shared memory blocks a worker process has attached to, by name
+_worker_blocks = {}
+
+
+def _attach(name: str) -> "shared_memory.SharedMemory":
+    block = _worker_blocks.get(name)
+    if block is None:
+        from multiprocessing import shared_memory
+        block = _worker_blocks[name] = shared_memory.SharedMemory(name=name)
+    return block
+
+
+def _run_on_slice(name: str, start: int, stop: int, func: Callable, *args):
+    # Every view is released before returning, so the block can be closed
+    with _attach(name).buf.cast("d") as data, data[start:stop] as values:
+        return func(values, *args)
+
+
+def _moments(values: memoryview) -> Moments:
+    n = len(values)
+    try:
+        mean = math.fsum(values) / n
+    except ValueError:
+        # fsum refuses infinities of both signs, whose sum is NaN
+        mean = math.nan
+    m2 = math.fsum([(x - mean) * (x - mean) for x in values])
+    return n, mean, m2, min(values), max(values)
+
+
+def _histogram(values: memoryview, low: float, high: float, bins: int) -> Tuple[int, int, List[int]]:
+    counts = [0] * bins
+    below = above = 0
+    scale = bins / (high - low) if high > low else 0.0
+    last = bins - 1
+    for x in values:
+        if x < low:
+            below += 1
+        elif x > high:
+            above += 1
+        else:
+            b = int((x - low) * scale)
+            counts[b if b < last else last] += 1
+    return below, above, counts
+
+
+def _non_finite(values: memoryview) -> Tuple[int, int, int, float, float]:
+    # (NaN count, -inf count, +inf count, finite minimum, finite maximum)
+    nan = negative = positive = 0
+    low, high = math.inf, -math.inf
+    for x in values:
+        if x != x:
+            nan += 1
+        elif x == -math.inf:
+            negative += 1
+        elif x == math.inf:
+            positive += 1
+        else:
+            if x < low:
+                low = x
+            if x > high:
+                high = x
+    return nan, negative, positive, low, high
+
+
+def _collect(values: memoryview, low: float, high: float) -> array:
+    return array("d", [x for x in values if low <= x <= high])
+
+
+def _combine(a: Moments, b: Moments) -> Moments:
+    n = a[0] + b[0]
+    delta = b[1] - a[1]
+    mean = a[1] + delta * b[0] / n
+    m2 = a[2] + b[2] + delta * delta * a[0] * b[0] / n
+    return n, mean, m2, min(a[3], b[3]), max(a[4], b[4])
+
+
+class SharedDataset:
+    """A float64 dataset placed once in shared memory for worker processes.
+
+    The numbers are copied into a ``multiprocessing.shared_memory`` block
+    when the dataset is created. Workers attach to the block by name and
+    reduce their own slice of it, returning only small partial results:
+    moments are merged with Chan's parallel formula, histograms are added
+    bin by bin, and median/percentile narrow a value window with rounds of
+    histograms until few enough values remain to sort. Infinities are
+    ordered like in Statistics and kept out of the histogram bins; NaN has
+    no order, so histogram(), median() and percentile() reject it.
+
+    Use it as a context manager, or call close(), so that the pool is shut
+    down and the block is unlinked even if a computation fails.
+    """
+
+    def __init__(self, numbers: Sequence[Number], workers: Optional[int] = None):
+        """Copy a dataset into shared memory and start the worker pool.
+
+        Args:
+            numbers: The values to share
+            workers: Number of processes (defaults to the number of CPUs)
+
+        Raises:
+            ValueError: If the dataset is empty or workers is not positive
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Number of workers must be positive")
+        if not len(numbers):
+            raise ValueError("Cannot share an empty dataset")
+        self.size = len(numbers)
+        self.workers = workers
+        # Imported here so modules that only use _moments() and _combine()
+        # do not load multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+        self._pool: Optional["ProcessPoolExecutor"] = None
+        self._moments: Optional[Moments] = None
+        self._finite: Optional[Tuple[int, int, float, float]] = None
+        self._block = shared_memory.SharedMemory(create=True, size=8 * self.size)
+        try:
+            with self._block.buf.cast("d") as data:
+                data[:] = numbers if isinstance(numbers, array) and numbers.typecode == "d" \
+                    else array("d", numbers)
+            self._pool = ProcessPoolExecutor(workers)
+        except BaseException:
+            self.close()
+            raise
+        step = -(-self.size // workers)
+        self._slices = [(start, min(start + step, self.size)) for start in range(0, self.size, step)]
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def name(self) -> str:
+        """The name workers use to attach to the shared memory block."""
+        return self._block.name
+
+    def close(self) -> None:
+        """Shut down the workers and free the shared memory. Safe to call twice."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self._block is not None:
+            block, self._block = self._block, None
+            block.close()
+            block.unlink()
+
+    def _map(self, func: Callable, *args) -> list:
+        if self._block is None:
+            raise ValueError("Dataset is closed")
+        futures = [self._pool.submit(_run_on_slice, self.name, start, stop, func, *args)
+                   for start, stop in self._slices]
+        return [future.result() for future in futures]
+
+    def moments(self) -> Moments:
+        """Compute count, mean, sum of squared deviations, minimum and maximum.
+
+        The result is computed once and reused by the other methods.
+        """
+        if self._moments is None:
+            partials = self._map(_moments)
+            total = partials[0]
+            for partial in partials[1:]:
+                total = _combine(total, partial)
+            self._moments = total
+        return self._moments
+
+    def _finite_range(self) -> Tuple[int, int, float, float]:
+        # (-inf count, +inf count, finite minimum, finite maximum); only
+        # scans again when the moments show a non-finite value
+        if self._finite is None:
+            _, mean, _, low, high = self.moments()
+            if math.isfinite(mean) and math.isfinite(low) and math.isfinite(high):
+                self._finite = (0, 0, low, high)
+            else:
+                parts = self._map(_non_finite)
+                if any(part[0] for part in parts):
+                    raise ValueError("Dataset contains NaN values")
+                self._finite = (sum(part[1] for part in parts), sum(part[2] for part in parts),
+                                min(part[3] for part in parts), max(part[4] for part in parts))
+        return self._finite
+
+    def mean(self) -> float:
+        """Calculate the arithmetic mean."""
+        return self.moments()[1]
+
+    def variance(self, sample: bool = True) -> float:
+        """Calculate the variance.
+
+        Args:
+            sample: If True, calculate sample variance; otherwise population variance
+
+        Raises:
+            ValueError: If sample is True and the dataset has one value
+        """
+        n, _, m2, _, _ = self.moments()
+        if sample and n < 2:
+            raise ValueError("Cannot calculate sample variance with only one data point")
+        return m2 / (n - 1 if sample else n)
+
+    def standard_deviation(self, sample: bool = True) -> float:
+        """Calculate the standard deviation."""
+        return math.sqrt(self.variance(sample))
+
+    def range_value(self) -> float:
+        """Calculate the range (max - min)."""
+        _, _, _, low, high = self.moments()
+        return high - low
+
+    def histogram(self, bins: int = 10, low: Optional[float] = None,
+                  high: Optional[float] = None) -> Tuple[List[int], List[float]]:
+        """Count values in equal-width bins.
+
+        Args:
+            bins: Number of bins
+            low: Left edge of the first bin (defaults to the finite minimum)
+            high: Right edge of the last bin, inclusive (defaults to the
+                finite maximum)
+
+        Returns:
+            The counts per bin and the ``bins + 1`` bin edges. Values
+            outside [low, high], including infinities, are not counted.
+
+        Raises:
+            ValueError: If bins is not positive, low is greater than high, a
+                bound is not finite, or the dataset contains NaN or no
+                finite values to take default bounds from
+        """
+        if bins < 1:
+            raise ValueError("Number of bins must be positive")
+        # Also raises for NaN, which no bin could hold
+        _, _, minimum, maximum = self._finite_range()
+        if low is None or high is None:
+            if minimum > maximum:
+                raise ValueError("Dataset has no finite values")
+            low = minimum if low is None else low
+            high = maximum if high is None else high
+        if not (math.isfinite(low) and math.isfinite(high)):
+            raise ValueError("Histogram bounds must be finite")
+        if low > high:
+            raise ValueError("Lower bound cannot exceed upper bound")
+        counts = [0] * bins
+        for _, _, partial in self._map(_histogram, low, high, bins):
+            counts = [a + b for a, b in zip(counts, partial)]
+        width = (high - low) / bins
+        edges = [low + i * width for i in range(bins)] + [high]
+        return counts, edges
+
+    def _select(self, k: int) -> float:
+        # Narrow [low, high] to a window holding the k-th smallest value.
+        # Bin positions may round across an edge, so the window keeps one
+        # neighbouring bin on each side and each round re-counts exactly.
+        # Infinities sort to either end and are counted below or above it.
+        negative, positive, low, high = self._finite_range()
+        if k < negative:
+            return -math.inf
+        if k >= self.size - positive:
+            return math.inf
+        while True:
+            parts = self._map(_histogram, low, high, _SELECT_BINS)
+            below = sum(part[0] for part in parts)
+            counts = [sum(column) for column in zip(*(part[2] for part in parts))]
+            inside = sum(counts)
+            if low == high:
+                return low
+            if inside <= _SELECT_LIMIT:
+                values = sorted(v for chunk in self._map(_collect, low, high) for v in chunk)
+                return values[k - below]
+            rank = k - below
+            b = 0
+            while rank >= counts[b]:
+                rank -= counts[b]
+                b += 1
+            width = (high - low) / _SELECT_BINS
+            new_low = max(low, low + (b - 1) * width)
+            new_high = min(high, low + (b + 2) * width)
+            if (new_low, new_high) == (low, high):
+                values = sorted(v for chunk in self._map(_collect, low, high) for v in chunk)
+                return values[k - below]
+            low, high = new_low, new_high
+
+    def percentile(self, p: float) -> float:
+        """Calculate the p-th percentile, interpolating like Statistics.percentile.
+
+        Args:
+            p: Percentile value (0-100)
+
+        Raises:
+            ValueError: If p is not between 0 and 100 or the dataset contains NaN
+        """
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        k = (self.size - 1) * (p / 100)
+        f = math.floor(k)
+        c = math.ceil(k)
+        lower = self._select(f)
+        if f == c:
+            return lower
+        return lower * (c - k) + self._select(c) * (k - f)
+
+    def median(self) -> float:
+        """Calculate the median."""
+        return self.percentile(50)
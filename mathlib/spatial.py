@@ -0,0 +1,419 @@
+"""
+Spatial module providing indexes for nearest-neighbour and range queries.
+"""
+import heapq
+import itertools
+import math
+from array import array
+from typing import Dict, Hashable, Iterator, List, Sequence, Tuple, Union
+
+Number = Union[int, float]
+
+# Ranges at or below this many points are scanned instead of split further
+_LEAF_SIZE = 16
+
+
+def _check_coords(coords: Sequence[Number], dims: int) -> int:
+    if dims < 1:
+        raise ValueError("Points must have at least one dimension")
+    if len(coords) % dims:
+        raise ValueError(f"Coordinate buffer length must be a multiple of {dims}")
+    return len(coords) // dims
+
+
+class KDTree:
+    """A static KD-tree over 2D or 3D points stored in flat arrays.
+
+    Points are given as a flat coordinate buffer ``[x0, y0, x1, y1, ...]``
+    and referred to by their position in that buffer. The tree is implicit:
+    points are reordered so every subtree is a contiguous range split at its
+    median, so no node objects are allocated. Distances are Euclidean,
+    the same metric as ``Geometry.distance_between_points``.
+
+    Building sorts each range once per level of the tree, so the work is
+    O(n log n) sorts done in C; queries visit O(log n) ranges on average.
+    """
+
+    def __init__(self, coords: Sequence[Number], dims: int = 2):
+        """Build the tree.
+
+        Args:
+            coords: Flat buffer of point coordinates
+            dims: Number of coordinates per point
+
+        Raises:
+            ValueError: If dims is not positive or does not divide the buffer
+        """
+        n = _check_coords(coords, dims)
+        self.dims = dims
+        columns = [array("d", coords[axis::dims]) for axis in range(dims)]
+        index = list(range(n))
+        # Every internal range has a distinct midpoint, which keys its split value
+        splits = array("d", bytes(8 * n))
+        stack = [(0, n, 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= _LEAF_SIZE:
+                continue
+            key = columns[depth % dims].__getitem__
+            index[lo:hi] = sorted(index[lo:hi], key=key)
+            mid = (lo + hi) // 2
+            splits[mid] = key(index[mid])
+            stack.append((lo, mid, depth + 1))
+            stack.append((mid, hi, depth + 1))
+        self._index = array("q", index)
+        self._splits = splits
+        self._columns = [array("d", map(column.__getitem__, index)) for column in columns]
+
+    @classmethod
+    def from_points(cls, points: Sequence[Sequence[Number]]) -> "KDTree":
+        """Build a tree from a sequence of coordinate tuples.
+
+        Raises:
+            ValueError: If the sequence is empty or the points differ in dimension
+        """
+        if not points:
+            raise ValueError("Cannot infer dimensions from an empty list of points")
+        dims = len(points[0])
+        if any(len(point) != dims for point in points):
+            raise ValueError("All points must have the same number of dimensions")
+        return cls([value for point in points for value in point], dims)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _check_point(self, point: Sequence[Number]) -> Tuple[float, ...]:
+        if len(point) != self.dims:
+            raise ValueError(f"Query point must have {self.dims} coordinates")
+        return tuple(point)
+
+    def _leaf(self, lo: int, hi: int):
+        return enumerate(zip(*[column[lo:hi] for column in self._columns]), lo)
+
+    def nearest(self, point: Sequence[Number], k: int = 1) -> List[Tuple[float, int]]:
+        """Find the k points closest to a query point.
+
+        Args:
+            point: The query coordinates
+            k: Number of neighbours to return
+
+        Returns:
+            Up to k ``(distance, index)`` pairs, closest first
+
+        Raises:
+            ValueError: If k is not positive or the point has the wrong dimension
+        """
+        if k < 1:
+            raise ValueError("k must be positive")
+        query = self._check_point(point)
+        dist = math.dist
+        splits = self._splits
+        dims = self.dims
+        heap: List[Tuple[float, int]] = []  # max-heap of (-distance, slot)
+        stack = [(0, len(self._index), 0, 0.0)]
+        while stack:
+            lo, hi, depth, bound = stack.pop()
+            if len(heap) == k and bound >= -heap[0][0]:
+                continue
+            if hi - lo <= _LEAF_SIZE:
+                for slot, candidate in self._leaf(lo, hi):
+                    d = dist(query, candidate)
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d, slot))
+                    elif d < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d, slot))
+                continue
+            axis = depth % dims
+            mid = (lo + hi) // 2
+            diff = query[axis] - splits[mid]
+            if diff < 0:
+                stack.append((mid, hi, depth + 1, -diff))
+                stack.append((lo, mid, depth + 1, bound))
+            else:
+                stack.append((lo, mid, depth + 1, diff))
+                stack.append((mid, hi, depth + 1, bound))
+        return sorted((-d, self._index[slot]) for d, slot in heap)
+
+    def within_radius(self, point: Sequence[Number], radius: Number) -> List[Tuple[float, int]]:
+        """Find every point within a distance of a query point.
+
+        Args:
+            point: The query coordinates
+            radius: The maximum distance, inclusive
+
+        Returns:
+            ``(distance, index)`` pairs, closest first
+
+        Raises:
+            ValueError: If radius is negative or the point has the wrong dimension
+        """
+        if radius < 0:
+            raise ValueError("Radius cannot be negative")
+        query = self._check_point(point)
+        dist = math.dist
+        splits = self._splits
+        found = []
+        stack = [(0, len(self._index), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= _LEAF_SIZE:
+                for slot, candidate in self._leaf(lo, hi):
+                    d = dist(query, candidate)
+                    if d <= radius:
+                        found.append((d, self._index[slot]))
+                continue
+            axis = depth % self.dims
+            mid = (lo + hi) // 2
+            diff = query[axis] - splits[mid]
+            if diff >= -radius:
+                stack.append((mid, hi, depth + 1))
+            if diff <= radius:
+                stack.append((lo, mid, depth + 1))
+        found.sort()
+        return found
+
+    def within_box(self, lower: Sequence[Number], upper: Sequence[Number]) -> List[int]:
+        """Find every point inside an axis-aligned bounding box.
+
+        Args:
+            lower: The minimum corner of the box, inclusive
+            upper: The maximum corner of the box, inclusive
+
+        Returns:
+            The sorted indices of the points inside the box
+
+        Raises:
+            ValueError: If a corner has the wrong dimension
+        """
+        lower = self._check_point(lower)
+        upper = self._check_point(upper)
+        splits = self._splits
+        found = []
+        stack = [(0, len(self._index), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= _LEAF_SIZE:
+                for slot, candidate in self._leaf(lo, hi):
+                    if all(a <= c <= b for a, c, b in zip(lower, candidate, upper)):
+                        found.append(self._index[slot])
+                continue
+            axis = depth % self.dims
+            mid = (lo + hi) // 2
+            split = splits[mid]
+            if upper[axis] >= split:
+                stack.append((mid, hi, depth + 1))
+            if lower[axis] <= split:
+                stack.append((lo, mid, depth + 1))
+        found.sort()
+        return found
+
+    def nearest_many(self, coords: Sequence[Number], k: int = 1) -> List[List[Tuple[float, int]]]:
+        """Run nearest() for every point in a flat buffer of query coordinates.
+
+        Raises:
+            ValueError: If the buffer length is not a multiple of the tree's dimension
+        """
+        n = _check_coords(coords, self.dims)
+        dims = self.dims
+        return [self.nearest(coords[i * dims:(i + 1) * dims], k) for i in range(n)]
+
+    def within_radius_many(self, coords: Sequence[Number],
+                           radius: Number) -> List[List[Tuple[float, int]]]:
+        """Run within_radius() for every point in a flat buffer of query coordinates.
+
+        Raises:
+            ValueError: If the buffer length is not a multiple of the tree's dimension
+        """
+        n = _check_coords(coords, self.dims)
+        dims = self.dims
+        return [self.within_radius(coords[i * dims:(i + 1) * dims], radius) for i in range(n)]
+
+
+class SpatialHashGrid:
+    """A uniform grid of hashed cells for points that move every tick.
+
+    Points are stored under caller-chosen keys in a dict of cells keyed by
+    integer cell coordinates, so insert, move and remove are O(1). The cell
+    size should be close to the query radius: proximity_join() rehashes the
+    grid when it is more than twice as large or smaller than the radius.
+    """
+
+    def __init__(self, cell_size: Number, dims: int = 2):
+        """Create an empty grid.
+
+        Args:
+            cell_size: Edge length of a grid cell
+            dims: Number of coordinates per point
+
+        Raises:
+            ValueError: If cell_size or dims is not positive
+        """
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        if dims < 1:
+            raise ValueError("Points must have at least one dimension")
+        self.cell_size = cell_size
+        self.dims = dims
+        self._cells: Dict[Tuple[int, ...], Dict[Hashable, Tuple[float, ...]]] = {}
+        self._points: Dict[Hashable, Tuple[Tuple[float, ...], Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._points
+
+    def _cell(self, point: Tuple[float, ...]) -> Tuple[int, ...]:
+        size = self.cell_size
+        return tuple(math.floor(c / size) for c in point)
+
+    def _check_point(self, point: Sequence[Number]) -> Tuple[float, ...]:
+        if len(point) != self.dims:
+            raise ValueError(f"Point must have {self.dims} coordinates")
+        return tuple(point)
+
+    def insert(self, key: Hashable, point: Sequence[Number]) -> None:
+        """Add a point under a new key.
+
+        Raises:
+            ValueError: If the key is already present or the point has the wrong dimension
+        """
+        if key in self._points:
+            raise ValueError(f"Key already present: {key!r}")
+        point = self._check_point(point)
+        cell = self._cell(point)
+        self._cells.setdefault(cell, {})[key] = point
+        self._points[key] = (point, cell)
+
+    def move(self, key: Hashable, point: Sequence[Number]) -> None:
+        """Update the position of an existing point.
+
+        Raises:
+            KeyError: If the key is not present
+        """
+        point = self._check_point(point)
+        _, old_cell = self._points[key]
+        cell = self._cell(point)
+        if cell != old_cell:
+            self._discard(key, old_cell)
+            self._cells.setdefault(cell, {})[key] = point
+        else:
+            self._cells[cell][key] = point
+        self._points[key] = (point, cell)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a point.
+
+        Raises:
+            KeyError: If the key is not present
+        """
+        _, cell = self._points.pop(key)
+        self._discard(key, cell)
+
+    def _discard(self, key: Hashable, cell: Tuple[int, ...]) -> None:
+        members = self._cells[cell]
+        del members[key]
+        if not members:
+            del self._cells[cell]
+
+    def position(self, key: Hashable) -> Tuple[float, ...]:
+        """Return the current coordinates of a point.
+
+        Raises:
+            KeyError: If the key is not present
+        """
+        return self._points[key][0]
+
+    def rebuild(self, cell_size: Number) -> None:
+        """Rehash every point into cells of a new size.
+
+        Raises:
+            ValueError: If cell_size is not positive
+        """
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        points = [(key, point) for key, (point, _) in self._points.items()]
+        self.cell_size = cell_size
+        self._cells = {}
+        self._points = {}
+        for key, point in points:
+            cell = self._cell(point)
+            self._cells.setdefault(cell, {})[key] = point
+            self._points[key] = (point, cell)
+
+    def _offsets(self, radius: Number, forward: bool) -> List[Tuple[int, ...]]:
+        reach = max(1, math.ceil(radius / self.cell_size))
+        offsets = itertools.product(range(-reach, reach + 1), repeat=self.dims)
+        origin = (0,) * self.dims
+        if forward:
+            return [offset for offset in offsets if offset > origin]
+        return list(offsets)
+
+    def within_radius(self, point: Sequence[Number], radius: Number) -> List[Tuple[float, Hashable]]:
+        """Find every point within a distance of a query point.
+
+        Args:
+            point: The query coordinates
+            radius: The maximum distance, inclusive
+
+        Returns:
+            ``(distance, key)`` pairs in no particular order
+
+        Raises:
+            ValueError: If radius is negative or the point has the wrong dimension
+        """
+        if radius < 0:
+            raise ValueError("Radius cannot be negative")
+        query = self._check_point(point)
+        cell = self._cell(query)
+        dist = math.dist
+        found = []
+        for offset in self._offsets(radius, forward=False):
+            members = self._cells.get(tuple(c + o for c, o in zip(cell, offset)))
+            if members:
+                for key, other in members.items():
+                    d = dist(query, other)
+                    if d <= radius:
+                        found.append((d, key))
+        return found
+
+    def proximity_join(self, radius: Number,
+                       auto_tune: bool = True) -> Iterator[Tuple[Hashable, Hashable, float]]:
+        """Yield every pair of points at most radius apart.
+
+        Candidate pairs come from each cell and its neighbouring cells, and
+        are confirmed with the Euclidean distance. Each pair is yielded
+        once. The grid must not be modified while the join is running.
+
+        Args:
+            radius: The maximum distance, inclusive
+            auto_tune: Rehash the grid first if the cell size is poorly matched to radius
+
+        Yields:
+            ``(key_a, key_b, distance)`` tuples
+
+        Raises:
+            ValueError: If radius is negative
+        """
+        if radius < 0:
+            raise ValueError("Radius cannot be negative")
+        if auto_tune and radius > 0 and not radius <= self.cell_size <= 2 * radius:
+            self.rebuild(radius)
+        offsets = self._offsets(radius, forward=True)
+        cells = self._cells
+        dist = math.dist
+        for cell, members in list(cells.items()):
+            items = list(members.items())
+            for (key_a, a), (key_b, b) in itertools.combinations(items, 2):
+                d = dist(a, b)
+                if d <= radius:
+                    yield key_a, key_b, d
+            for offset in offsets:
+                neighbours = cells.get(tuple(c + o for c, o in zip(cell, offset)))
+                if not neighbours:
+                    continue
+                for key_a, a in items:
+                    for key_b, b in neighbours.items():
+                        d = dist(a, b)
+                        if d <= radius:
+                            yield key_a, key_b, d
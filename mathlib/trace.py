@@ -0,0 +1,383 @@
+"""
+Trace module for recording mathlib calls and replaying them as a workload.
+
+A trace is NDJSON (gzip-compressed when the path ends in ``.gz``), one call
+per line, for example::
+
+    {"t":0.0132,"op":"Statistics.percentile","args":[{"len":5000},90]}
+
+``t`` is the time of the call in seconds since recording started. Numbers
+and strings are stored as they are; sequences are stored by length only,
+unless values are captured, and are replaced with random data on replay.
+Calls that raised are marked ``"ok":false``. Only the outermost call is
+recorded, so the calls Statistics.standard_deviation makes to
+Statistics.variance are not replayed twice. Setting ``MATHLIB_TRACE=PATH``
+records every call of the process to PATH.
+
+Usage: python -m mathlib.trace record TRACE script.py [args ...]
+       python -m mathlib.trace replay TRACE [--speed X] [--processes N]
+"""
+import argparse
+import functools
+import gzip
+import json
+import random
+import runpy
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from mathlib.instrumentation import _default_targets
+from mathlib.statistics import Statistics
+
+_local = threading.local()
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _encode(value: Any, capture: bool) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    try:
+        n = len(value)
+    except TypeError:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return repr(value)
+    return [_encode(item, True) for item in value] if capture else {"len": n}
+
+
+class TraceRecorder:
+    """Records calls to the public static methods of mathlib classes.
+
+    Use it as a context manager or call start() and stop(). Like
+    instrumentation.enable(), it replaces the methods with wrappers while
+    recording; when both are used, stop them in the reverse order of
+    starting them. Recording never changes what a call returns or raises:
+    a call whose event cannot be encoded or written is counted in
+    ``dropped`` instead.
+    """
+
+    def __init__(self, path: str, capture_args: bool = False,
+                 targets: Optional[Iterable[type]] = None):
+        """Create a recorder.
+
+        Args:
+            path: Trace file to write (gzip-compressed if it ends in ".gz")
+            capture_args: Store the values of sequence arguments, not just
+                their lengths
+            targets: Classes to record (defaults to Calculator, Geometry,
+                Statistics and BatchGeometry)
+        """
+        self.path = path
+        self.capture_args = capture_args
+        self.targets = list(targets) if targets is not None else _default_targets()
+        self.calls = 0
+        self.dropped = 0
+        self._file: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+        self._patched: List[Tuple[type, str, Any, Any]] = []
+        self._start = 0.0
+
+    def __enter__(self) -> "TraceRecorder":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Open the trace file and start recording.
+
+        Raises:
+            RuntimeError: If the recorder is already recording
+        """
+        if self._file is not None:
+            raise RuntimeError("Recorder is already recording")
+        self._file = _open(self.path, "w")
+        self._start = time.perf_counter()
+        for cls in self.targets:
+            for name, attribute in list(vars(cls).items()):
+                if name.startswith("_") or not isinstance(attribute, staticmethod):
+                    continue
+                wrapper = staticmethod(self._wrap(f"{cls.__name__}.{name}", attribute.__func__))
+                self._patched.append((cls, name, attribute, wrapper))
+                setattr(cls, name, wrapper)
+
+    def stop(self) -> None:
+        """Restore the original methods and close the trace file."""
+        while self._patched:
+            cls, name, attribute, wrapper = self._patched.pop()
+            if vars(cls).get(name) is wrapper:
+                setattr(cls, name, attribute)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _event(self, operation: str, args: Tuple[Any, ...],
+               kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Arguments are encoded before the call, which may modify them
+        try:
+            event: Dict[str, Any] = {"t": round(time.perf_counter() - self._start, 6),
+                                     "op": operation,
+                                     "args": [_encode(arg, self.capture_args) for arg in args]}
+            if kwargs:
+                event["kwargs"] = {key: _encode(value, self.capture_args)
+                                   for key, value in kwargs.items()}
+            return event
+        except Exception:
+            with self._lock:
+                self.dropped += 1
+            return None
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        try:
+            line = json.dumps(event, separators=(",", ":"))
+        except (TypeError, ValueError):
+            line = None
+        with self._lock:
+            if self._file is None:
+                return
+            if line is not None:
+                try:
+                    self._file.write(line + "\n")
+                    self.calls += 1
+                    return
+                except OSError:
+                    pass
+            self.dropped += 1
+
+    def _wrap(self, operation: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "recording", False):
+                return func(*args, **kwargs)
+            _local.recording = True
+            event = None
+            try:
+                event = self._event(operation, args, kwargs)
+                return func(*args, **kwargs)
+            except Exception:
+                if event is not None:
+                    event["ok"] = False
+                raise
+            finally:
+                _local.recording = False
+                if event is not None:
+                    self._write(event)
+
+        return wrapper
+
+
+class TraceEvent(NamedTuple):
+    """One recorded call.
+
+    Attributes:
+        time: Seconds since recording started
+        operation: "Class.method"
+        args: Encoded positional arguments
+        kwargs: Encoded keyword arguments
+        ok: Whether the recorded call returned without raising
+    """
+
+    time: float
+    operation: str
+    args: List[Any]
+    kwargs: Dict[str, Any]
+    ok: bool
+
+
+def load_trace(path: str) -> List[TraceEvent]:
+    """Read the events of a trace file.
+
+    Raises:
+        ValueError: If a line is not a trace event
+    """
+    events = []
+    with _open(path, "r") as handle:
+        for number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                events.append(TraceEvent(float(record["t"]), record["op"], record.get("args", []),
+                                         record.get("kwargs", {}), record.get("ok", True)))
+            except (ValueError, KeyError, TypeError):
+                raise ValueError(f"Invalid trace event on line {number}") from None
+    return events
+
+
+class ReplayReport(NamedTuple):
+    """The outcome of a replay.
+
+    Attributes:
+        calls: Calls made
+        errors: Calls that raised
+        seconds: Time from the first call to the end of the last one
+        p50: Median latency in seconds
+        p90: 90th percentile latency in seconds
+        p99: 99th percentile latency in seconds
+        max: Largest latency in seconds
+    """
+
+    calls: int
+    errors: int
+    seconds: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+    @property
+    def throughput(self) -> float:
+        """Calls per second."""
+        return self.calls / self.seconds if self.seconds else 0.0
+
+
+@functools.lru_cache(maxsize=64)
+def _synthetic(n: int) -> Tuple[float, ...]:
+    rng = random.Random(n)
+    return tuple(rng.random() for _ in range(n))
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and "len" in value:
+        return list(_synthetic(value["len"]))
+    return value
+
+
+def _resolve(operation: str) -> Callable:
+    cls_name, _, name = operation.partition(".")
+    for cls in _default_targets():
+        if cls.__name__ == cls_name and not name.startswith("_") and hasattr(cls, name):
+            return getattr(cls, name)
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def _replay_share(events: List[TraceEvent], speed: Optional[float]) -> Tuple[List[float], int, float]:
+    clock = time.perf_counter
+    calls = []
+    for event in events:
+        func = _resolve(event.operation)
+        calls.append((event.time, func, [_decode(arg) for arg in event.args],
+                      {key: _decode(value) for key, value in event.kwargs.items()}))
+    latencies = []
+    errors = 0
+    first = calls[0][0] if calls else 0.0
+    start = clock()
+    for at, func, args, kwargs in calls:
+        began = clock()
+        if speed is not None:
+            due = start + (at - first) / speed
+            if due > began:
+                time.sleep(due - began)
+            began = due
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            errors += 1
+        latencies.append(clock() - began)
+    return latencies, errors, clock() - start
+
+
+def replay(events: List[TraceEvent], speed: Optional[float] = None,
+           processes: int = 1) -> ReplayReport:
+    """Re-run recorded calls and measure them.
+
+    Sequence arguments recorded by length are filled with deterministic
+    random floats in [0, 1), generated before timing starts. At full speed
+    calls run back to back and latency is the duration of each call. With a
+    speed, calls are issued at the recorded times divided by speed and
+    latency is measured from when a call was due, so time spent waiting
+    behind slow calls counts as it would for real clients.
+
+    Args:
+        events: Events from load_trace()
+        speed: Rate relative to the recording (2.0 replays twice as fast);
+            None runs at full speed
+        processes: Worker processes; events are dealt to them round-robin
+            and each keeps the recorded timing of its share
+
+    Returns:
+        A ReplayReport
+
+    Raises:
+        ValueError: If there are no events, speed or processes is not
+            positive, or an operation is unknown
+    """
+    if not events:
+        raise ValueError("Cannot replay an empty trace")
+    if processes < 1 or (speed is not None and speed <= 0):
+        raise ValueError("Speed and processes must be positive")
+    for operation in {event.operation for event in events}:
+        _resolve(operation)
+    # Events are written as calls finish, so concurrent calls can be out of order
+    events = sorted(events, key=lambda event: event.time)
+    if processes == 1:
+        results = [_replay_share(events, speed)]
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [pool.submit(_replay_share, events[i::processes], speed)
+                       for i in range(processes)]
+            results = [future.result() for future in futures]
+    latencies = [latency for share, _, _ in results for latency in share]
+    return ReplayReport(
+        calls=len(latencies),
+        errors=sum(errors for _, errors, _ in results),
+        seconds=max(elapsed for _, _, elapsed in results),
+        p50=Statistics.percentile(latencies, 50),
+        p90=Statistics.percentile(latencies, 90),
+        p99=Statistics.percentile(latencies, 99),
+        max=max(latencies),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="run a Python script and record its mathlib calls")
+    record.add_argument("trace", help="trace file to write (.gz to compress)")
+    record.add_argument("script", help="script to run")
+    record.add_argument("script_args", nargs=argparse.REMAINDER, help="arguments for the script")
+    record.add_argument("--capture-args", action="store_true",
+                        help="store sequence values, not just lengths")
+    play = commands.add_parser("replay", help="re-run a trace and report latencies")
+    play.add_argument("trace", help="trace file to read")
+    play.add_argument("--speed", type=float, default=None,
+                      help="rate relative to the recording (default: full speed)")
+    play.add_argument("--processes", type=int, default=1, help="worker processes")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        sys.argv = [args.script] + args.script_args
+        with TraceRecorder(args.trace, capture_args=args.capture_args) as recorder:
+            try:
+                runpy.run_path(args.script, run_name="__main__")
+            except SystemExit:
+                pass
+        print(f"Recorded {recorder.calls} calls to {args.trace}", file=sys.stderr)
+        return 0
+
+    try:
+        report = replay(load_trace(args.trace), speed=args.speed, processes=args.processes)
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    print(f"{report.calls} calls, {report.errors} errors in {report.seconds:.3f} s "
+          f"({report.throughput:,.0f} calls/s)")
+    print(f"latency p50 {report.p50 * 1e6:.1f} us  p90 {report.p90 * 1e6:.1f} us  "
+          f"p99 {report.p99 * 1e6:.1f} us  max {report.max * 1e6:.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
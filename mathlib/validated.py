@@ -0,0 +1,248 @@
+"""
+Validated module for checking columns once and running unchecked kernels on them.
+
+The Calculator, Geometry and Statistics methods check their arguments on
+every call. When the same data goes through many calls, validate() checks a
+whole column once and returns a ValidatedColumn; the Unchecked* kernels then
+run over it without any per-call or per-element checks::
+
+    radii = validate(raw_radii, "Radius", non_negative=True)
+    areas = UncheckedGeometry.circle_area(radii)
+    volumes = UncheckedGeometry.sphere_volume(radii)
+
+BatchGeometry also recognises ValidatedColumns and skips its own scan for
+negative values. The checked methods keep their behaviour for any other
+input.
+"""
+import math
+import operator
+from array import array
+from itertools import repeat
+from typing import FrozenSet, Iterator, List, MutableSequence, Optional, Union
+
+from mathlib.batch_geometry import BatchValidationError, Column, _store
+# Re-exported so that the kernels for validated columns come from one module
+from mathlib.batch_geometry import UncheckedGeometry as UncheckedGeometry
+
+CONSTRAINTS = ("finite", "non_negative", "nonzero", "integer")
+
+
+class ValidatedColumn:
+    """An immutable column of floats that has passed validate().
+
+    It behaves like a read-only sequence; iterating it runs at the speed of
+    the underlying ``array('d')``. ``constraints`` names the checks it
+    passed, so a column is never re-checked for what it already satisfies.
+    """
+
+    __slots__ = ("_data", "constraints")
+
+    def __init__(self, data: array, constraints: FrozenSet[str]):
+        """Wrap an already checked array; use validate() to create columns."""
+        self._data = data
+        self.constraints = constraints
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ValidatedColumn(self._data[index], self.constraints)
+        return self._data[index]
+
+    def __repr__(self) -> str:
+        return f"ValidatedColumn(n={len(self._data)}, constraints={sorted(self.constraints)})"
+
+    @property
+    def values(self) -> memoryview:
+        """A read-only view of the values."""
+        return memoryview(self._data).toreadonly()
+
+    def satisfies(self, *constraints: str) -> bool:
+        """Return whether the column passed every named check."""
+        return self.constraints.issuperset(constraints)
+
+
+def _not_number(value) -> bool:
+    try:
+        float(value)
+    except (TypeError, ValueError, OverflowError):
+        return True
+    return isinstance(value, str)
+
+
+def validate(values: Column, name: str = "Values", non_negative: bool = False,
+             nonzero: bool = False, integer: bool = False, finite: bool = True,
+             min_length: int = 0) -> ValidatedColumn:
+    """Check a whole column once and return it as a ValidatedColumn.
+
+    Each check is a single pass over the column, and the positions of the
+    offending values are only collected once a check has failed. A
+    ValidatedColumn that already satisfies every requested check is
+    returned as it is.
+
+    Args:
+        values: The numbers to check
+        name: How the values are called in error messages, e.g. "Radius"
+        non_negative: Reject values below zero
+        nonzero: Reject zeros
+        integer: Reject values with a fractional part
+        finite: Reject NaN and infinities
+        min_length: Smallest accepted number of values
+
+    Returns:
+        A copy of the values that can no longer change
+
+    Raises:
+        ValueError: If there are fewer than min_length values
+        BatchValidationError: If any value fails a check; its indices list
+            every offending position
+    """
+    requested = {constraint for constraint, wanted in zip(
+        CONSTRAINTS, (finite, non_negative, nonzero, integer)) if wanted}
+    if len(values) < min_length:
+        raise ValueError(f"{name} must have at least {min_length} values")
+    if isinstance(values, ValidatedColumn):
+        if values.constraints.issuperset(requested):
+            return values
+        data = values._data
+        requested |= values.constraints
+    else:
+        try:
+            data = array("d", values)
+        except (TypeError, OverflowError):
+            raise BatchValidationError(f"{name} must be numbers",
+                                       [i for i, v in enumerate(values) if _not_number(v)]) from None
+    if "finite" in requested and not all(map(math.isfinite, data)):
+        raise BatchValidationError(f"{name} must be finite",
+                                   [i for i, v in enumerate(data) if not math.isfinite(v)])
+    # min() would miss negatives behind a NaN when finite is not requested
+    if "non_negative" in requested and any(map(operator.lt, data, repeat(0.0))):
+        raise BatchValidationError(f"{name} cannot be negative",
+                                   [i for i, v in enumerate(data) if v < 0])
+    if "nonzero" in requested and 0.0 in data:
+        raise BatchValidationError(f"{name} cannot be zero",
+                                   [i for i, v in enumerate(data) if v == 0])
+    if "integer" in requested and not all(map(float.is_integer, data)):
+        raise BatchValidationError(f"{name} must be integers",
+                                   [i for i, v in enumerate(data) if not v.is_integer()])
+    return ValidatedColumn(data, frozenset(requested))
+
+
+class UncheckedCalculator:
+    """Column-wise Calculator operations without argument checks.
+
+    The caller guarantees the preconditions the Calculator methods would
+    check: nonzero divisors, non-negative square roots, non-negative
+    integer factorials and columns of equal length.
+    """
+
+    @staticmethod
+    def add(a: Column, b: Column,
+            out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate a + b element-wise."""
+        return _store([x + y for x, y in zip(a, b)], len(a), out)
+
+    @staticmethod
+    def subtract(a: Column, b: Column,
+                 out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate a - b element-wise."""
+        return _store([x - y for x, y in zip(a, b)], len(a), out)
+
+    @staticmethod
+    def multiply(a: Column, b: Column,
+                 out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate a * b element-wise."""
+        return _store([x * y for x, y in zip(a, b)], len(a), out)
+
+    @staticmethod
+    def divide(a: Column, b: Column,
+               out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate a / b element-wise; b must not contain zeros."""
+        return _store([x / y for x, y in zip(a, b)], len(a), out)
+
+    @staticmethod
+    def power(bases: Column, exponents: Column,
+              out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate bases ** exponents element-wise."""
+        return _store([x ** y for x, y in zip(bases, exponents)], len(bases), out)
+
+    @staticmethod
+    def square_root(values: Column,
+                    out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate square roots; values must be non-negative."""
+        return _store(list(map(math.sqrt, values)), len(values), out)
+
+    @staticmethod
+    def modulo(a: Column, b: Column,
+               out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Calculate a % b element-wise; b must not contain zeros."""
+        return _store([x % y for x, y in zip(a, b)], len(a), out)
+
+    @staticmethod
+    def factorial(values: Column) -> List[int]:
+        """Calculate factorials; values must be non-negative integers."""
+        factorial = math.factorial
+        return [factorial(int(n)) for n in values]
+
+
+class UncheckedStatistics:
+    """Statistics methods without argument checks.
+
+    The results match the Statistics methods exactly. The caller guarantees
+    a non-empty column (at least two values for sample variance) and a
+    percentile between 0 and 100, e.g. with ``validate(values,
+    min_length=2)``.
+    """
+
+    @staticmethod
+    def mean(numbers: Column) -> float:
+        """Calculate the arithmetic mean."""
+        return sum(numbers) / len(numbers)
+
+    @staticmethod
+    def median(numbers: Column) -> Union[int, float]:
+        """Calculate the median."""
+        ordered = sorted(numbers)
+        n = len(ordered)
+        return (ordered[n // 2 - 1] + ordered[n // 2]) / 2 if n % 2 == 0 else ordered[n // 2]
+
+    @staticmethod
+    def mode(numbers: Column) -> List[Union[int, float]]:
+        """Calculate the mode(s), sorted."""
+        frequency = {}
+        for num in numbers:
+            frequency[num] = frequency.get(num, 0) + 1
+        top = max(frequency.values())
+        return sorted(num for num, count in frequency.items() if count == top)
+
+    @staticmethod
+    def variance(numbers: Column, sample: bool = True) -> float:
+        """Calculate the sample (or population) variance."""
+        mean = sum(numbers) / len(numbers)
+        divisor = len(numbers) - 1 if sample else len(numbers)
+        return sum([(x - mean) ** 2 for x in numbers]) / divisor
+
+    @staticmethod
+    def standard_deviation(numbers: Column, sample: bool = True) -> float:
+        """Calculate the sample (or population) standard deviation."""
+        return math.sqrt(UncheckedStatistics.variance(numbers, sample))
+
+    @staticmethod
+    def range_value(numbers: Column) -> Union[int, float]:
+        """Calculate max - min."""
+        return max(numbers) - min(numbers)
+
+    @staticmethod
+    def percentile(numbers: Column, p: float) -> float:
+        """Calculate the p-th percentile with linear interpolation."""
+        ordered = sorted(numbers)
+        k = (len(ordered) - 1) * (p / 100)
+        f = math.floor(k)
+        c = math.ceil(k)
+        if f == c:
+            return ordered[int(k)]
+        return ordered[int(f)] * (c - k) + ordered[int(c)] * (k - f)
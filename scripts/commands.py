@@ -50,6 +50,12 @@ def format_code():
     return run_command("ruff format .")
 
 
+def bench():
+    """Run the benchmark suite; extra arguments are passed through."""
+    args = " ".join(sys.argv[2:])
+    return run_command(f"{sys.executable} benchmarks/suite.py {args}".strip())
+
+
 def clean():
     """Clean up generated files."""
     return run_command(
@@ -72,6 +78,7 @@ def help_menu():
     print("  test-parallel     - Run tests in parallel")
     print("  lint              - Run linting checks")
     print("  format            - Format code")
+    print("  bench             - Run benchmarks (--save/--compare FILE)")
     print("  clean             - Clean up generated files")
     print("  install           - Install package in development mode")
     return 0
@@ -91,6 +98,7 @@ def main():
         "test_parallel": test_parallel,
         "lint": lint,
         "format": format_code,
+        "bench": bench,
         "clean": clean,
         "install": install,
         "help": help_menu,
@@ -1,6 +1,12 @@
 # Conftest file for pytest configuration and shared fixtures
 
+import functools
+import os
+import random
+
 import pytest
+# The parser behind -m, used to tell whether scaling tests were asked for
+from _pytest.mark.expression import Expression
 
 
 def pytest_configure(config):
@@ -8,6 +14,34 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "unit: Unit tests")
     config.addinivalue_line("markers", "integration: Integration tests")
     config.addinivalue_line("markers", "slow: Slow running tests")
+    config.addinivalue_line("markers", "scaling: Wall-clock timing tests, run only when selected")
+
+
+def _selected_for_scaling(expression, item):
+    """Return whether a marker expression selects an item because of its scaling marker."""
+    names = {marker.name for marker in item.iter_markers()}
+    return (expression.evaluate(lambda name, **kwargs: name in names)
+            and not expression.evaluate(lambda name, **kwargs: name in names - {"scaling"}))
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip wall-clock timing tests unless they are asked for.
+
+    Their timings are unreliable next to other tests or under ``-n``, so
+    they run only when the ``-m`` expression selects them through their
+    marker (``-m scaling``, but not ``-m "not scaling"`` or ``-m unit``) or
+    with MATHLIB_SCALING=1 set.
+    """
+    if os.environ.get("MATHLIB_SCALING"):
+        return
+    markexpr = config.getoption("markexpr")
+    expression = Expression.compile(markexpr) if markexpr else None
+    skip = pytest.mark.skip(reason="Timing test; select with -m scaling or MATHLIB_SCALING=1")
+    for item in items:
+        if item.get_closest_marker("scaling") is None:
+            continue
+        if expression is None or not _selected_for_scaling(expression, item):
+            item.add_marker(skip)
 
 
 @pytest.fixture(scope="session")
@@ -18,3 +52,19 @@ def sample_data():
         "floats": [1.5, 2.5, 3.5, 4.5, 5.5],
         "mixed": [1, 2.5, 3, 4.5, 5],
     }
+
+
+@functools.lru_cache(maxsize=None)
+def _uniform(n, seed):
+    rng = random.Random(f"{seed}:{n}")
+    return tuple(rng.random() for _ in range(n))
+
+
+@pytest.fixture(scope="session")
+def large_data():
+    """Provide deterministic tuples of n floats in [0, 1), generated once per session.
+
+    Call it as ``large_data(n)`` or ``large_data(n, seed)``; the same
+    arguments always return the same cached tuple.
+    """
+    return lambda n, seed=0: _uniform(n, seed)
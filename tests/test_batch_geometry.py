@@ -0,0 +1,130 @@
+"""Unit tests for the BatchGeometry module."""
+import pytest
+import math
+from array import array
+from mathlib.batch_geometry import BatchGeometry, BatchValidationError
+from mathlib.geometry import Geometry
+
+
+class TestBatchGeometry:
+    """Test suite for BatchGeometry class."""
+
+    @pytest.fixture
+    def batch(self):
+        """Fixture to provide a BatchGeometry instance."""
+        return BatchGeometry()
+
+    @pytest.fixture
+    def columns(self):
+        """Fixture to provide non-negative dimension columns."""
+        return {
+            "a": [0, 1, 2.5, 3, 10.75, 1e-3],
+            "b": array("d", [4, 0.5, 2, 7.25, 1, 3]),
+        }
+
+    # Test agreement with the scalar methods
+    @pytest.mark.unit
+    @pytest.mark.parametrize("name", [
+        "circle_area",
+        "circle_circumference",
+        "sphere_volume",
+        "sphere_surface_area",
+    ])
+    def test_single_column_matches_scalar(self, batch, columns, name):
+        """Test that single-column kernels agree with the scalar methods."""
+        result = getattr(batch, name)(columns["a"])
+        assert isinstance(result, array)
+        assert list(result) == pytest.approx([getattr(Geometry, name)(r) for r in columns["a"]])
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("name", [
+        "rectangle_area",
+        "rectangle_perimeter",
+        "triangle_area",
+        "pythagorean_theorem",
+        "cylinder_volume",
+    ])
+    def test_two_column_matches_scalar(self, batch, columns, name):
+        """Test that two-column kernels agree with the scalar methods."""
+        result = getattr(batch, name)(columns["a"], columns["b"])
+        expected = [getattr(Geometry, name)(a, b) for a, b in zip(columns["a"], columns["b"])]
+        assert list(result) == pytest.approx(expected)
+
+    @pytest.mark.unit
+    def test_distance_between_points(self, batch):
+        """Test batch distances against the scalar method."""
+        x1, y1, x2, y2 = [0, 1, -2], [0, 1, 3], [3, 4, 5], [4, 5, -1]
+        result = batch.distance_between_points(x1, y1, x2, y2)
+        expected = [Geometry.distance_between_points(*p) for p in zip(x1, y1, x2, y2)]
+        assert list(result) == pytest.approx(expected)
+
+    @pytest.mark.unit
+    def test_empty_columns(self, batch):
+        """Test that empty input produces empty output."""
+        assert len(batch.circle_area([])) == 0
+        assert len(batch.rectangle_area([], [])) == 0
+
+    @pytest.mark.unit
+    def test_accepts_memoryview(self, batch):
+        """Test that typed buffers are accepted as input."""
+        radii = memoryview(array("d", [1.0, 2.0]))
+        assert list(batch.circle_area(radii)) == pytest.approx([math.pi, 4 * math.pi])
+
+    # Test preallocated output
+    @pytest.mark.unit
+    def test_writes_into_out(self, batch):
+        """Test that results are written into a preallocated buffer."""
+        out = array("d", [-1.0] * 4)
+        result = batch.rectangle_area([1, 2, 3], [4, 5, 6], out=out)
+        assert result is out
+        assert list(out) == [4.0, 10.0, 18.0, -1.0]
+
+    @pytest.mark.unit
+    def test_out_too_small(self, batch):
+        """Test that a short output buffer raises ValueError."""
+        with pytest.raises(ValueError, match="Output buffer is too small"):
+            batch.circle_area([1, 2, 3], out=array("d", [0.0]))
+
+    # Test validation
+    @pytest.mark.unit
+    def test_negative_values_report_indices(self, batch):
+        """Test that every negative element is reported."""
+        with pytest.raises(BatchValidationError, match="Radius cannot be negative") as exc_info:
+            batch.circle_area([1, -2, 3, -0.5])
+        assert exc_info.value.indices == [1, 3]
+        assert "at indices 1, 3" in str(exc_info.value)
+
+    @pytest.mark.unit
+    def test_negative_values_across_columns(self, batch):
+        """Test that offending indices are merged across columns."""
+        with pytest.raises(BatchValidationError) as exc_info:
+            batch.cylinder_volume([-1, 1, 1, 1], [1, 1, -1, -1])
+        assert exc_info.value.indices == [0, 2, 3]
+
+    @pytest.mark.unit
+    def test_negative_values_after_nan(self, batch):
+        """Test that a leading NaN does not hide negative values."""
+        with pytest.raises(BatchValidationError) as exc_info:
+            batch.circle_area([math.nan, -1.0])
+        assert exc_info.value.indices == [1]
+
+    @pytest.mark.unit
+    def test_validation_error_is_value_error(self, batch):
+        """Test that callers catching ValueError still see batch errors."""
+        with pytest.raises(ValueError):
+            batch.triangle_area([-1], [1])
+
+    @pytest.mark.unit
+    def test_long_index_lists_are_truncated(self, batch):
+        """Test that the message lists a bounded number of indices."""
+        with pytest.raises(BatchValidationError, match=r"\(25 total\)") as exc_info:
+            batch.sphere_volume([-1] * 25)
+        assert len(exc_info.value.indices) == 25
+
+    @pytest.mark.unit
+    def test_mismatched_lengths(self, batch):
+        """Test that columns of different lengths raise ValueError."""
+        with pytest.raises(ValueError, match="Columns must have the same length"):
+            batch.rectangle_area([1, 2], [1])
+        with pytest.raises(ValueError, match="Columns must have the same length"):
+            batch.distance_between_points([0], [0], [1], [])
@@ -0,0 +1,170 @@
+"""Unit tests for the benchmark module."""
+import pytest
+import importlib.util
+import json
+import pathlib
+from mathlib.benchmark import (Timing, compare, growth_exponent, load_baseline, mann_whitney_p,
+                               measure, measure_all, save_baseline)
+
+SUITE = pathlib.Path(__file__).resolve().parent.parent / "benchmarks" / "suite.py"
+
+
+@pytest.fixture(scope="module")
+def suite():
+    """Fixture to load the benchmark suite script as a module."""
+    spec = importlib.util.spec_from_file_location("suite", SUITE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def timing(*samples):
+    """Build a Timing from samples given in microseconds."""
+    return Timing([s * 1e-6 for s in samples], 1000)
+
+
+class TestBenchmark:
+    """Test suite for the benchmark helpers."""
+
+    # Test measuring
+    @pytest.mark.unit
+    def test_measure(self):
+        """Test that measure returns per-call times."""
+        result = measure(lambda: sum(range(100)), repeat=3, number=50)
+        assert len(result.samples) == 3
+        assert result.number == 50
+        assert all(0 < s < 0.01 for s in result.samples)
+
+    @pytest.mark.unit
+    def test_measure_all_interleaves(self):
+        """Test that every case gets one sample per round."""
+        rounds = []
+        result = measure_all({"a": lambda: None, "b": lambda: sum(range(50))}, repeat=4,
+                             progress=rounds.append)
+        assert list(result) == ["a", "b"]
+        assert [len(t.samples) for t in result.values()] == [4, 4]
+        assert rounds == [1, 2, 3, 4]
+
+    @pytest.mark.unit
+    def test_timing_statistics(self):
+        """Test the median and relative spread of samples."""
+        t = timing(10, 12, 11, 30, 10)
+        assert t.median == pytest.approx(11e-6)
+        assert t.spread == pytest.approx(1 / 11)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,message", [
+        (lambda: measure(lambda: None, repeat=0), "Repeat and number must be positive"),
+        (lambda: measure_all({}, repeat=0), "Repeat and number must be positive"),
+    ])
+    def test_invalid_arguments(self, call, message):
+        """Test that invalid arguments raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            call()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("power", [0.5, 1, 2])
+    def test_growth_exponent(self, power):
+        """Test fitting the exponent of a power law."""
+        sizes = [10, 100, 1000, 10000]
+        assert growth_exponent(sizes, [3e-7 * n ** power for n in sizes]) == pytest.approx(power)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("sizes,seconds,message", [
+        ([10, 10], [1.0, 2.0], "At least two distinct sizes are required"),
+        ([10, 100], [1.0], "At least two distinct sizes are required"),
+        ([10, 100], [1.0, 0.0], "Sizes and times must be positive"),
+    ])
+    def test_growth_exponent_invalid(self, sizes, seconds, message):
+        """Test that unusable measurements raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            growth_exponent(sizes, seconds)
+
+    # Test comparing
+    @pytest.mark.unit
+    def test_mann_whitney(self):
+        """Test p-values for clearly separated and identical samples."""
+        assert mann_whitney_p([20, 21, 22, 23, 24, 25, 26], [10, 11, 12, 13, 14, 15, 16]) < 0.01
+        assert mann_whitney_p([10, 11, 12, 13, 14, 15, 16], [20, 21, 22, 23, 24, 25, 26]) > 0.99
+        assert mann_whitney_p([5] * 7, [5] * 7) == 0.5
+        assert mann_whitney_p([], [1]) == 1.0
+
+    @pytest.mark.unit
+    def test_compare_statuses(self):
+        """Test regression, improvement, noise and new cases."""
+        baseline = {
+            "slow": timing(10, 10.2, 9.9, 10.1, 10, 10.3, 9.8),
+            "fast": timing(10, 10.2, 9.9, 10.1, 10, 10.3, 9.8),
+            "noisy": timing(10, 14, 8, 12, 9, 15, 7),
+        }
+        current = {
+            "slow": timing(15, 15.2, 14.9, 15.1, 15, 15.3, 14.8),
+            "fast": timing(5, 5.2, 4.9, 5.1, 5, 5.3, 4.8),
+            "noisy": timing(12, 15, 9, 13, 10, 16, 8),
+            "added": timing(1, 1, 1),
+        }
+        statuses = {c.name: c.status for c in compare(current, baseline, normalize=False)}
+        assert statuses == {"slow": "regression", "fast": "improvement",
+                            "noisy": "unchanged", "added": "new"}
+
+    @pytest.mark.unit
+    def test_compare_divides_out_drift(self):
+        """Test that a machine-wide slowdown is not reported per case."""
+        baseline = {f"case{i}": timing(10, 10.1, 9.9, 10, 10.2, 9.8, 10) for i in range(6)}
+        current = {name: Timing([s * 1.5 for s in t.samples], t.number) for name, t in baseline.items()}
+        current["case0"] = Timing([s * 2.5 for s in baseline["case0"].samples], 1000)
+        results = {c.name: c for c in compare(current, baseline)}
+        assert [name for name, c in results.items() if c.status == "regression"] == ["case0"]
+        assert results["case0"].ratio == pytest.approx(2.5 / 1.5)
+        assert all(c.status == "regression" for c in compare(current, baseline, normalize=False))
+
+    # Test baselines
+    @pytest.mark.unit
+    def test_baseline_round_trip(self, tmp_path):
+        """Test saving and loading a baseline."""
+        path = str(tmp_path / "baseline.json")
+        timings = {"Calculator.add[n=100]": timing(1, 2, 3)}
+        save_baseline(path, timings)
+        assert load_baseline(path) == timings
+
+    @pytest.mark.unit
+    def test_baseline_with_memory(self, tmp_path):
+        """Test that bytes per element are stored next to the timings."""
+        path = str(tmp_path / "baseline.json")
+        save_baseline(path, {"a": timing(1, 2, 3)}, {"a": 12.5, "missing": 1.0})
+        with open(path) as handle:
+            results = json.load(handle)["results"]
+        assert results["a"]["bytes_per_element"] == 12.5
+        assert list(results) == ["a"]
+        assert list(load_baseline(path)) == ["a"]
+
+    @pytest.mark.unit
+    def test_load_invalid_baseline(self, tmp_path):
+        """Test that other JSON files are rejected."""
+        path = tmp_path / "other.json"
+        path.write_text('{"results": [1, 2]}')
+        with pytest.raises(ValueError, match="Not a benchmark baseline"):
+            load_baseline(str(path))
+
+    # Test the suite
+    @pytest.mark.unit
+    def test_suite_covers_every_public_method(self, suite):
+        """Test that adding a public method without a benchmark case fails."""
+        cases = suite.build_cases([10])
+        assert {name.split("[")[0] for name in cases} == set(suite.public_methods())
+        assert len(cases) == len(suite.public_methods())
+
+    @pytest.mark.unit
+    def test_suite_bytes_per_element(self, suite):
+        """Test that the suite reports the sorted copy of median per element."""
+        cases = suite.build_cases([5000])
+        memory = suite.bytes_per_element({name: cases[name] for name in
+                                          ("Statistics.median[n=5000]", "Statistics.mean[n=5000]")})
+        assert memory["Statistics.median[n=5000]"] >= 8
+        assert memory["Statistics.mean[n=5000]"] < 1
+
+    @pytest.mark.unit
+    def test_suite_cases_run(self, suite):
+        """Test that every case runs without raising."""
+        for case in suite.build_cases([5, 20]).values():
+            case()
@@ -0,0 +1,176 @@
+"""Unit tests for the bivariate module."""
+import math
+import pickle
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from mathlib.bivariate import BivariateStatistics, CoMoments, LinearFit
+
+
+def _two_pass(xs, ys):
+    n = len(xs)
+    mean_x = math.fsum(xs) / n
+    mean_y = math.fsum(ys) / n
+    sxx = math.fsum((x - mean_x) ** 2 for x in xs)
+    syy = math.fsum((y - mean_y) ** 2 for y in ys)
+    sxy = math.fsum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return mean_x, mean_y, sxx, syy, sxy
+
+
+def _chunk_moments(pair):
+    return BivariateStatistics.comoments(*pair)
+
+
+@pytest.fixture(scope="module")
+def pairs():
+    """Fixture to provide 5000 noisy points around y = 2.5x - 4, offset far from zero."""
+    rng = random.Random(11)
+    xs = [1e6 + rng.gauss(0, 3) for _ in range(5000)]
+    ys = [2.5 * x - 4 + rng.gauss(0, 1) for x in xs]
+    return xs, ys
+
+
+class TestCoMoments:
+    """Test suite for the CoMoments accumulator."""
+
+    # Test accumulation
+    @pytest.mark.unit
+    @pytest.mark.parametrize("source", ["list", "iterator", "array", "memoryview"])
+    def test_extend_matches_two_pass(self, pairs, source):
+        """Test that one pass over any input matches the two-pass sums."""
+        xs, ys = pairs
+        if source == "iterator":
+            xs, ys = iter(xs), iter(ys)
+        elif source == "array":
+            xs, ys = array("d", xs), array("d", ys)
+        elif source == "memoryview":
+            xs, ys = memoryview(array("d", xs)), memoryview(array("d", ys))
+        moments = CoMoments()
+        moments.extend(xs, ys)
+        expected = _two_pass(*pairs)
+        assert moments.n == 5000
+        for value, reference in zip((moments.mean_x, moments.mean_y, moments.m2_x,
+                                     moments.m2_y, moments.c_xy), expected):
+            assert value == pytest.approx(reference, rel=1e-9)
+
+    @pytest.mark.unit
+    def test_add_matches_extend(self, pairs):
+        """Test that pair-by-pair updates agree with chunked ones."""
+        xs, ys = pairs
+        single = CoMoments()
+        for x, y in zip(xs, ys):
+            single.add(x, y)
+        chunked = BivariateStatistics.comoments(xs, ys)
+        assert single.covariance() == pytest.approx(chunked.covariance(), rel=1e-9)
+        assert single.correlation() == pytest.approx(chunked.correlation(), rel=1e-9)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("split", [1, 7, 2500, 4999])
+    def test_merge(self, pairs, split):
+        """Test that merging two halves equals accumulating everything."""
+        xs, ys = pairs
+        left = BivariateStatistics.comoments(xs[:split], ys[:split])
+        right = BivariateStatistics.comoments(xs[split:], ys[split:])
+        merged = left.merge(right)
+        whole = BivariateStatistics.comoments(xs, ys)
+        assert merged.n == whole.n
+        assert merged.covariance() == pytest.approx(whole.covariance(), rel=1e-9)
+        assert merged.linear_regression().slope == pytest.approx(whole.linear_regression().slope)
+        assert left.n == split
+
+    @pytest.mark.unit
+    def test_merge_with_empty(self):
+        """Test that an empty accumulator is the identity of merge."""
+        moments = BivariateStatistics.comoments([1, 2, 3], [2, 4, 7])
+        for merged in (moments.merge(CoMoments()), CoMoments().merge(moments)):
+            assert merged.covariance() == moments.covariance()
+        assert BivariateStatistics.merge([]) is None
+
+    @pytest.mark.unit
+    def test_pickle_round_trip(self):
+        """Test that accumulators can be sent to and from worker processes."""
+        moments = BivariateStatistics.comoments([1, 2, 3], [3, 1, 2])
+        restored = pickle.loads(pickle.dumps(moments))
+        assert repr(restored) == repr(moments)
+
+    # Test results
+    @pytest.mark.unit
+    def test_known_values(self):
+        """Test covariance, correlation and regression on a small example."""
+        moments = BivariateStatistics.comoments([1, 2, 3, 4, 5], [2, 4, 5, 4, 5])
+        assert moments.covariance() == pytest.approx(1.5)
+        assert moments.covariance(sample=False) == pytest.approx(1.2)
+        assert moments.variance_x() == pytest.approx(2.5)
+        assert moments.variance_y(sample=False) == pytest.approx(1.2)
+        assert moments.correlation() == pytest.approx(0.7745966692)
+        fit = moments.linear_regression()
+        assert fit == pytest.approx(LinearFit(0.6, 2.2, 0.6, 5))
+        assert fit.predict(10) == pytest.approx(8.2)
+
+    @pytest.mark.unit
+    def test_perfect_fit(self):
+        """Test an exact line and constant y."""
+        fit = BivariateStatistics.linear_regression([0, 1, 2], [1, 3, 5])
+        assert (fit.slope, fit.intercept, fit.r_squared) == pytest.approx((2, 1, 1))
+        assert BivariateStatistics.correlation([0, 1, 2], [5, 3, 1]) == -1.0
+        flat = BivariateStatistics.linear_regression([0, 1, 2], [4, 4, 4])
+        assert (flat.slope, flat.intercept, flat.r_squared) == (0.0, 4.0, 1.0)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("xs,ys", [
+        ([1, 2, 3, math.nan], [1, 2, 3, 4]),
+        ([1, 2, math.inf], [3, 2, 1]),
+        ([1, 2, 3], [1, 1, math.nan]),
+        ([1, 2, -math.inf], [4, 4, 4]),
+    ])
+    def test_non_finite_values(self, xs, ys):
+        """Test that NaN and infinite values give NaN rather than a perfect fit."""
+        assert math.isnan(BivariateStatistics.correlation(xs, ys))
+        fit = BivariateStatistics.linear_regression(xs, ys)
+        assert all(math.isnan(value) for value in fit[:3])
+        assert fit.n == len(xs)
+
+    # Test errors
+    @pytest.mark.unit
+    @pytest.mark.parametrize("xs,ys", [([1, 2], [1]), (iter([1]), iter([1, 2]))])
+    def test_length_mismatch(self, xs, ys):
+        """Test that columns of different lengths are rejected."""
+        with pytest.raises(ValueError, match="Columns must have the same length"):
+            BivariateStatistics.comoments(xs, ys)
+
+    @pytest.mark.unit
+    def test_too_few_pairs(self):
+        """Test empty and single-pair accumulators."""
+        with pytest.raises(ValueError, match="Cannot calculate covariance of empty list"):
+            CoMoments().covariance()
+        one = BivariateStatistics.comoments([1], [2])
+        assert one.covariance(sample=False) == 0.0
+        with pytest.raises(ValueError, match="Cannot calculate sample covariance with only one data point"):
+            one.covariance()
+
+    @pytest.mark.unit
+    def test_constant_data(self):
+        """Test that undefined correlation and slope are reported."""
+        with pytest.raises(ValueError, match="Correlation is undefined for constant data"):
+            BivariateStatistics.correlation([1, 2, 3], [4, 4, 4])
+        with pytest.raises(ValueError, match="Regression is undefined when x is constant"):
+            BivariateStatistics.linear_regression([2, 2, 2], [1, 2, 3])
+
+
+class TestBivariateIntegration:
+    """Test suite for accumulating across worker processes."""
+
+    @pytest.mark.integration
+    def test_process_pool_merge(self, pairs):
+        """Test that per-worker accumulators merge to the single-process result."""
+        xs, ys = pairs
+        chunks = [(xs[i:i + 1000], ys[i:i + 1000]) for i in range(0, len(xs), 1000)]
+        with ProcessPoolExecutor(2) as pool:
+            parts = list(pool.map(_chunk_moments, chunks))
+        merged = BivariateStatistics.merge(parts)
+        whole = BivariateStatistics.comoments(xs, ys)
+        assert merged.n == 5000
+        assert merged.correlation() == pytest.approx(whole.correlation(), rel=1e-12)
+        assert merged.linear_regression().intercept == pytest.approx(
+            whole.linear_regression().intercept, rel=1e-9)
@@ -0,0 +1,134 @@
+"""Unit tests for the bootstrap module."""
+import random
+import pytest
+from mathlib.bootstrap import bootstrap
+from mathlib.sampling import Estimate
+from mathlib.statistics import Statistics
+from mathlib.validated import UncheckedStatistics
+
+
+def _trimmed_mean(values):
+    ordered = sorted(values)
+    cut = len(ordered) // 10
+    return Statistics.mean(ordered[cut:len(ordered) - cut])
+
+
+@pytest.fixture(scope="module")
+def skewed():
+    """Fixture to provide 400 sorted exponential values with mean 1."""
+    rng = random.Random(21)
+    return sorted(rng.expovariate(1) for _ in range(400))
+
+
+class TestBootstrap:
+    """Test suite for the bootstrap function."""
+
+    # Test fast estimators
+    @pytest.mark.unit
+    @pytest.mark.parametrize("estimator,args", [
+        (Statistics.mean, ()),
+        (Statistics.median, ()),
+        (Statistics.percentile, (90,)),
+        (Statistics.percentile, (0,)),
+        (Statistics.variance, ()),
+        (Statistics.standard_deviation, (False,)),
+        (Statistics.range_value, ()),
+        (UncheckedStatistics.median, ()),
+    ])
+    def test_fast_paths_match_estimator(self, skewed, estimator, args):
+        """Test that index-based estimates equal calling the estimator on each resample."""
+        fast = bootstrap(skewed, estimator, *args, resamples=200, seed=3)
+        generic = bootstrap(skewed, lambda values, *a: estimator(values, *a), *args,
+                            resamples=200, seed=3)
+        assert fast == generic
+        assert fast.low <= fast.value <= fast.high or estimator is Statistics.range_value
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("estimator", [Statistics.mean, Statistics.median,
+                                           Statistics.standard_deviation])
+    def test_bca_matches_generic_jackknife(self, skewed, estimator):
+        """Test that the fast jackknife gives the same BCa interval as the generic one."""
+        fast = bootstrap(skewed, estimator, resamples=300, method="bca", seed=4)
+        generic = bootstrap(skewed, lambda values: estimator(values), resamples=300,
+                            method="bca", seed=4)
+        assert fast == pytest.approx(generic, rel=1e-9)
+
+    # Test intervals
+    @pytest.mark.unit
+    @pytest.mark.parametrize("method", ["percentile", "bca"])
+    def test_mean_interval_covers_truth(self, skewed, method):
+        """Test a 95% interval for the mean of an exponential sample."""
+        result = bootstrap(skewed, Statistics.mean, resamples=1000, method=method, seed=1)
+        assert isinstance(result, Estimate)
+        assert result.value == Statistics.mean(skewed)
+        assert result.low < 1 < result.high
+        assert result.margin == pytest.approx(1.96 / 20, rel=0.15)
+        assert (result.confidence, result.n) == (0.95, 400)
+
+    @pytest.mark.unit
+    def test_bca_shifts_skewed_interval(self, skewed):
+        """Test that BCa moves the interval of a skewed statistic to the right."""
+        plain = bootstrap(skewed, Statistics.variance, resamples=1000, seed=2)
+        corrected = bootstrap(skewed, Statistics.variance, resamples=1000, method="bca", seed=2)
+        assert corrected.low > plain.low and corrected.high > plain.high
+
+    @pytest.mark.unit
+    def test_wider_at_higher_confidence(self, skewed):
+        """Test that a 99% interval contains the 80% one."""
+        narrow = bootstrap(skewed, Statistics.median, resamples=500, confidence=0.8, seed=5)
+        wide = bootstrap(skewed, Statistics.median, resamples=500, confidence=0.99, seed=5)
+        assert wide.low <= narrow.low and narrow.high <= wide.high
+
+    @pytest.mark.unit
+    def test_any_estimator(self, skewed):
+        """Test an estimator without a fast path."""
+        result = bootstrap(skewed, _trimmed_mean, resamples=200, method="bca", seed=6)
+        assert result.low < result.value < result.high
+
+    # Test reproducibility
+    @pytest.mark.unit
+    def test_seeded(self, skewed):
+        """Test that the seed fixes the interval and input order does not matter."""
+        first = bootstrap(skewed, Statistics.median, resamples=100, seed=7)
+        shuffled = list(reversed(skewed))
+        assert bootstrap(shuffled, Statistics.median, resamples=100, seed=7) == first
+        assert bootstrap(skewed, Statistics.median, resamples=100, seed=8) != first
+
+    @pytest.mark.integration
+    def test_processes_give_same_interval(self, skewed):
+        """Test that spreading resamples over processes does not change the result."""
+        single = bootstrap(skewed, Statistics.percentile, 75, resamples=300, seed=9)
+        pooled = bootstrap(skewed, Statistics.percentile, 75, resamples=300, seed=9, processes=3)
+        assert pooled == single
+
+    @pytest.mark.unit
+    def test_tiny_samples(self):
+        """Test one and two values, where the jackknife is skipped."""
+        assert bootstrap([5], Statistics.mean, resamples=10, method="bca", seed=1) == \
+            Estimate(5, 5, 5, 0.95, 1)
+        result = bootstrap([1, 3], Statistics.median, resamples=50, method="bca", seed=1)
+        assert 1 <= result.low <= result.high <= 3
+
+    # Test errors
+    @pytest.mark.unit
+    @pytest.mark.parametrize("kwargs,message", [
+        ({"data": []}, "Cannot bootstrap an empty list"),
+        ({"resamples": 0}, "Number of resamples must be positive"),
+        ({"processes": 0}, "Number of processes must be positive"),
+        ({"method": "basic"}, "Method must be 'percentile' or 'bca'"),
+        ({"confidence": 1.0}, "Confidence must be between 0 and 1"),
+    ])
+    def test_invalid_arguments(self, kwargs, message):
+        """Test argument validation."""
+        arguments = {"data": [1, 2, 3], "estimator": Statistics.mean}
+        arguments.update(kwargs)
+        with pytest.raises(ValueError, match=message):
+            bootstrap(**arguments)
+
+    @pytest.mark.unit
+    def test_estimator_errors_propagate(self):
+        """Test that the estimator's own checks apply to the data."""
+        with pytest.raises(ValueError, match="Percentile must be between 0 and 100"):
+            bootstrap([1, 2, 3], Statistics.percentile, 101)
+        with pytest.raises(ValueError, match="Cannot calculate sample variance with only one data point"):
+            bootstrap([1], Statistics.variance)
@@ -0,0 +1,188 @@
+"""Unit tests for the persistent cache module."""
+import multiprocessing
+
+import pytest
+from mathlib.cache import PersistentCache, operation_name
+from mathlib.calculator import Calculator
+from mathlib.statistics import Statistics
+
+
+def _counting(func):
+    """Wrap func so that its calls are counted in the wrapper's calls attribute."""
+    def wrapper(*args):
+        wrapper.calls += 1
+        return func(*args)
+    wrapper.calls = 0
+    return wrapper
+
+
+def _worker(path, offset):
+    """Write and read back entries from a separate process."""
+    with PersistentCache(path) as cache:
+        factorial = cache.memoize(Calculator.factorial)
+        return [factorial(n) for n in range(offset, offset + 20)]
+
+
+class TestPersistentCache:
+    """Test suite for PersistentCache class."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Fixture to provide a cache in a temporary directory."""
+        with PersistentCache(tmp_path / "cache.sqlite") as cache:
+            yield cache
+
+    @pytest.mark.unit
+    def test_get_missing_returns_default(self, cache):
+        """Test that an unknown key returns the default value."""
+        assert cache.get("Calculator.power", (2, 10)) is None
+        assert cache.get("Calculator.power", (2, 10), default=-1) == -1
+        assert cache.misses == 2
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("value", [
+        1024,
+        2.5,
+        3628800 ** 5,
+        pytest.param(Calculator.factorial(3000), id="large-int"),
+        [1, 2, 3],
+        (1.5, "a"),
+        {"mean": 3.0, "median": 3},
+    ])
+    def test_set_then_get(self, cache, value):
+        """Test that stored values round-trip exactly."""
+        cache.set("op", (1,), value)
+        assert cache.get("op", (1,)) == value
+        assert cache.hits == 1
+
+    @pytest.mark.unit
+    def test_key_distinguishes_inputs(self, cache):
+        """Test that operation, arguments, types and version change the key."""
+        assert cache.key("a", (1,)) != cache.key("b", (1,))
+        assert cache.key("a", (1,)) != cache.key("a", (1.0,))
+        assert cache.key("a", (1,)) != cache.key("a", (True,))
+        assert cache.key("a", (1,)) != cache.key("a", (1,), {"sample": False})
+        other = PersistentCache(cache.path, version="0.0.0")
+        assert other.key("a", (1,)) != cache.key("a", (1,))
+        other.close()
+
+    @pytest.mark.unit
+    def test_equal_arguments_share_a_key(self, cache):
+        """Test that equal but distinct argument objects find the same entry."""
+        first = [1.5, 2.5]
+        held = [1.5, 2.5]
+        extra_reference = held  # noqa: F841
+        assert cache.key("a", (first,)) == cache.key("a", (held,))
+        assert cache.key("a", (2.5,)) == cache.key("a", (float("2.5"),))
+        assert cache.key("a", ({"b": 1, "a": 2},)) == cache.key("a", ({"a": 2, "b": 1},))
+        assert cache.key("a", ({1, 2, 3},)) == cache.key("a", (set([3, 2, 1]),))
+
+    @pytest.mark.unit
+    def test_memoize_hits_on_equal_arguments(self, cache):
+        """Test that a memoized function is not called again for an equal list."""
+        spy = _counting(Statistics.mean)
+        mean = cache.memoize(spy, "Statistics.mean")
+        assert mean([1.0, 2.0, 4.5]) == 2.5
+        values = [1.0, 2.0, 4.5]
+        assert mean(values) == 2.5
+        assert mean(list(values)) == 2.5
+        assert spy.calls == 1
+
+    @pytest.mark.unit
+    def test_large_integer_arguments(self, cache):
+        """Test that integers beyond the decimal conversion limit can be keys."""
+        big = Calculator.factorial(3000)
+        cache.set("op", (big,), 1)
+        assert cache.get("op", (big * 1,)) == 1
+
+    @pytest.mark.unit
+    def test_unencodable_arguments_raise(self, cache):
+        """Test that arguments of unsupported types raise TypeError."""
+        with pytest.raises(TypeError, match="Cannot cache objects of unsupported types"):
+            cache.set("op", (object(),), 1)
+
+    @pytest.mark.unit
+    def test_memoize_uses_cache(self, cache):
+        """Test that memoized functions only compute on a miss."""
+        spy = _counting(Calculator.power)
+        power = cache.memoize(spy, "Calculator.power")
+        assert power(2, 10) == 1024
+        assert power(2, 10) == 1024
+        assert spy.calls == 1
+        assert cache.get("Calculator.power", (2, 10)) == 1024
+
+    @pytest.mark.unit
+    def test_entries_survive_reopening(self, tmp_path):
+        """Test that a new cache instance sees previously stored results."""
+        path = tmp_path / "cache.sqlite"
+        with PersistentCache(path) as first:
+            first.set("Calculator.factorial", (20,), Calculator.factorial(20))
+        with PersistentCache(path) as second:
+            assert second.get("Calculator.factorial", (20,)) == 2432902008176640000
+
+    @pytest.mark.unit
+    def test_size_based_eviction(self, tmp_path):
+        """Test that least recently used entries are evicted over the size limit."""
+        with PersistentCache(tmp_path / "cache.sqlite", max_bytes=100) as cache:
+            for i in range(10):
+                cache.set("op", (i,), "x" * 18)
+            assert cache.total_bytes() <= 100
+            assert len(cache) == 5
+            assert cache.get("op", (0,)) is None
+            assert cache.get("op", (9,)) == "x" * 18
+
+    @pytest.mark.unit
+    def test_oversized_values_are_not_stored(self, tmp_path):
+        """Test that a value larger than the cache is skipped."""
+        with PersistentCache(tmp_path / "cache.sqlite", max_bytes=10) as cache:
+            cache.set("op", (), "x" * 100)
+            assert len(cache) == 0
+
+    @pytest.mark.unit
+    def test_purge_stale_and_clear(self, tmp_path):
+        """Test removing entries from other versions and clearing the cache."""
+        path = tmp_path / "cache.sqlite"
+        with PersistentCache(path, version="0.0.1") as old:
+            old.set("op", (1,), 1)
+        with PersistentCache(path) as cache:
+            cache.set("op", (1,), 1)
+            assert cache.purge_stale() == 1
+            assert len(cache) == 1
+            cache.clear()
+            assert len(cache) == 0
+            assert cache.total_bytes() == 0
+
+    @pytest.mark.unit
+    def test_invalid_size(self, tmp_path):
+        """Test that a non-positive size limit raises ValueError."""
+        with pytest.raises(ValueError, match="Cache size must be positive"):
+            PersistentCache(tmp_path / "cache.sqlite", max_bytes=0)
+
+    @pytest.mark.unit
+    def test_operation_name(self):
+        """Test that operation names use the qualified method name."""
+        assert operation_name(Calculator.factorial) == "Calculator.factorial"
+
+    @pytest.mark.unit
+    def test_anonymous_functions_need_a_name(self, cache):
+        """Test that lambdas and local functions are not cached under a shared name."""
+        def local(x):
+            return x * 2
+
+        for func in (lambda x: x + 1, local):
+            with pytest.raises(ValueError, match="Cannot derive a cache operation name"):
+                cache.memoize(func)
+        increment = cache.memoize(lambda x: x + 1, operation="increment")
+        double = cache.memoize(local, operation="double")
+        assert (increment(5), double(5)) == (6, 10)
+
+    @pytest.mark.integration
+    def test_concurrent_processes(self, tmp_path):
+        """Test that several processes can share one cache file."""
+        path = str(tmp_path / "cache.sqlite")
+        with multiprocessing.Pool(4) as pool:
+            results = pool.starmap(_worker, [(path, i * 10) for i in range(4)])
+        for i, values in enumerate(results):
+            assert values == [Calculator.factorial(n) for n in range(i * 10, i * 10 + 20)]
+        with PersistentCache(path) as cache:
+            assert len(cache) == 50
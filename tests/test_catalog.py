@@ -0,0 +1,146 @@
+"""Unit tests for the catalog module."""
+import pytest
+import random
+from mathlib.catalog import ShapeCatalog
+from mathlib.geometry import Geometry
+from mathlib.shape_store import ShapeStore
+
+
+class TestShapeCatalog:
+    """Test suite for ShapeCatalog class."""
+
+    @pytest.fixture
+    def catalog(self):
+        """Fixture to provide an area catalog of mixed shapes."""
+        catalog = ShapeCatalog("area")
+        catalog.add(1, "circle", 1)
+        catalog.add(2, "rectangle", 2, 3)
+        catalog.add(3, "triangle", 4, 1)
+        catalog.add(4, "rectangle", 1, 1)
+        return catalog
+
+    @pytest.fixture
+    def shapes(self):
+        """Fixture to provide random circle radii keyed by id."""
+        rng = random.Random(34)
+        return {i: rng.uniform(0, 10) for i in range(500)}
+
+    # Test construction
+    @pytest.mark.unit
+    def test_add_computes_metric(self, catalog):
+        """Test that metrics are computed with the Geometry formulas."""
+        assert catalog.value(1) == Geometry.circle_area(1)
+        assert catalog.value(2) == 6
+        assert len(catalog) == 4
+        assert list(catalog.values()) == sorted(catalog.values())
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,message", [
+        (lambda c: c.add(1, "circle", 2), "Shape id already present: 1"),
+        (lambda c: c.add(9, "cylinder", 1, 1), "A cylinder has no area"),
+        (lambda c: c.add(9, "hexagon", 1), "Unknown shape kind: hexagon"),
+        (lambda c: c.add(9, "circle", -1), "Radius cannot be negative"),
+        (lambda c: c.extend([1, 10], [0.5, 0.5]), "Shape ids must be unique"),
+        (lambda c: c.extend([10, 11], [0.5]), "Shape ids and values must have the same length"),
+        (lambda c: c.insert(10, float("nan")), "Metric values cannot be NaN"),
+        (lambda c: c.extend([10, 11], [0.5, float("nan")]), "Metric values cannot be NaN"),
+        (lambda c: c.range(5, 1), "Lower bound cannot exceed upper bound"),
+        (lambda c: c.top_k(-1), "k cannot be negative"),
+    ])
+    def test_invalid_operations(self, catalog, call, message):
+        """Test that invalid operations raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            call(catalog)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call", [
+        lambda c: c.insert("a", 2.0),
+        lambda c: c.insert(2 ** 70, 2.0),
+        lambda c: c.extend([10, "b"], [2.0, 3.0]),
+        lambda c: c.extend([10, 11], [2.0, "x"]),
+    ])
+    def test_rejected_input_changes_nothing(self, catalog, call):
+        """Test that an id or value that cannot be stored leaves the catalog unchanged."""
+        before = (list(catalog.values()), catalog.top_k(4))
+        with pytest.raises((TypeError, OverflowError)):
+            call(catalog)
+        assert (list(catalog.values()), catalog.top_k(4)) == before
+        assert len(catalog) == 4
+
+    @pytest.mark.unit
+    def test_values_is_a_copy(self, catalog):
+        """Test that holding the values does not block or see later insertions."""
+        values = catalog.values()
+        catalog.add(20, "circle", 3)
+        catalog.insert(21, 0.25)
+        assert len(values) == 4
+        assert len(catalog.values()) == 6
+
+    @pytest.mark.unit
+    def test_unknown_metric(self):
+        """Test that an unknown metric raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown metric: mass"):
+            ShapeCatalog("mass")
+
+    # Test queries
+    @pytest.mark.unit
+    @pytest.mark.parametrize("low,high,expected", [
+        (0, 10, [4, 3, 1, 2]),
+        (1, 2, [4, 3]),
+        (3.2, 5.9, []),
+        (6, 6, [2]),
+    ])
+    def test_range(self, catalog, low, high, expected):
+        """Test closed range queries in ascending metric order."""
+        assert list(catalog.range(low, high)) == expected
+        assert catalog.count_range(low, high) == len(expected)
+
+    @pytest.mark.unit
+    def test_top_k(self, catalog):
+        """Test largest and smallest k queries."""
+        assert catalog.top_k(2) == [(6.0, 2), (Geometry.circle_area(1), 1)]
+        assert catalog.top_k(1, largest=False) == [(1.0, 4)]
+        assert len(catalog.top_k(10)) == 4
+        assert catalog.top_k(0) == []
+
+    @pytest.mark.unit
+    def test_matches_brute_force(self, shapes):
+        """Test random inserts, deletes and queries against a linear scan."""
+        catalog = ShapeCatalog("area")
+        for shape_id, radius in shapes.items():
+            catalog.add(shape_id, "circle", radius)
+        for shape_id in range(0, 500, 3):
+            catalog.remove(shape_id)
+            del shapes[shape_id]
+        areas = {shape_id: Geometry.circle_area(r) for shape_id, r in shapes.items()}
+        expected = sorted(shape_id for shape_id, a in areas.items() if 50 <= a <= 120)
+        assert sorted(catalog.range(50, 120)) == expected
+        largest = sorted(((a, shape_id) for shape_id, a in areas.items()), reverse=True)[:5]
+        assert catalog.top_k(5) == largest
+
+    # Test mutation
+    @pytest.mark.unit
+    def test_remove_with_duplicate_values(self):
+        """Test removing one of several shapes with equal metrics."""
+        catalog = ShapeCatalog("perimeter")
+        for shape_id in range(5):
+            catalog.add(shape_id, "rectangle", 1, 2)
+        catalog.remove(3)
+        assert sorted(catalog.range(6, 6)) == [0, 1, 2, 4]
+        assert 3 not in catalog
+        with pytest.raises(KeyError):
+            catalog.remove(3)
+
+    @pytest.mark.integration
+    def test_extend_from_store(self):
+        """Test bulk loading volumes from a ShapeStore."""
+        store = ShapeStore()
+        store.extend("sphere", [1, 3, 2])
+        store.extend("cylinder", [1, 1], [1, 5])
+        catalog = ShapeCatalog("volume")
+        catalog.extend_from_store(store, "sphere")
+        catalog.extend_from_store(store, "cylinder", id_offset=100)
+        catalog.add(200, "sphere", 0.5)
+        assert [shape_id for _, shape_id in catalog.top_k(2)] == [1, 2]
+        assert catalog.value(101) == pytest.approx(Geometry.cylinder_volume(1, 5))
+        assert list(catalog.range(0, 1)) == [200]
@@ -0,0 +1,173 @@
+"""Unit tests for the cli module."""
+import pytest
+import io
+import json
+import sys
+from mathlib.cli import main
+from mathlib.geometry import Geometry
+from mathlib.statistics import Statistics
+
+
+class TestCLI:
+    """Test suite for the mathlib command line tool."""
+
+    @pytest.fixture
+    def csv_file(self, tmp_path):
+        """Fixture to provide a small CSV file of cylinders."""
+        path = tmp_path / "parts.csv"
+        path.write_text("name,radius,height\na,1,2\nb,3,4\nc,0.5,10\n")
+        return path
+
+    @pytest.fixture
+    def run(self, capsys, monkeypatch):
+        """Fixture to run the CLI and capture stdout, stderr and exit code."""
+        def run(*argv, stdin=""):
+            monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+            code = main(list(argv))
+            out, err = capsys.readouterr()
+            return code, out, err
+        return run
+
+    # Test row operations
+    @pytest.mark.unit
+    def test_row_csv(self, run, csv_file):
+        """Test appending a Geometry result column to CSV rows."""
+        code, out, err = run("row", "cylinder_volume", str(csv_file), "--columns", "radius,height")
+        assert code == 0
+        lines = out.splitlines()
+        assert lines[0] == "name,radius,height,cylinder_volume"
+        assert lines[2] == f"b,3,4,{Geometry.cylinder_volume(3, 4)}"
+        assert "3 rows in" in err and "rows/s" in err
+
+    @pytest.mark.unit
+    def test_row_ndjson_stdin(self, run):
+        """Test NDJSON from stdin using the first keys as arguments."""
+        stdin = '{"a": 2, "b": 10}\n\n{"a": 3, "b": 2}\n'
+        code, out, _ = run("row", "power", "--format", "ndjson", "-q", stdin=stdin)
+        assert code == 0
+        assert [json.loads(line)["power"] for line in out.splitlines()] == [1024, 9]
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("workers,chunk_size", [(1, 1), (2, 3), (3, 1000)])
+    def test_row_order_preserved(self, run, tmp_path, workers, chunk_size):
+        """Test that chunked, parallel processing keeps input order."""
+        path = tmp_path / "numbers.csv"
+        path.write_text("n\n" + "".join(f"{i}\n" for i in range(50)))
+        code, out, _ = run("row", "square_root", str(path), "--workers", str(workers),
+                           "--chunk-size", str(chunk_size), "-q")
+        assert code == 0
+        assert [line.split(",")[0] for line in out.splitlines()[1:]] == [str(i) for i in range(50)]
+
+    @pytest.mark.unit
+    def test_row_error_stops(self, run):
+        """Test that an invalid row is reported with its row number."""
+        code, _, err = run("row", "divide", "-q", stdin="a,b\n1,2\n1,0\n")
+        assert code == 1
+        assert "mathlib: error: row 2: Cannot divide by zero" in err
+
+    @pytest.mark.unit
+    def test_row_skip_errors(self, run):
+        """Test that --skip-errors drops invalid rows and continues."""
+        code, out, err = run("row", "circle_area", "--skip-errors", "-q", stdin="r\n1\nx\n-1\n2\n")
+        assert code == 0
+        assert len(out.splitlines()) == 3
+        assert "skipped row 2: Not a number: 'x'" in err
+        assert "skipped row 3: Radius cannot be negative" in err
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("command", ["row", "reduce"])
+    def test_short_csv_rows(self, run, command):
+        """Test that rows with too few fields are errors that can be skipped."""
+        operation = "add" if command == "row" else "mean"
+        code, _, err = run(command, operation, "--columns", "a,b", "-q", stdin="a,b\n1,2\n3\n")
+        assert code == 1
+        assert "row 2: Missing column: row has only 1 field(s)" in err
+        code, out, err = run(command, operation, "--columns", "a,b", "--skip-errors", "-q",
+                             stdin="a,b\n1,2\n3\n")
+        assert code == 0
+        assert "skipped row 2: Missing column" in err
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not hasattr(sys, "get_int_max_str_digits"),
+                        reason="Integer string conversion is unlimited")
+    @pytest.mark.parametrize("fmt,stdin", [
+        ("csv", "n\n5\n2000\n3\n"),
+        ("ndjson", '{"n": 5}\n{"n": 2000}\n{"n": 3}\n'),
+    ])
+    def test_unwritable_result(self, run, fmt, stdin):
+        """Test that a result too large to write is a row error that can be skipped."""
+        code, out, err = run("row", "factorial", "--format", fmt, "--skip-errors", "-q", stdin=stdin)
+        assert code == 0
+        assert "skipped row 2" in err
+        assert "120" in out and "6" in out.splitlines()[-1]
+        code, _, err = run("row", "factorial", "--format", fmt, "-q", stdin=stdin)
+        assert code == 1 and "row 2" in err
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("operation,expected", [
+        ("median", "2"), ("mode", "[2]"), ("percentile", "3"), ("range_value", "4.0"),
+    ])
+    def test_reduce_keeps_integers(self, run, operation, expected):
+        """Test that order statistics of an integer column are integers."""
+        code, out, _ = run("reduce", operation, "--format", "ndjson", "--percentile", "75", "-q",
+                           stdin="".join(f'{{"x": {x}}}\n' for x in (2, 5, 1, 2, 3)))
+        assert code == 0
+        assert out == f'{{"column": "x", "{operation}": {expected}}}\n'
+
+    @pytest.mark.unit
+    def test_output_file(self, run, csv_file, tmp_path):
+        """Test writing results to a file."""
+        target = tmp_path / "out.csv"
+        code, out, _ = run("row", "rectangle_area", str(csv_file), "--columns", "radius,height",
+                           "-o", str(target), "-q")
+        assert code == 0 and out == ""
+        assert target.read_text().splitlines()[1] == "a,1,2,2"
+
+    # Test reductions
+    @pytest.mark.unit
+    def test_reduce_csv(self, run, csv_file):
+        """Test several reductions over the numeric columns."""
+        code, out, _ = run("reduce", "mean,median,variance,range_value", str(csv_file),
+                           "--columns", "radius,height", "--chunk-size", "2", "-q")
+        assert code == 0
+        lines = out.splitlines()
+        assert lines[0] == "column,mean,median,variance,range_value"
+        mean, median, variance, spread = map(float, lines[2].split(",")[1:])
+        assert mean == pytest.approx(Statistics.mean([2, 4, 10]))
+        assert median == 4
+        assert variance == pytest.approx(Statistics.variance([2, 4, 10]))
+        assert spread == 8
+
+    @pytest.mark.integration
+    def test_reduce_ndjson_parallel(self, run):
+        """Test a percentile over NDJSON with worker processes."""
+        stdin = "".join(json.dumps({"x": i}) + "\n" for i in range(101))
+        code, out, _ = run("reduce", "percentile", "--percentile", "90", "--format", "ndjson",
+                           "--workers", "2", "--chunk-size", "10", "-q", stdin=stdin)
+        assert code == 0
+        assert json.loads(out) == {"column": "x", "percentile": 90.0}
+
+    # Test errors
+    @pytest.mark.unit
+    @pytest.mark.parametrize("argv,stdin,message", [
+        (["row", "add", "--columns", "a"], "a,b\n1,2\n", "Operation needs 2 column(s), got 1"),
+        (["row", "add", "--columns", "a,z"], "a,b\n1,2\n", "Unknown column: z"),
+        (["reduce", "mean,total"], "a\n1\n", "Unknown reduction: total"),
+        (["reduce", "mean"], "", "Input has no header row"),
+        (["reduce", "mean"], "a\n", "Cannot calculate mean of empty list"),
+        (["row", "add", "missing.csv"], "", "No such file"),
+    ])
+    def test_invalid_input(self, run, argv, stdin, message):
+        """Test that invalid input is reported with exit code 1."""
+        code, _, err = run(*argv, stdin=stdin)
+        assert code == 1
+        assert message in err
+
+    @pytest.mark.unit
+    def test_invalid_options(self, run):
+        """Test that unknown operations and bad sizes are rejected."""
+        with pytest.raises(SystemExit):
+            run("row", "not_an_operation")
+        code, _, err = run("row", "add", "--chunk-size", "0")
+        assert code == 2
+        assert "must be positive" in err
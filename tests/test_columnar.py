@@ -0,0 +1,142 @@
+"""Unit tests for the columnar module."""
+import pytest
+import random
+from array import array
+from mathlib.columnar import ColumnarReader, ColumnarWriter, write_columnar
+from mathlib.statistics import Statistics
+
+
+@pytest.fixture
+def values():
+    """Fixture to provide a float and an int column of 1000 rows."""
+    rng = random.Random(39)
+    return {
+        "x": [rng.gauss(10, 3) for _ in range(1000)],
+        "n": array("q", (rng.randint(-50, 50) for _ in range(1000))),
+    }
+
+
+@pytest.fixture
+def path(tmp_path, values):
+    """Fixture to provide a file with 64-row blocks."""
+    path = tmp_path / "data.col"
+    write_columnar(str(path), values, block_size=64)
+    return str(path)
+
+
+class TestColumnar:
+    """Test suite for ColumnarWriter and ColumnarReader classes."""
+
+    # Test round trips
+    @pytest.mark.unit
+    def test_read_back(self, path, values):
+        """Test that every value and type survives a round trip."""
+        with ColumnarReader(path) as reader:
+            assert len(reader) == 1000
+            assert reader.columns == {"x": "d", "n": "q"}
+            assert reader.blocks == 16
+            assert list(reader.read("x")) == values["x"]
+            assert reader.read("n", 100, 300) == values["n"][100:300]
+
+    @pytest.mark.unit
+    def test_streaming_writer(self, tmp_path):
+        """Test appending chunks that do not line up with blocks."""
+        path = str(tmp_path / "stream.col")
+        with ColumnarWriter(path, [("a", "d")], block_size=10) as writer:
+            for start in range(0, 95, 7):
+                writer.append({"a": [float(i) for i in range(start, min(start + 7, 95))]})
+        with ColumnarReader(path) as reader:
+            assert list(reader.read("a")) == [float(i) for i in range(95)]
+            assert reader.footer("a", 9) == (5, 92.0, 10.0, 90.0, 94.0)
+
+    # Test queries
+    @pytest.mark.unit
+    @pytest.mark.parametrize("start,stop", [(0, None), (0, 64), (10, 20), (63, 65), (5, 999), (900, 1000)])
+    def test_queries_match_statistics(self, path, values, start, stop):
+        """Test footer-based queries against Statistics over the same rows."""
+        with ColumnarReader(path) as reader:
+            for name in ("x", "n"):
+                subset = list(values[name][start:stop])
+                assert reader.mean(name, start, stop) == pytest.approx(Statistics.mean(subset))
+                assert reader.variance(name, start, stop) == pytest.approx(Statistics.variance(subset))
+                assert reader.range_value(name, start, stop) == Statistics.range_value(subset)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("start,stop,scanned", [
+        (0, None, 0), (0, 64, 0), (64, 640, 0), (10, 20, 1), (10, 900, 2), (0, 1000, 0), (0, 999, 1),
+    ])
+    def test_only_edge_blocks_scanned(self, path, start, stop, scanned):
+        """Test that whole blocks are answered from footers."""
+        with ColumnarReader(path) as reader:
+            assert reader.blocks_scanned(start, stop) == scanned
+
+    @pytest.mark.unit
+    def test_footer_matches_values(self, path, values):
+        """Test the stored summary of one block."""
+        with ColumnarReader(path) as reader:
+            n, mean, m2, low, high = reader.footer("x", 3)
+            block = values["x"][192:256]
+            assert n == 64
+            assert mean == pytest.approx(Statistics.mean(block))
+            assert m2 / 63 == pytest.approx(Statistics.variance(block))
+            assert (low, high) == (min(block), max(block))
+
+    # Test errors
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,message", [
+        (lambda r: r.mean("x", 5, 5), "Cannot calculate mean of empty list"),
+        (lambda r: r.variance("x", 5, 6), "only one data point"),
+        (lambda r: r.mean("y"), "Unknown column: y"),
+        (lambda r: r.mean("x", 10, 3), "Row range is invalid"),
+    ])
+    def test_invalid_queries(self, path, call, message):
+        """Test that invalid queries raise ValueError."""
+        with ColumnarReader(path) as reader:
+            with pytest.raises(ValueError, match=message):
+                call(reader)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("columns,block_size,message", [
+        ([], 8, "At least one column is required"),
+        ([("a", "d"), ("a", "q")], 8, "Column names must be unique"),
+        ([("a", "f")], 8, "Unsupported column type: f"),
+        ([("a", "d")], 0, "Block size must be positive"),
+    ])
+    def test_invalid_writer(self, tmp_path, columns, block_size, message):
+        """Test that invalid layouts raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            ColumnarWriter(str(tmp_path / "bad.col"), columns, block_size)
+
+    @pytest.mark.unit
+    def test_invalid_append(self, tmp_path):
+        """Test that mismatched appends raise ValueError."""
+        with ColumnarWriter(str(tmp_path / "a.col"), [("a", "d"), ("b", "d")]) as writer:
+            with pytest.raises(ValueError, match="Expected columns: a, b"):
+                writer.append({"a": [1]})
+            with pytest.raises(ValueError, match="Columns must have the same length"):
+                writer.append({"a": [1], "b": [1, 2]})
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("bad,error", [
+        ({"a": [2.0], "b": ["30"]}, TypeError),
+        ({"a": [2.0], "b": [2 ** 70]}, OverflowError),
+    ])
+    def test_rejected_append_adds_nothing(self, tmp_path, bad, error):
+        """Test that a column that cannot be stored leaves every column unchanged."""
+        path = str(tmp_path / "a.col")
+        with ColumnarWriter(path, [("a", "d"), ("b", "q")], block_size=2) as writer:
+            writer.append({"a": [1.0], "b": [10]})
+            with pytest.raises(error):
+                writer.append(bad)
+            writer.append({"a": [3.0, 4.0], "b": [30, 40]})
+        with ColumnarReader(path) as reader:
+            assert list(reader.read("a")) == [1.0, 3.0, 4.0]
+            assert list(reader.read("b")) == [10, 30, 40]
+
+    @pytest.mark.unit
+    def test_not_a_columnar_file(self, tmp_path):
+        """Test that other files are rejected."""
+        other = tmp_path / "other.bin"
+        other.write_bytes(b"hello world, not columnar")
+        with pytest.raises(ValueError, match="Not a columnar file"):
+            ColumnarReader(str(other))
@@ -0,0 +1,132 @@
+"""Unit tests for the Distance module."""
+import pytest
+import itertools
+import math
+import random
+from array import array
+from mathlib.distance import Distance
+from mathlib.geometry import Geometry
+
+
+class TestDistance:
+    """Test suite for Distance class."""
+
+    @pytest.fixture
+    def dist(self):
+        """Fixture to provide a Distance instance."""
+        return Distance()
+
+    @pytest.fixture
+    def cloud(self):
+        """Fixture to provide 60 random points in 5 dimensions."""
+        rng = random.Random(9)
+        return [rng.uniform(-10, 10) for _ in range(60 * 5)], 5
+
+    # Test single distances
+    @pytest.mark.unit
+    @pytest.mark.parametrize("p,q,expected", [
+        ((0, 0), (3, 4), 5.0),
+        ((1, 2, 3), (1, 2, 3), 0.0),
+        ((0, 0, 0), (1, 1, 1), math.sqrt(3)),
+        ((0,) * 128, (1,) * 128, math.sqrt(128)),
+    ])
+    def test_euclidean(self, dist, p, q, expected):
+        """Test distances in several dimensions."""
+        assert dist.euclidean(p, q) == pytest.approx(expected)
+
+    @pytest.mark.unit
+    def test_euclidean_matches_geometry(self, dist):
+        """Test agreement with Geometry.distance_between_points in 2D."""
+        assert dist.euclidean((1.5, -2), (4, 7.25)) == pytest.approx(
+            Geometry.distance_between_points(1.5, -2, 4, 7.25))
+
+    @pytest.mark.unit
+    def test_euclidean_dimension_mismatch(self, dist):
+        """Test that points of different dimension raise ValueError."""
+        with pytest.raises(ValueError, match="Points must have the same number of dimensions"):
+            dist.euclidean((0, 0), (0, 0, 0))
+
+    @pytest.mark.unit
+    def test_norm(self, dist):
+        """Test vector length."""
+        assert dist.norm((3, 4, 12)) == 13.0
+
+    # Test one-to-many
+    @pytest.mark.unit
+    def test_one_to_many(self, dist):
+        """Test distances from one point to a flat buffer of points."""
+        result = dist.one_to_many((0, 0, 0), [1, 0, 0, 0, 3, 4, 2, 3, 6])
+        assert list(result) == [1.0, 5.0, 7.0]
+
+    @pytest.mark.unit
+    def test_one_to_many_into_out(self, dist):
+        """Test writing one-to-many results into a preallocated buffer."""
+        out = array("d", [0.0] * 3)
+        assert dist.one_to_many((0, 0), [3, 4, 6, 8], out=out) is out
+        assert list(out) == [5.0, 10.0, 0.0]
+        with pytest.raises(ValueError, match="Output buffer is too small"):
+            dist.one_to_many((0, 0), [3, 4, 6, 8], out=array("d", [0.0]))
+
+    # Test pairwise distances
+    @pytest.mark.unit
+    def test_pdist(self, dist, cloud):
+        """Test the condensed matrix against every pair."""
+        coords, dims = cloud
+        points = [coords[i:i + dims] for i in range(0, len(coords), dims)]
+        expected = [math.dist(a, b) for a, b in itertools.combinations(points, 2)]
+        assert list(dist.pdist(coords, dims)) == expected
+
+    @pytest.mark.unit
+    def test_condensed_index(self, dist, cloud):
+        """Test locating pairs in the condensed matrix."""
+        coords, dims = cloud
+        n = len(coords) // dims
+        condensed = dist.pdist(coords, dims)
+        for i, j in [(0, 1), (0, n - 1), (7, 3), (n - 2, n - 1)]:
+            expected = dist.euclidean(coords[i * dims:(i + 1) * dims], coords[j * dims:(j + 1) * dims])
+            assert condensed[dist.condensed_index(i, j, n)] == expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("i,j,message", [
+        (2, 2, "distance to itself"),
+        (0, 5, "Point index out of range"),
+    ])
+    def test_condensed_index_invalid(self, dist, i, j, message):
+        """Test that invalid pairs raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            dist.condensed_index(i, j, 5)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("workers,tiles", [(1, 1), (3, None), (4, 50)])
+    def test_pdist_parallel_threads(self, dist, cloud, workers, tiles):
+        """Test that tiled thread-pool results equal the serial matrix."""
+        coords, dims = cloud
+        assert dist.pdist_parallel(coords, dims, workers=workers, tiles=tiles) == dist.pdist(coords, dims)
+
+    @pytest.mark.integration
+    def test_pdist_parallel_processes(self, dist, cloud):
+        """Test that tiled process-pool results equal the serial matrix."""
+        coords, dims = cloud
+        result = dist.pdist_parallel(coords, dims, workers=2, use_processes=True)
+        assert result == dist.pdist(coords, dims)
+
+    @pytest.mark.unit
+    def test_pdist_small_inputs(self, dist):
+        """Test that zero or one point produce an empty matrix."""
+        assert len(dist.pdist([], 3)) == 0
+        assert len(dist.pdist_parallel([1, 2, 3], 3, workers=2)) == 0
+
+    @pytest.mark.unit
+    def test_malformed_buffer(self, dist):
+        """Test that buffers not divisible by the dimension raise ValueError."""
+        with pytest.raises(ValueError, match="must be a multiple of 3"):
+            dist.pdist([1, 2, 3, 4], 3)
+        with pytest.raises(ValueError, match="at least one dimension"):
+            dist.pdist([1, 2], 0)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("workers,tiles", [(0, None), (-1, None), (2, 0), (None, 0)])
+    def test_pdist_parallel_invalid_pool(self, dist, workers, tiles):
+        """Test that explicit non-positive workers or tiles raise ValueError."""
+        with pytest.raises(ValueError, match="Workers and tiles must be positive"):
+            dist.pdist_parallel([0, 0, 1, 1], 2, workers=workers, tiles=tiles)
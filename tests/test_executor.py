@@ -0,0 +1,126 @@
+"""Unit tests for the executor module."""
+import pytest
+import random
+import threading
+from array import array
+from mathlib.batch_geometry import BatchGeometry, BatchValidationError
+from mathlib.cache import PersistentCache
+from mathlib.calculator import Calculator
+from mathlib.executor import BatchExecutor, gil_enabled
+from mathlib.geometry import Geometry
+from mathlib.statistics import Statistics
+
+
+class TestBatchExecutor:
+    """Test suite for BatchExecutor class."""
+
+    @pytest.fixture
+    def executor(self):
+        """Fixture to provide a four-thread executor."""
+        with BatchExecutor(workers=4) as executor:
+            yield executor
+
+    @pytest.fixture
+    def radii(self):
+        """Fixture to provide 1000 random radii."""
+        rng = random.Random(35)
+        return array("d", (rng.uniform(0, 10) for _ in range(1000)))
+
+    # Test scalar operations
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [None, 1, 7, 5000])
+    def test_map_preserves_order(self, executor, chunk_size):
+        """Test that results come back in input order for any chunking."""
+        a = list(range(100))
+        b = [2] * 100
+        assert executor.map(Calculator.power, a, b, chunk_size=chunk_size) == [x ** 2 for x in a]
+
+    @pytest.mark.unit
+    def test_map_geometry_and_statistics(self, executor, radii):
+        """Test mapping Geometry and Statistics operations."""
+        assert executor.map(Geometry.circle_area, radii) == [Geometry.circle_area(r) for r in radii]
+        datasets = [[1, 2, 3], [4, 4], [10]]
+        assert executor.map(Statistics.mean, datasets) == [2.0, 4.0, 10.0]
+
+    @pytest.mark.unit
+    def test_map_empty(self, executor):
+        """Test that an empty batch returns an empty list."""
+        assert executor.map(Calculator.add, [], []) == []
+
+    @pytest.mark.unit
+    def test_map_propagates_first_error(self, executor):
+        """Test that errors raised in worker threads reach the caller."""
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            executor.map(Calculator.divide, [1, 2, 3], [1, 0, 1], chunk_size=1)
+
+    @pytest.mark.unit
+    def test_map_with_cache(self, tmp_path):
+        """Test that results are shared through a thread-safe cache."""
+        with PersistentCache(tmp_path / "cache.db") as cache:
+            with BatchExecutor(workers=4, chunk_size=5, cache=cache) as executor:
+                values = list(range(40))
+                first = executor.map(Calculator.factorial, values)
+                second = executor.map(Calculator.factorial, values)
+            assert first == second == [Calculator.factorial(n) for n in values]
+            assert cache.misses == 40
+            assert cache.hits == 40
+
+    # Test column kernels
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [None, 3, 999, 1000])
+    def test_map_batch_matches_kernel(self, executor, radii, chunk_size):
+        """Test that chunked kernels equal one unchunked call."""
+        expected = BatchGeometry.cylinder_volume(radii, radii)
+        assert executor.map_batch(BatchGeometry.cylinder_volume, radii, radii,
+                                  chunk_size=chunk_size) == expected
+
+    @pytest.mark.unit
+    def test_map_batch_into_out(self, executor, radii):
+        """Test writing chunked results into a preallocated buffer."""
+        out = array("d", bytes(8 * len(radii)))
+        assert executor.map_batch(BatchGeometry.circle_area, radii, out=out) is out
+        assert out == BatchGeometry.circle_area(radii)
+
+    @pytest.mark.unit
+    def test_map_batch_reports_global_indices(self, executor):
+        """Test that validation errors list positions in the whole batch."""
+        radii = [1.0] * 20
+        radii[3] = radii[12] = radii[19] = -1.0
+        with pytest.raises(BatchValidationError) as info:
+            executor.map_batch(BatchGeometry.sphere_volume, radii, chunk_size=5)
+        assert info.value.indices == [3, 12, 19]
+        assert str(info.value) == "Radius cannot be negative (at indices 3, 12, 19)"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,message", [
+        (lambda e: e.map(Calculator.add, [1, 2], [1]), "Columns must have the same length"),
+        (lambda e: e.map(Calculator.add), "At least one column is required"),
+        (lambda e: e.map_batch(BatchGeometry.circle_area, [1], chunk_size=0), "Chunk size must be positive"),
+        (lambda e: BatchExecutor(workers=0), "Number of workers must be positive"),
+    ])
+    def test_invalid_arguments(self, executor, call, message):
+        """Test that invalid arguments raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            call(executor)
+
+    # Test thread safety
+    @pytest.mark.integration
+    def test_concurrent_callers(self, executor, radii):
+        """Test several threads sharing one executor."""
+        expected = BatchGeometry.circle_area(radii)
+        results = []
+
+        def worker():
+            results.append(executor.map_batch(BatchGeometry.circle_area, radii, chunk_size=50))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [expected] * 8
+
+    @pytest.mark.unit
+    def test_gil_enabled(self):
+        """Test that the GIL check returns a boolean."""
+        assert isinstance(gil_enabled(), bool)
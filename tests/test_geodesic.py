@@ -0,0 +1,209 @@
+"""Unit tests for the geodesic module."""
+import pytest
+import math
+import random
+from array import array
+from mathlib.geodesic import GeohashIndex, GeoPoints, Geodesic
+
+# Reference coordinates of a few cities
+LONDON = (51.5074, -0.1278)
+PARIS = (48.8566, 2.3522)
+NEW_YORK = (40.7128, -74.0060)
+SYDNEY = (-33.8688, 151.2093)
+
+
+class TestGeodesic:
+    """Test suite for Geodesic class."""
+
+    @pytest.fixture
+    def geo(self):
+        """Fixture to provide a Geodesic instance."""
+        return Geodesic()
+
+    # Test distances
+    @pytest.mark.unit
+    @pytest.mark.parametrize("a,b,expected", [
+        (LONDON, PARIS, 343.56),
+        (LONDON, NEW_YORK, 5570.2),
+        (NEW_YORK, SYDNEY, 15988.8),
+        (LONDON, LONDON, 0.0),
+    ])
+    def test_haversine(self, geo, a, b, expected):
+        """Test great-circle distances between cities."""
+        assert geo.haversine(*a, *b) == pytest.approx(expected, rel=1e-3, abs=1e-9)
+
+    @pytest.mark.unit
+    def test_haversine_radius_sets_unit(self, geo):
+        """Test that a quarter of a unit circle has length pi / 2."""
+        assert geo.haversine(0, 0, 0, 90, radius=1) == pytest.approx(1.5707963267948966)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("a,b,expected", [
+        ((50.06632, -5.71475), (58.64402, -3.07), 969.954),
+        (LONDON, PARIS, 343.923),
+        ((0, 0), (0, 1), 111.319),
+        ((0, 0), (0, 0), 0.0),
+    ])
+    def test_vincenty(self, geo, a, b, expected):
+        """Test ellipsoidal distances against known values."""
+        assert geo.vincenty(*a, *b) == pytest.approx(expected, abs=1e-2)
+
+    @pytest.mark.unit
+    def test_vincenty_antipodal(self, geo):
+        """Test that nearly antipodal points fail to converge."""
+        with pytest.raises(ValueError, match="failed to converge"):
+            geo.vincenty(0, 0, 0.5, 179.7)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("lat,lon,message", [
+        (91, 0, "Latitude must be between -90 and 90"),
+        (0, -181, "Longitude must be between -180 and 180"),
+    ])
+    def test_invalid_coordinates(self, geo, lat, lon, message):
+        """Test that out-of-range coordinates raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            geo.haversine(lat, lon, 0, 0)
+
+    # Test geohash
+    @pytest.mark.unit
+    @pytest.mark.parametrize("lat,lon,precision,expected", [
+        (57.64911, 10.40744, 11, "u4pruydqqvj"),
+        (42.6, -5.6, 5, "ezs42"),
+        (-25.382708, -49.265506, 7, "6gkzwgj"),
+    ])
+    def test_geohash_encode(self, geo, lat, lon, precision, expected):
+        """Test encoding against published geohashes."""
+        assert geo.geohash_encode(lat, lon, precision) == expected
+
+    @pytest.mark.unit
+    def test_geohash_round_trip(self, geo):
+        """Test that decoding returns a cell containing the original point."""
+        lat, lon, lat_err, lon_err = geo.geohash_decode(geo.geohash_encode(*SYDNEY, 9))
+        assert abs(lat - SYDNEY[0]) <= lat_err
+        assert abs(lon - SYDNEY[1]) <= lon_err
+        assert lat_err < 1e-4
+
+    @pytest.mark.unit
+    def test_geohash_neighbors(self, geo):
+        """Test neighbours, including wrapping across the antimeridian."""
+        assert sorted(geo.geohash_neighbors("ezs42")) == sorted(
+            ["ezs48", "ezs49", "ezs43", "ezs41", "ezs40", "ezefp", "ezefr", "ezefx"])
+        east = geo.geohash_neighbors(geo.geohash_encode(0.1, 179.99, 3))
+        assert geo.geohash_encode(0.1, -179.99, 3) in east
+        assert len(geo.geohash_neighbors(geo.geohash_encode(89.99, 0, 2))) == 5
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,message", [
+        (lambda g: g.geohash_decode(""), "Geohash cannot be empty"),
+        (lambda g: g.geohash_decode("abc"), "Invalid geohash character: 'a'"),
+        (lambda g: g.geohash_encode(0, 0, 13), "Precision must be between 1 and 12"),
+    ])
+    def test_geohash_invalid(self, geo, call, message):
+        """Test that invalid geohash input raises ValueError."""
+        with pytest.raises(ValueError, match=message):
+            call(geo)
+
+
+class TestGeoPoints:
+    """Test suite for GeoPoints class."""
+
+    @pytest.fixture
+    def points(self):
+        """Fixture to provide a batch of city coordinates."""
+        cities = [LONDON, PARIS, NEW_YORK, SYDNEY]
+        return GeoPoints([c[0] for c in cities], [c[1] for c in cities])
+
+    @pytest.mark.unit
+    def test_haversine_from_matches_scalar(self, points):
+        """Test that batch distances equal the scalar haversine."""
+        expected = [Geodesic.haversine(*PARIS, lat, lon) for lat, lon in zip(points.lats, points.lons)]
+        assert list(points.haversine_from(*PARIS)) == pytest.approx(expected)
+
+    @pytest.mark.unit
+    def test_haversine_from_into_out(self, points):
+        """Test writing batch distances into a preallocated buffer."""
+        out = array("d", [0.0] * 4)
+        assert points.haversine_from(*LONDON, out=out) is out
+        assert out[0] == 0.0
+
+    @pytest.mark.unit
+    def test_vincenty_from_matches_scalar(self, points):
+        """Test that batch Vincenty distances equal the scalar version."""
+        expected = [Geodesic.vincenty(*LONDON, lat, lon) for lat, lon in zip(points.lats, points.lons)]
+        assert list(points.vincenty_from(*LONDON)) == expected
+
+    @pytest.mark.unit
+    def test_invalid_batch(self):
+        """Test that malformed batches raise ValueError."""
+        with pytest.raises(ValueError, match="Columns must have the same length"):
+            GeoPoints([0, 1], [0])
+        with pytest.raises(ValueError, match="Latitude must be between -90 and 90"):
+            GeoPoints([0, 95], [0, 0])
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("lats,lons,message", [
+        ([math.nan, 10], [0, 0], "Latitude must be between -90 and 90"),
+        ([10, math.nan], [0, 0], "Latitude must be between -90 and 90"),
+        ([0, 0], [math.nan, 200], "Longitude must be between -180 and 180"),
+    ])
+    def test_nan_coordinates(self, lats, lons, message):
+        """Test that NaN coordinates are rejected like the scalar methods do."""
+        with pytest.raises(ValueError, match=message):
+            GeoPoints(lats, lons)
+
+
+class TestGeohashIndex:
+    """Test suite for GeohashIndex class."""
+
+    @pytest.fixture
+    def points(self):
+        """Fixture to provide random points clustered around Europe."""
+        rng = random.Random(21)
+        return {i: (rng.uniform(35, 60), rng.uniform(-10, 30)) for i in range(2000)}
+
+    @pytest.fixture
+    def index(self, points):
+        """Fixture to provide an index over the random points."""
+        index = GeohashIndex()
+        for key, (lat, lon) in points.items():
+            index.add(key, lat, lon)
+        return index
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("radius", [0, 25, 120, 800, 5000])
+    def test_within_radius_matches_brute_force(self, index, points, radius):
+        """Test radius queries against a linear haversine scan."""
+        for lat, lon in [PARIS, LONDON, (47.0, 8.5)]:
+            expected = sorted(
+                (Geodesic.haversine(lat, lon, *p), key) for key, p in points.items()
+                if Geodesic.haversine(lat, lon, *p) <= radius
+            )
+            assert sorted(index.within_radius(lat, lon, radius)) == expected
+
+    @pytest.mark.unit
+    def test_add_replace_and_remove(self):
+        """Test that replaced and removed points are reflected in queries."""
+        index = GeohashIndex(precision=7)
+        index.add("a", *PARIS)
+        index.add("b", *LONDON)
+        index.add("a", *NEW_YORK)
+        assert len(index) == 2
+        assert [key for _, key in index.within_radius(*NEW_YORK, 10)] == ["a"]
+        index.remove("a")
+        assert index.within_radius(*NEW_YORK, 10) == []
+        with pytest.raises(KeyError):
+            index.remove("a")
+
+    @pytest.mark.unit
+    def test_query_across_antimeridian(self):
+        """Test that points on the other side of the antimeridian are found."""
+        index = GeohashIndex()
+        index.add("west", 0.0, 179.95)
+        index.add("east", 0.0, -179.95)
+        assert {key for _, key in index.within_radius(0.0, 179.99, 20)} == {"west", "east"}
+
+    @pytest.mark.unit
+    def test_invalid_query(self, index):
+        """Test that a negative radius raises ValueError."""
+        with pytest.raises(ValueError, match="Radius cannot be negative"):
+            index.within_radius(0, 0, -1)
@@ -0,0 +1,228 @@
+"""Unit tests for the histogram module."""
+import math
+import pickle
+import random
+from array import array
+import pytest
+from mathlib.histogram import Histogram
+from mathlib.statistics import Statistics
+
+
+@pytest.fixture(scope="module")
+def lognormal():
+    """Fixture to provide 50000 log-normally distributed values."""
+    rng = random.Random(5)
+    return [rng.lognormvariate(0, 1) for _ in range(50000)]
+
+
+class TestBins:
+    """Test suite for building bins."""
+
+    @pytest.mark.unit
+    def test_fixed(self):
+        """Test equally wide bins."""
+        histogram = Histogram.fixed(0, 10, 4)
+        assert histogram.edges == (0.0, 2.5, 5.0, 7.5, 10.0)
+        assert len(histogram) == 4
+        assert isinstance(histogram.counts, array) and histogram.counts.typecode == "Q"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("low,high", [(1e-6, 10), (3, 1000), (0.5, 0.75)])
+    def test_log_scale_bounds_relative_width(self, low, high):
+        """Test that log-linear bins cover the range with bounded relative width."""
+        histogram = Histogram.log_scale(low, high, sub_buckets=16)
+        edges = histogram.edges
+        assert edges[0] <= low and edges[1] > low
+        assert edges[-1] >= high and edges[-2] < high
+        assert all((b - a) / a <= 1 / 16 + 1e-12 for a, b in zip(edges, edges[1:]))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("high", [7.9e306, 1.7e308])
+    def test_log_scale_near_largest_float(self, high):
+        """Test that bins reaching the largest floats stay finite."""
+        edges = Histogram.log_scale(1, high, sub_buckets=64).edges
+        assert edges[-1] >= high and math.isfinite(edges[-1])
+        assert all(a < b for a, b in zip(edges, edges[1:]))
+
+    @pytest.mark.unit
+    def test_quantile_bins_are_balanced(self, lognormal):
+        """Test that quantile bins hold about equally many values."""
+        histogram = Histogram.quantile(lognormal, 20)
+        assert histogram.total == 50000
+        assert (histogram.underflow, histogram.overflow) == (0, 0)
+        assert all(abs(count - 2500) <= 2 for count in histogram.counts)
+
+    @pytest.mark.unit
+    def test_quantile_merges_repeated_values(self):
+        """Test that repeated values leave fewer bins."""
+        histogram = Histogram.quantile([1] * 90 + list(range(2, 12)), 10)
+        assert len(histogram) < 10
+        assert histogram.total == 100
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,message", [
+        (lambda: Histogram([1]), "At least two bin edges are required"),
+        (lambda: Histogram([1, 1, 2]), "Bin edges must be finite and strictly increasing"),
+        (lambda: Histogram([0, math.inf]), "Bin edges must be finite and strictly increasing"),
+        (lambda: Histogram.fixed(0, 1, 0), "Number of bins must be positive"),
+        (lambda: Histogram.fixed(1, 1, 5), "Low must be less than high"),
+        (lambda: Histogram.log_scale(0, 1), "Log-scale bins need 0 < low < high"),
+        (lambda: Histogram.log_scale(1, 2, 0), "Number of sub-buckets must be positive"),
+        (lambda: Histogram.quantile([3, 3, 3], 4), "Quantile bins need at least two distinct values"),
+        (lambda: Histogram.quantile([1, math.nan, 2], 4), "Histogram values cannot be NaN"),
+    ])
+    def test_invalid_bins(self, call, message):
+        """Test bin validation."""
+        with pytest.raises(ValueError, match=message):
+            call()
+
+
+class TestCounting:
+    """Test suite for adding values."""
+
+    @pytest.mark.unit
+    def test_edges_underflow_overflow(self):
+        """Test half-open bins, the closed last bin and out-of-range values."""
+        histogram = Histogram.fixed(0, 1, 2)
+        histogram.extend([-1, 0, 0.5, 0.75, 1, 1.5])
+        assert histogram.bins() == [(0.0, 0.5, 1), (0.5, 1.0, 3)]
+        assert (histogram.underflow, histogram.overflow, histogram.total) == (1, 1, 6)
+        assert (histogram.min, histogram.max) == (-1, 1.5)
+
+    @pytest.mark.unit
+    def test_add_matches_extend(self, lognormal):
+        """Test that single values and batches give the same counts."""
+        batch = Histogram.log_scale(0.1, 10)
+        batch.extend(iter(lognormal))
+        single = Histogram.log_scale(0.1, 10)
+        for value in lognormal:
+            single.add(value)
+        assert single.counts == batch.counts
+        assert (single.underflow, single.overflow) == (batch.underflow, batch.overflow)
+        assert (single.min, single.max) == (batch.min, batch.max)
+
+    @pytest.mark.unit
+    def test_matches_direct_count(self, lognormal):
+        """Test the counts against counting every value by hand."""
+        histogram = Histogram.fixed(0, 8, 32)
+        histogram.extend(lognormal)
+        expected = [sum(1 for v in lognormal if low <= v < high) for low, high, _ in histogram.bins()]
+        assert list(histogram.counts) == expected
+        assert histogram.overflow == sum(1 for v in lognormal if v >= 8)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call", [
+        lambda histogram: histogram.add(math.nan),
+        lambda histogram: histogram.extend([0.5, math.nan, 0.25]),
+        lambda histogram: histogram.extend(array("d", [math.nan, 2.0])),
+    ])
+    def test_nan_is_rejected(self, call):
+        """Test that NaN raises ValueError and leaves the counts unchanged."""
+        histogram = Histogram.fixed(0, 1, 4)
+        histogram.extend([0.1, 0.6])
+        with pytest.raises(ValueError, match="Histogram values cannot be NaN"):
+            call(histogram)
+        assert list(histogram.counts) == [1, 0, 1, 0]
+        assert (histogram.underflow, histogram.overflow, histogram.max) == (0, 0, 0.6)
+
+    @pytest.mark.unit
+    def test_merge(self, lognormal):
+        """Test that merged chunks equal one histogram of everything."""
+        parts = []
+        for start in range(0, 50000, 12000):
+            part = Histogram.fixed(0, 10, 50)
+            part.extend(lognormal[start:start + 12000])
+            parts.append(pickle.loads(pickle.dumps(part)))
+        merged = parts[0]
+        for part in parts[1:]:
+            merged = merged.merge(part)
+        whole = Histogram.fixed(0, 10, 50)
+        whole.extend(lognormal)
+        assert merged.counts == whole.counts
+        assert (merged.overflow, merged.min, merged.max) == (whole.overflow, whole.min, whole.max)
+        assert parts[0].total == 12000
+
+    @pytest.mark.unit
+    def test_merge_different_bins(self):
+        """Test that histograms with different edges cannot be merged."""
+        with pytest.raises(ValueError, match="Histograms must have the same bin edges"):
+            Histogram.fixed(0, 1, 2).merge(Histogram.fixed(0, 1, 3))
+
+
+class TestLookups:
+    """Test suite for ECDF and percentile lookups."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("p", [1, 10, 50, 90, 99])
+    def test_log_scale_percentile_error(self, lognormal, p):
+        """Test that log-scale percentiles are within a bin width of the exact ones."""
+        histogram = Histogram.log_scale(0.01, 100)
+        histogram.extend(lognormal)
+        assert histogram.percentile(p) == pytest.approx(Statistics.percentile(lognormal, p), rel=1 / 16)
+
+    @pytest.mark.unit
+    def test_extremes(self, lognormal):
+        """Test that the 0th and 100th percentiles are the smallest and largest values."""
+        histogram = Histogram.fixed(0.5, 5, 9)
+        histogram.extend(lognormal)
+        assert histogram.percentile(0) == min(lognormal)
+        assert histogram.percentile(100) == max(lognormal)
+        assert histogram.cdf(min(lognormal) - 1) == 0.0
+        assert histogram.cdf(max(lognormal)) == 1.0
+
+    @pytest.mark.unit
+    def test_cdf_inverts_percentile(self, lognormal):
+        """Test that cdf(percentile(p)) gives back p, including outside the edges."""
+        histogram = Histogram.fixed(0.5, 5, 45)
+        histogram.extend(lognormal)
+        for p in (2, 10, 25, 50, 75, 98, 99.9):
+            assert histogram.cdf(histogram.percentile(p)) == pytest.approx(p / 100)
+        assert histogram.percentiles([25, 75]) == [histogram.percentile(25), histogram.percentile(75)]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("values", [[0, 0, 0], [0, 1], [20, 20], [15, 30]])
+    def test_values_outside_the_edges(self, values):
+        """Test that lookups stay within the observed range when no value is binned."""
+        histogram = Histogram([2, 9])
+        histogram.extend(values)
+        for p in (0, 10, 50, 90, 100):
+            assert min(values) <= histogram.percentile(p) <= max(values)
+        assert histogram.percentile(0) == min(values)
+        assert histogram.percentile(100) == max(values)
+        assert histogram.cdf(min(values) - 1) == 0.0
+        assert histogram.cdf(max(values)) == 1.0
+        if min(values) < max(values):
+            middle = (min(values) + max(values)) / 2
+            assert histogram.cdf(middle) == pytest.approx(0.5)
+            assert histogram.percentile(50) == pytest.approx(middle)
+
+    @pytest.mark.unit
+    def test_interpolates_within_bin(self):
+        """Test linear interpolation on a small example."""
+        histogram = Histogram.fixed(0, 4, 2)
+        histogram.extend([0.5, 1, 1.5, 2, 3, 3.5])
+        assert histogram.cdf(1.0) == pytest.approx(0.25)
+        assert histogram.cdf(3.0) == pytest.approx(0.75)
+        assert histogram.percentile(50) == pytest.approx(2.0)
+
+    @pytest.mark.unit
+    def test_lookups_follow_updates(self):
+        """Test that cached cumulative counts are refreshed after adding values."""
+        histogram = Histogram.fixed(0, 10, 10)
+        histogram.extend([1, 2, 3])
+        assert histogram.percentile(100) == 3
+        histogram.add(9)
+        assert histogram.percentile(100) == 9
+        assert histogram.cdf(5) == pytest.approx(0.75)
+
+    @pytest.mark.unit
+    def test_empty_and_invalid(self):
+        """Test lookups on an empty histogram and out-of-range percentiles."""
+        histogram = Histogram.fixed(0, 1, 4)
+        with pytest.raises(ValueError, match="Cannot calculate percentile of empty histogram"):
+            histogram.percentile(50)
+        with pytest.raises(ValueError, match="Cannot calculate ECDF of empty histogram"):
+            histogram.cdf(0.5)
+        histogram.add(0.5)
+        with pytest.raises(ValueError, match="Percentile must be between 0 and 100"):
+            histogram.percentile(101)
@@ -0,0 +1,187 @@
+"""Unit tests for the instrumentation module."""
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from mathlib import instrumentation
+from mathlib.calculator import Calculator
+from mathlib.instrumentation import LatencyHistogram, _bucket, _upper_bound
+from mathlib.statistics import Statistics
+
+
+@pytest.fixture
+def recording():
+    """Fixture to enable instrumentation for one test and clean up afterwards."""
+    instrumentation.reset()
+    instrumentation.enable()
+    yield instrumentation
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+class TestLatencyHistogram:
+    """Test suite for the LatencyHistogram class."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("nanoseconds", [0, 1, 15, 16, 17, 31, 32, 1000, 123456789, 2 ** 40 + 5])
+    def test_bucket_bounds(self, nanoseconds):
+        """Test that a bucket's upper bound is within 1/16 above the value."""
+        upper = _upper_bound(_bucket(nanoseconds))
+        assert nanoseconds <= upper <= nanoseconds * (1 + 1 / 16)
+
+    @pytest.mark.unit
+    def test_percentiles(self):
+        """Test percentiles against exact values."""
+        histogram = LatencyHistogram()
+        for micros in range(1, 1001):
+            histogram.record(micros * 1e-6)
+        assert histogram.count == 1000
+        assert histogram.total == pytest.approx(0.5005)
+        assert histogram.percentile(50) == pytest.approx(500e-6, rel=0.07)
+        assert histogram.percentile(99) == pytest.approx(990e-6, rel=0.07)
+        assert histogram.percentile(100) == pytest.approx(1e-3)
+        assert histogram.buckets()[-1][1] == 1000
+
+    @pytest.mark.unit
+    def test_empty_percentile(self):
+        """Test that an empty histogram has no percentiles."""
+        with pytest.raises(ValueError, match="Cannot calculate percentile of empty list"):
+            LatencyHistogram().percentile(50)
+
+
+class TestInstrumentation:
+    """Test suite for enabling, recording and exporting."""
+
+    # Test switching on and off
+    @pytest.mark.unit
+    def test_disabled_leaves_methods_untouched(self):
+        """Test that nothing is wrapped while instrumentation is off."""
+        original = vars(Statistics)["mean"]
+        assert not instrumentation.enabled()
+        instrumentation.enable()
+        instrumentation.enable()
+        assert instrumentation.enabled()
+        assert vars(Statistics)["mean"] is not original
+        instrumentation.disable()
+        assert vars(Statistics)["mean"] is original
+        assert not instrumentation.enabled()
+        instrumentation.reset()
+
+    @pytest.mark.unit
+    def test_environment_variable(self):
+        """Test that MATHLIB_INSTRUMENT=1 enables instrumentation at import."""
+        env = dict(os.environ, MATHLIB_INSTRUMENT="1")
+        code = "import mathlib.instrumentation as i; print(i.enabled())"
+        output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True,
+                                text=True, check=True).stdout
+        assert output.strip() == "True"
+
+    # Test recording
+    @pytest.mark.unit
+    def test_counts_by_size(self, recording):
+        """Test that calls are grouped by operation and size class."""
+        Statistics.percentile(list(range(10)), 90)
+        Statistics.percentile(list(range(600)), 90)
+        Statistics.percentile(list(range(1000)), 50)
+        Calculator.add(1, 2)
+        data = recording.snapshot()
+        assert data["Statistics.percentile"]["calls"] == 3
+        assert {size: entry["calls"] for size, entry in data["Statistics.percentile"]["by_size"].items()} == \
+            {"16": 1, "1024": 2}
+        assert data["Calculator.add"]["by_size"]["0"]["calls"] == 1
+        entry = data["Statistics.percentile"]["by_size"]["1024"]
+        assert 0 < entry["p50"] <= entry["max"] <= entry["seconds"]
+
+    @pytest.mark.unit
+    def test_errors_are_counted(self, recording):
+        """Test that a call that raises is recorded as an error and still raises."""
+        with pytest.raises(ValueError):
+            Statistics.mean([])
+        assert recording.snapshot()["Statistics.mean"]["errors"] == 1
+
+    @pytest.mark.unit
+    def test_data_survives_disable(self, recording):
+        """Test that disabling keeps the data and reset() clears it."""
+        Calculator.multiply(2, 3)
+        recording.disable()
+        Calculator.multiply(2, 3)
+        assert recording.snapshot()["Calculator.multiply"]["calls"] == 1
+        recording.reset()
+        assert recording.snapshot() == {}
+
+    @pytest.mark.unit
+    def test_custom_targets(self):
+        """Test instrumenting a chosen class only."""
+        instrumentation.enable([Calculator])
+        try:
+            Calculator.add(1, 1)
+            Statistics.mean([1, 2])
+            assert list(instrumentation.snapshot()) == ["Calculator.add"]
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+
+    @pytest.mark.integration
+    def test_concurrent_calls(self, recording):
+        """Test that counts are exact when many threads call at once."""
+        def work():
+            for _ in range(500):
+                Calculator.add(1, 2)
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert recording.snapshot()["Calculator.add"]["calls"] == 4000
+
+    @pytest.mark.unit
+    def test_memory_mode(self):
+        """Test that memory mode records peaks by size and the sites of copies."""
+        instrumentation.enable(memory=True)
+        try:
+            Statistics.median([float(i) for i in range(3000)])
+            Statistics.standard_deviation([1.0, 2.0, 3.0])
+            data = instrumentation.snapshot()
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+        entry = data["Statistics.median"]["by_size"]["4096"]
+        assert entry["peak_bytes"] >= 8 * 3000
+        assert entry["bytes_per_element"] >= 8
+        if sys.version_info >= (3, 9):
+            assert entry["sites"][0][0].startswith(Statistics.median.__code__.co_filename)
+        assert "peak_bytes" in data["Statistics.standard_deviation"]["by_size"]["4"]
+        # Nested calls are timed, but their memory belongs to the outer call
+        assert data["Statistics.variance"]["calls"] == 1
+        assert "peak_bytes" not in data["Statistics.variance"]["by_size"]["4"]
+
+    # Test exporting
+    @pytest.mark.unit
+    def test_prometheus(self, recording):
+        """Test the Prometheus text format."""
+        for _ in range(3):
+            Statistics.median([3, 1, 2])
+        text = recording.to_prometheus()
+        assert "# TYPE mathlib_operation_seconds histogram" in text
+        assert 'mathlib_operation_seconds_bucket{operation="Statistics.median",size="4",le="+Inf"} 3' in text
+        assert 'mathlib_operation_seconds_count{operation="Statistics.median",size="4"} 3' in text
+        assert 'mathlib_operation_errors_total{operation="Statistics.median"} 0' in text
+        counts = [int(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+                  if line.startswith("mathlib_operation_seconds_bucket")]
+        assert counts == sorted(counts)
+        assert text.endswith("\n")
+        assert "peak_bytes" not in text
+
+    @pytest.mark.unit
+    def test_prometheus_memory(self):
+        """Test that memory mode adds a peak bytes gauge."""
+        instrumentation.enable(memory=True)
+        try:
+            Statistics.mean([1, 2, 3])
+            text = instrumentation.to_prometheus()
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+        assert "# TYPE mathlib_operation_peak_bytes gauge" in text
+        assert 'mathlib_operation_peak_bytes{operation="Statistics.mean",size="4"}' in text
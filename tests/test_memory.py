@@ -0,0 +1,105 @@
+"""Unit tests for the memory module."""
+import cProfile
+import sys
+import tracemalloc
+import pytest
+from mathlib.memory import MemoryUsage, in_trace, trace_memory
+from mathlib.statistics import Statistics
+
+needs_sites = pytest.mark.skipif(sys.version_info < (3, 9),
+                                 reason="Allocation sites need Python 3.9")
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Fixture to provide 20000 distinct floats."""
+    return [float(i) for i in range(20000)]
+
+
+class TestMemory:
+    """Test suite for the trace_memory function."""
+
+    # Test peaks
+    @pytest.mark.unit
+    def test_result_is_returned(self, data):
+        """Test that the function's result comes back with the usage."""
+        result, usage = trace_memory(Statistics.mean, data)
+        assert result == pytest.approx(9999.5)
+        assert isinstance(usage, MemoryUsage)
+
+    @pytest.mark.unit
+    def test_copy_is_measured(self, data):
+        """Test that the sorted copy in median shows up as at least 8 bytes per element."""
+        _, usage = trace_memory(Statistics.median, data, sites=False)
+        assert usage.peak >= 8 * len(data)
+        assert usage.sites == []
+
+    @pytest.mark.unit
+    def test_no_copy(self, data):
+        """Test that mean allocates far less than a copy of its input."""
+        _, usage = trace_memory(Statistics.mean, data)
+        assert usage.peak < len(data)
+
+    @pytest.mark.unit
+    def test_freed_memory_still_counts(self):
+        """Test that memory released before the call returns is part of the peak."""
+        def temporary():
+            block = bytearray(1 << 20)
+            del block
+        _, usage = trace_memory(temporary)
+        assert usage.peak >= 1 << 20
+
+    @pytest.mark.unit
+    def test_kwargs_are_passed(self, data):
+        """Test that keyword arguments reach the function."""
+        result, _ = trace_memory(Statistics.variance, data, sample=False)
+        assert result == pytest.approx(Statistics.variance(data, sample=False))
+
+    # Test sites
+    @pytest.mark.unit
+    @needs_sites
+    def test_sites_point_at_the_copy(self, data):
+        """Test that the largest site is the line of median that sorts."""
+        _, usage = trace_memory(Statistics.median, data)
+        site, size = usage.sites[0]
+        assert site.startswith(Statistics.median.__code__.co_filename)
+        assert size >= 8 * len(data)
+        assert "sorted(numbers)" in open(Statistics.median.__code__.co_filename).readlines()[
+            int(site.rsplit(":", 1)[1]) - 1]
+
+    @pytest.mark.unit
+    def test_existing_profiler_is_kept(self, data):
+        """Test that sites are skipped, not broken, under another profiler."""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            _, usage = trace_memory(Statistics.median, data)
+        finally:
+            profiler.disable()
+        assert usage.peak >= 8 * len(data)
+        assert usage.sites == []
+
+    # Test tracing state
+    @pytest.mark.unit
+    def test_tracing_is_restored(self, data):
+        """Test that tracing stops again unless it was already running."""
+        trace_memory(Statistics.mean, data)
+        assert not tracemalloc.is_tracing()
+        tracemalloc.start()
+        try:
+            _, usage = trace_memory(Statistics.median, data)
+            assert tracemalloc.is_tracing()
+            assert usage.peak >= 8 * len(data)
+        finally:
+            tracemalloc.stop()
+
+    @pytest.mark.unit
+    def test_nested_calls_are_not_measured(self, data):
+        """Test that a traced call inside another one reports nothing."""
+        def outer():
+            assert in_trace()
+            return trace_memory(Statistics.median, data)[1]
+        inner, usage = trace_memory(outer)
+        assert inner == MemoryUsage(0, [])
+        assert usage.peak >= 8 * len(data)
+        assert not in_trace()
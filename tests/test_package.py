@@ -0,0 +1,96 @@
+"""Unit tests for the mathlib package facade and its import cost."""
+import os
+import pathlib
+import subprocess
+import sys
+import pytest
+import mathlib
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# Largest cumulative import time, in microseconds, reported by -X importtime
+IMPORT_BUDGETS = {
+    "mathlib": 25000,
+    "mathlib.cli": 150000,
+}
+
+
+def run_python(*args):
+    """Run a fresh interpreter without the mathlib environment switches and return stderr + stdout."""
+    env = {key: value for key, value in os.environ.items() if not key.startswith("MATHLIB_")}
+    completed = subprocess.run([sys.executable, *args], cwd=ROOT, env=env,
+                               capture_output=True, text=True, check=True)
+    return completed.stderr + completed.stdout
+
+
+def import_time(module):
+    """Return the best of three cumulative import times of a module, in microseconds."""
+    times = []
+    for _ in range(3):
+        for line in run_python("-X", "importtime", "-c", f"import {module}").splitlines():
+            fields = line.split("|")
+            if line.startswith("import time:") and fields[-1].strip() == module:
+                times.append(int(fields[1]))
+    return min(times)
+
+
+def loaded_modules(code):
+    """Return the mathlib, multiprocessing and concurrent modules loaded after running code."""
+    output = run_python("-c", f"{code}\nimport sys\nprint(' '.join(sorted(sys.modules)))")
+    return {name for name in output.split()
+            if name.split(".")[0] in ("mathlib", "multiprocessing", "concurrent")}
+
+
+class TestFacade:
+    """Test suite for the lazily loaded top-level names."""
+
+    @pytest.mark.unit
+    def test_exports_resolve(self):
+        """Test that every exported name is the class from its module."""
+        from mathlib.statistics import Statistics
+        assert mathlib.Statistics is Statistics
+        for name in mathlib.__all__:
+            assert getattr(mathlib, name).__name__ == name
+        assert mathlib.__all__ == sorted(mathlib._EXPORTS)
+
+    @pytest.mark.unit
+    def test_submodules_resolve(self):
+        """Test that submodules can be reached as attributes."""
+        assert mathlib.sampling.Reservoir is mathlib.Reservoir
+
+    @pytest.mark.unit
+    def test_unknown_name(self):
+        """Test that an unknown name raises AttributeError."""
+        with pytest.raises(AttributeError, match="has no attribute 'Nothing'"):
+            mathlib.Nothing
+
+    @pytest.mark.unit
+    def test_dir(self):
+        """Test that dir() lists exports and submodules before they are loaded."""
+        names = dir(mathlib)
+        assert {"Calculator", "ShapeCatalog", "statistics", "__version__"} <= set(names)
+
+    @pytest.mark.integration
+    def test_import_is_lazy(self):
+        """Test that importing the package loads no submodule, and access loads only one."""
+        assert loaded_modules("import mathlib") == {"mathlib"}
+        assert loaded_modules("import mathlib\nmathlib.Calculator") == {"mathlib", "mathlib.calculator"}
+
+    @pytest.mark.integration
+    def test_cli_skips_multiprocessing(self):
+        """Test that the command line tool only loads multiprocessing when workers are used."""
+        assert not any(name.startswith(("multiprocessing", "concurrent"))
+                       for name in loaded_modules("import mathlib.cli"))
+
+
+class TestImportTime:
+    """Test suite for the import time budgets."""
+
+    @pytest.mark.slow
+    @pytest.mark.scaling
+    @pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS))
+    def test_import_budget(self, module):
+        """Test that importing a module stays within its budget."""
+        elapsed = import_time(module)
+        assert elapsed <= IMPORT_BUDGETS[module], \
+            f"import {module} took {elapsed} us, budget is {IMPORT_BUDGETS[module]} us"
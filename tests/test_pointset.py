@@ -0,0 +1,133 @@
+"""Unit tests for the PointSet module."""
+import pytest
+import itertools
+import random
+from array import array
+from mathlib.geometry import Geometry
+from mathlib.pointset import PointSet
+
+
+class TestPointSet:
+    """Test suite for PointSet class."""
+
+    @pytest.fixture
+    def ps(self):
+        """Fixture to provide a PointSet instance."""
+        return PointSet()
+
+    @pytest.fixture
+    def random_coords(self):
+        """Fixture to provide a random flat coordinate buffer."""
+        rng = random.Random(11)
+        return array("d", (rng.uniform(-100, 100) for _ in range(2 * 300)))
+
+    # Test bounding box
+    @pytest.mark.unit
+    def test_bounding_box(self, ps):
+        """Test 2D and 3D bounding boxes."""
+        assert ps.bounding_box([1, 5, -2, 3, 4, -1]) == ((-2, -1), (4, 5))
+        assert ps.bounding_box([1, 2, 3, -1, 0, 9], dims=3) == ((-1, 0, 3), (1, 2, 9))
+
+    @pytest.mark.unit
+    def test_bounding_box_empty(self, ps):
+        """Test that an empty point set raises ValueError."""
+        with pytest.raises(ValueError, match="Cannot calculate bounding box of empty point set"):
+            ps.bounding_box([])
+
+    # Test convex hull
+    @pytest.mark.unit
+    def test_convex_hull_square(self, ps):
+        """Test that interior, edge and duplicate points are excluded."""
+        coords = [0, 0, 2, 0, 2, 2, 0, 2, 1, 1, 1, 0, 2, 2]
+        assert ps.convex_hull(coords) == [0, 1, 2, 3]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("coords,expected", [
+        ([5, 5], [0]),
+        ([0, 0, 1, 1], [0, 1]),
+        ([0, 0, 1, 1, 2, 2], [0, 2]),
+        ([3, 3, 3, 3], [0]),
+    ])
+    def test_convex_hull_degenerate(self, ps, coords, expected):
+        """Test hulls of points, segments and collinear sets."""
+        assert ps.convex_hull(coords) == expected
+
+    @pytest.mark.unit
+    def test_convex_hull_contains_all_points(self, ps, random_coords):
+        """Test that every point lies inside the counter-clockwise hull."""
+        hull = ps.convex_hull(random_coords)
+        vertices = [(random_coords[2 * i], random_coords[2 * i + 1]) for i in hull]
+        for (ax, ay), (bx, by) in zip(vertices, vertices[1:] + vertices[:1]):
+            for px, py in zip(random_coords[0::2], random_coords[1::2]):
+                assert (bx - ax) * (py - ay) - (by - ay) * (px - ax) >= -1e-9
+
+    @pytest.mark.unit
+    def test_convex_hull_empty(self, ps):
+        """Test that an empty point set raises ValueError."""
+        with pytest.raises(ValueError, match="Cannot calculate convex hull of empty point set"):
+            ps.convex_hull([])
+
+    # Test closest pair
+    @pytest.mark.unit
+    def test_closest_pair_matches_brute_force(self, ps, random_coords):
+        """Test divide and conquer against every pair."""
+        n = len(random_coords) // 2
+        expected = min(
+            (Geometry.distance_between_points(random_coords[2 * i], random_coords[2 * i + 1],
+                                              random_coords[2 * j], random_coords[2 * j + 1]), i, j)
+            for i, j in itertools.combinations(range(n), 2)
+        )
+        distance, i, j = ps.closest_pair(random_coords)
+        assert (i, j) == expected[1:]
+        assert distance == pytest.approx(expected[0])
+
+    @pytest.mark.unit
+    def test_closest_pair_duplicates(self, ps):
+        """Test that coincident points have distance zero."""
+        assert ps.closest_pair([0, 0, 5, 5, 9, 9, 5, 5]) == (0.0, 1, 3)
+
+    @pytest.mark.unit
+    def test_closest_pair_too_few_points(self, ps):
+        """Test that a single point raises ValueError."""
+        with pytest.raises(ValueError, match="Closest pair requires at least two points"):
+            ps.closest_pair([1, 1])
+
+    # Test polygons
+    @pytest.mark.unit
+    @pytest.mark.parametrize("coords,expected", [
+        ([0, 0, 4, 0, 4, 3], 6.0),
+        ([0, 0, 4, 0, 4, 3, 0, 3], 12.0),
+        ([0, 0, 0, 3, 4, 3, 4, 0], 12.0),
+        ([0, 0, 2, 0, 2, 2, 1, 1, 0, 2], 3.0),
+    ])
+    def test_polygon_area(self, ps, coords, expected):
+        """Test shoelace area for convex and concave polygons in either orientation."""
+        assert ps.polygon_area(coords) == pytest.approx(expected)
+
+    @pytest.mark.unit
+    def test_polygon_area_signed(self, ps):
+        """Test that clockwise polygons have negative signed area."""
+        assert ps.polygon_area([0, 0, 1, 0, 1, 1, 0, 1], signed=True) == 1.0
+        assert ps.polygon_area([0, 0, 0, 1, 1, 1, 1, 0], signed=True) == -1.0
+
+    @pytest.mark.unit
+    def test_polygon_area_matches_triangle_area(self, ps):
+        """Test agreement with Geometry.triangle_area for a right triangle."""
+        assert ps.polygon_area([0, 0, 6, 0, 0, 4]) == Geometry.triangle_area(6, 4)
+
+    @pytest.mark.unit
+    def test_polygon_perimeter(self, ps):
+        """Test perimeter against Geometry.rectangle_perimeter."""
+        assert ps.polygon_perimeter([0, 0, 4, 0, 4, 3, 0, 3]) == Geometry.rectangle_perimeter(4, 3)
+        assert ps.polygon_perimeter([0, 0, 3, 4]) == 10.0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,message", [
+        (lambda ps: ps.polygon_area([0, 0, 1, 1]), "at least three vertices"),
+        (lambda ps: ps.polygon_perimeter([0, 0]), "at least two vertices"),
+        (lambda ps: ps.convex_hull([0, 0, 1]), "must be a multiple of 2"),
+    ])
+    def test_invalid_input(self, ps, call, message):
+        """Test that malformed input raises ValueError."""
+        with pytest.raises(ValueError, match=message):
+            call(ps)
@@ -0,0 +1,172 @@
+"""Unit tests for the sampling module."""
+import pytest
+import random
+from collections import Counter
+from mathlib.sampling import ApproximateStatistics, Estimate, Reservoir, StratifiedSample
+from mathlib.statistics import Statistics
+
+
+@pytest.fixture(scope="module")
+def population():
+    """Fixture to provide 200000 skewed values."""
+    rng = random.Random(40)
+    return [rng.expovariate(0.1) for _ in range(200000)]
+
+
+class TestReservoir:
+    """Test suite for Reservoir class."""
+
+    @pytest.mark.unit
+    def test_fills_then_stays_full(self):
+        """Test the reservoir size while streaming."""
+        reservoir = Reservoir(10, seed=1)
+        reservoir.extend(range(5))
+        assert reservoir.sample == [0, 1, 2, 3, 4]
+        reservoir.extend(range(5, 1000))
+        reservoir.add(1000)
+        assert len(reservoir) == 10
+        assert reservoir.seen == 1001
+        assert len(set(reservoir.sample)) == 10
+
+    @pytest.mark.unit
+    def test_chunked_equals_whole_stream(self):
+        """Test that feeding items in chunks gives the same sample."""
+        whole = Reservoir(20, seed=3)
+        whole.extend(range(10000))
+        chunked = Reservoir(20, seed=3)
+        for start in range(0, 10000, 37):
+            chunked.extend(range(start, min(start + 37, 10000)))
+        assert chunked.sample == whole.sample
+
+    @pytest.mark.slow
+    def test_uniform_inclusion(self):
+        """Test that every item is kept with probability k / n."""
+        counts = Counter()
+        for seed in range(4000):
+            reservoir = Reservoir(5, seed=seed)
+            reservoir.extend(range(50))
+            counts.update(reservoir.sample)
+        expected = 4000 * 5 / 50
+        assert all(abs(counts[i] - expected) < 0.25 * expected for i in range(50))
+
+    @pytest.mark.unit
+    def test_plugs_into_statistics(self, population):
+        """Test passing the sample to Statistics methods."""
+        reservoir = Reservoir(5000, seed=2)
+        reservoir.extend(population)
+        assert Statistics.mean(reservoir.sample) == pytest.approx(Statistics.mean(population), rel=0.05)
+        assert Statistics.median(reservoir.sample) == pytest.approx(Statistics.median(population), rel=0.1)
+
+    @pytest.mark.unit
+    def test_invalid_size(self):
+        """Test that a non-positive size raises ValueError."""
+        with pytest.raises(ValueError, match="Reservoir size must be positive"):
+            Reservoir(0)
+
+
+class TestStratifiedSample:
+    """Test suite for StratifiedSample class."""
+
+    @pytest.mark.unit
+    def test_weighted_mean(self):
+        """Test that strata are weighted by their population."""
+        stratified = StratifiedSample(100, seed=4)
+        stratified.extend("large", [10.0] * 9000)
+        stratified.extend("small", [1000.0] * 1000)
+        estimate = stratified.mean()
+        assert estimate.value == pytest.approx(0.9 * 10 + 0.1 * 1000)
+        assert estimate.margin == pytest.approx(0)
+        assert estimate.n == 200
+
+    @pytest.mark.unit
+    def test_interval_covers_truth(self, population):
+        """Test the interval on strata with different distributions."""
+        stratified = StratifiedSample(2000, seed=5)
+        for stratum in range(3):
+            stratified.extend(stratum, [v * (stratum + 1) for v in population[stratum::3]])
+        truth = Statistics.mean([v * (i % 3 + 1) for i, v in enumerate(population)])
+        estimate = stratified.mean(0.99)
+        assert estimate.low <= truth <= estimate.high
+
+    @pytest.mark.unit
+    def test_empty(self):
+        """Test that an empty sample raises ValueError."""
+        with pytest.raises(ValueError, match="Cannot calculate mean of empty list"):
+            StratifiedSample(10).mean()
+
+
+class TestApproximateStatistics:
+    """Test suite for ApproximateStatistics class."""
+
+    @pytest.mark.unit
+    def test_mean_interval(self, population):
+        """Test the mean interval against the exact mean."""
+        sample = random.Random(6).sample(population, 4000)
+        estimate = ApproximateStatistics.mean(sample, population=len(population))
+        assert isinstance(estimate, Estimate)
+        assert estimate.value == Statistics.mean(sample)
+        assert estimate.low <= Statistics.mean(population) <= estimate.high
+        assert estimate.margin < 0.5
+
+    @pytest.mark.unit
+    def test_whole_population_has_no_error(self, population):
+        """Test that the finite population correction removes the margin."""
+        assert ApproximateStatistics.mean(population, population=len(population)).margin == 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("p", [10, 50, 90, 99])
+    def test_percentile_interval(self, population, p):
+        """Test distribution-free percentile intervals."""
+        sample = random.Random(p).sample(population, 5000)
+        estimate = ApproximateStatistics.percentile(sample, p, confidence=0.99)
+        assert estimate.value == Statistics.percentile(sample, p)
+        assert estimate.low <= Statistics.percentile(population, p) <= estimate.high
+
+    @pytest.mark.unit
+    def test_small_samples(self):
+        """Test that tiny samples give unbounded intervals."""
+        assert ApproximateStatistics.mean([5]).high == float("inf")
+        assert ApproximateStatistics.median([1, 2, 3]).low == float("-inf")
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("statistic,tolerance", [("mean", 0.5), ("median", 0.5), ("percentile", 2.0)])
+    def test_sample_until_tolerance(self, population, statistic, tolerance):
+        """Test that sampling stops once the margin is small enough."""
+        estimate = ApproximateStatistics.sample_until(population, tolerance, statistic, p=90,
+                                                      batch=500, seed=7)
+        assert estimate.margin <= tolerance
+        assert estimate.n < len(population) // 4
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("statistic", ["mean", "median", "percentile"])
+    def test_sample_until_matches_whole_sample(self, population, statistic):
+        """Test that the per-batch estimate equals estimating from the whole sample."""
+        estimate = ApproximateStatistics.sample_until(population, 1e-9, statistic, p=90,
+                                                      max_samples=5000, batch=300, seed=3)
+        rng = random.Random(3)
+        sample = [population[rng.randrange(len(population))] for _ in range(5000)]
+        if statistic == "mean":
+            assert estimate == pytest.approx(ApproximateStatistics.mean(sample), rel=1e-12)
+        else:
+            assert estimate == ApproximateStatistics.percentile(sample, 90 if statistic == "percentile" else 50)
+
+    @pytest.mark.unit
+    def test_sample_until_max_samples(self, population):
+        """Test that max_samples caps the work even if the tolerance is not met."""
+        estimate = ApproximateStatistics.sample_until(population, 1e-6, max_samples=1200,
+                                                      batch=500, seed=8)
+        assert estimate.n == 1200
+        assert estimate.margin > 1e-6
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,message", [
+        (lambda: ApproximateStatistics.mean([]), "Cannot calculate mean of empty list"),
+        (lambda: ApproximateStatistics.mean([1, 2], confidence=1), "Confidence must be between 0 and 1"),
+        (lambda: ApproximateStatistics.percentile([1, 2], 101), "Percentile must be between 0 and 100"),
+        (lambda: ApproximateStatistics.sample_until([1], 0), "Tolerance and batch must be positive"),
+        (lambda: ApproximateStatistics.sample_until([1], 1, "mode"), "Unknown statistic: mode"),
+    ])
+    def test_invalid_arguments(self, call, message):
+        """Test that invalid arguments raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            call()
@@ -0,0 +1,95 @@
+"""Asymptotic scaling tests for the Statistics and BatchGeometry modules.
+
+Each routine is timed over geometrically growing inputs. The times are
+divided by the declared complexity bound and the growth exponent of what
+remains is fitted; it stays near zero while the bound holds and rises to
+about 1 when, say, an O(n) routine turns O(n^2).
+"""
+import inspect
+import math
+import pytest
+from mathlib.batch_geometry import BatchGeometry
+from mathlib.benchmark import growth_exponent, measure
+from mathlib.statistics import Statistics
+
+SIZES = (2 ** 10, 2 ** 12, 2 ** 14, 2 ** 16)
+
+# Residual exponent tolerated above the bound (timer noise and cache effects)
+TOLERANCE = 0.3
+
+BOUNDS = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log(n),
+}
+
+# All-distinct inputs make every value a mode, which are returned sorted
+STATISTICS = {
+    "mean": ("n", ()),
+    "median": ("n log n", ()),
+    "mode": ("n log n", ()),
+    "variance": ("n", ()),
+    "standard_deviation": ("n", ()),
+    "range_value": ("n", ()),
+    "percentile": ("n log n", (90,)),
+}
+
+GEOMETRY = {name: "n" for name in (
+    "circle_area", "circle_circumference", "rectangle_area", "rectangle_perimeter",
+    "triangle_area", "pythagorean_theorem", "sphere_volume", "sphere_surface_area",
+    "cylinder_volume", "distance_between_points",
+)}
+
+
+def public_methods(cls):
+    """Return the names of the public methods of a class."""
+    return sorted(name for name in vars(cls) if not name.startswith("_"))
+
+
+def excess_exponent(func, bound, sizes=SIZES):
+    """Fit the growth exponent of func(n)'s time divided by the bound."""
+    times = [min(measure(lambda: func(n), repeat=5).samples) / BOUNDS[bound](n)
+             for n in sizes]
+    return growth_exponent(list(sizes), times)
+
+
+class TestDeclarations:
+    """Test suite for the declared complexity bounds, which needs no timing."""
+
+    @pytest.mark.unit
+    def test_every_routine_has_a_bound(self):
+        """Test that a new public routine must declare its complexity."""
+        assert sorted(STATISTICS) == public_methods(Statistics)
+        assert sorted(GEOMETRY) == public_methods(BatchGeometry)
+
+
+@pytest.mark.scaling
+class TestScaling:
+    """Test suite for the complexity bounds of batch routines."""
+
+    # Test the harness
+    @pytest.mark.unit
+    def test_harness_detects_quadratic_growth(self):
+        """Test that an O(n^2) routine fails a linear bound."""
+        def quadratic(n):
+            return sum(i < j for i in range(n) for j in range(n))
+        assert excess_exponent(quadratic, "n", sizes=(50, 100, 200, 400)) > 0.7
+
+    # Test routines
+    @pytest.mark.slow
+    @pytest.mark.parametrize("name", sorted(STATISTICS))
+    def test_statistics_scaling(self, name, large_data):
+        """Test that a Statistics method grows no faster than its bound."""
+        bound, args = STATISTICS[name]
+        method = getattr(Statistics, name)
+        assert excess_exponent(lambda n: method(large_data(n), *args), bound) < TOLERANCE
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("name", sorted(GEOMETRY))
+    def test_batch_geometry_scaling(self, name, large_data):
+        """Test that a BatchGeometry method grows no faster than its bound."""
+        method = getattr(BatchGeometry, name)
+        arity = len(inspect.signature(method).parameters) - 1
+
+        def call(n):
+            return method(*(large_data(n, seed) for seed in range(arity)))
+        assert excess_exponent(call, GEOMETRY[name]) < TOLERANCE
@@ -0,0 +1,156 @@
+"""Unit tests for the server module."""
+import pytest
+import asyncio
+import json
+import math
+import os
+import signal
+import sys
+from mathlib.geometry import Geometry
+from mathlib.server import (INVALID_PARAMS, METHOD_NOT_FOUND, OPERATION_ERROR, ComputeClient,
+                            ComputeServer, RPCError, measure_latency)
+
+
+def serve(test, **options):
+    """Run an async test body against a started server and connected client."""
+    async def main():
+        async with ComputeServer(**options) as server:
+            await server.start()
+            host, port = server.address[:2]
+            async with await ComputeClient.connect(host, port) as client:
+                return await test(server, client)
+    return asyncio.run(main())
+
+
+class TestComputeServer:
+    """Test suite for ComputeServer and ComputeClient classes."""
+
+    # Test calls
+    @pytest.mark.unit
+    @pytest.mark.parametrize("method,params,expected", [
+        ("Calculator.add", [2, 3], 5),
+        ("Calculator.factorial", [25], math.factorial(25)),
+        ("Geometry.circle_area", [2], Geometry.circle_area(2)),
+        ("Statistics.median", [[5, 1, 3, 2]], 2.5),
+        ("Statistics.mode", [[1, 2, 2]], [2]),
+    ])
+    def test_call(self, method, params, expected):
+        """Test calling operations from each class."""
+        async def test(server, client):
+            return await client.call(method, *params)
+        assert serve(test, workers=0) == expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("method,params,code,message", [
+        ("Calculator.divide", [1, 0], OPERATION_ERROR, "Cannot divide by zero"),
+        ("Geometry.circle_area", [1, 2], INVALID_PARAMS, "positional argument"),
+        ("Calculator.launch", [], METHOD_NOT_FOUND, "Method not found: Calculator.launch"),
+    ])
+    def test_call_errors(self, method, params, code, message):
+        """Test that failures come back as JSON-RPC errors."""
+        async def test(server, client):
+            with pytest.raises(RPCError, match=message) as info:
+                await client.call(method, *params)
+            return info.value.code
+        assert serve(test, workers=0) == code
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not hasattr(sys, "get_int_max_str_digits"),
+                        reason="Integer string conversion is unlimited")
+    def test_unencodable_result(self):
+        """Test that a result JSON cannot encode comes back as an error."""
+        async def test(server, client):
+            with pytest.raises(RPCError, match="Cannot encode result") as info:
+                await client.call("Calculator.factorial", 2000)
+            return info.value.code, await client.call("Calculator.add", 1, 2)
+        assert serve(test, workers=0) == (OPERATION_ERROR, 3)
+
+    # Test batching
+    @pytest.mark.unit
+    def test_concurrent_calls_are_batched(self):
+        """Test that concurrent requests share batches and keep their ids."""
+        async def test(server, client):
+            results = await asyncio.gather(*(client.call("Calculator.multiply", i, 3)
+                                             for i in range(200)))
+            return results, server.batches, server.calls
+        results, batches, calls = serve(test, workers=0, max_batch=50, max_delay=0.05)
+        assert results == [3 * i for i in range(200)]
+        assert calls == 200
+        assert batches <= 8
+
+    @pytest.mark.integration
+    def test_process_pool(self):
+        """Test batches running on worker processes."""
+        async def test(server, client):
+            latencies = await measure_latency(
+                client, [("Geometry.sphere_volume", [r]) for r in range(100)], concurrency=16)
+            return len(latencies), await client.call("Statistics.variance", [1, 2, 3, 4])
+        count, variance = serve(test, workers=2)
+        assert count == 100
+        assert variance == pytest.approx(5 / 3)
+
+    @pytest.mark.integration
+    @pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="Needs SIGKILL")
+    def test_pool_replaced_after_worker_dies(self):
+        """Test that calls run again after a worker process is killed."""
+        async def test(server, client):
+            assert await client.call("Calculator.add", 1, 2) == 3
+            broken = server._pool
+            os.kill(next(iter(broken._processes)), signal.SIGKILL)
+            # The pool notices the death in the background; until then calls
+            # may still succeed, and the batches it fails report an error
+            for _ in range(100):
+                try:
+                    result = await client.call("Calculator.add", 3, 4)
+                except RPCError as error:
+                    assert error.code == OPERATION_ERROR and "Batch failed" in str(error)
+                    continue
+                if server._pool is not broken:
+                    return result
+                await asyncio.sleep(0.05)
+        assert serve(test, workers=2) == 7
+
+    @pytest.mark.unit
+    def test_backpressure(self):
+        """Test that a tiny queue still completes every pipelined request."""
+        async def test(server, client):
+            return await asyncio.gather(*(client.call("Calculator.power", 2, i) for i in range(100)))
+        assert serve(test, workers=0, max_batch=2, max_pending=1) == [2 ** i for i in range(100)]
+
+    # Test protocol
+    @pytest.mark.unit
+    def test_raw_protocol(self):
+        """Test parse errors, invalid requests and notifications over a raw socket."""
+        async def main():
+            async with ComputeServer(workers=0) as server:
+                await server.start()
+                reader, writer = await asyncio.open_connection(*server.address[:2])
+                writer.write(b'not json\n[1, 2]\n{"jsonrpc": "2.0", "method": "Calculator.add", '
+                             b'"params": [1, 1]}\n{"jsonrpc": "2.0", "id": "x", '
+                             b'"method": "Calculator.subtract", "params": {"a": 5, "b": 2}}\n')
+                await writer.drain()
+                responses = [json.loads(await reader.readline()) for _ in range(3)]
+                writer.close()
+                return responses
+        parse, invalid, result = asyncio.run(main())
+        assert parse["error"]["code"] == -32700
+        assert invalid["error"]["code"] == -32600
+        assert result == {"jsonrpc": "2.0", "id": "x", "result": 3}
+
+    @pytest.mark.unit
+    def test_unix_socket(self, tmp_path):
+        """Test serving on a Unix domain socket."""
+        path = str(tmp_path / "mathlib.sock")
+
+        async def main():
+            async with ComputeServer(workers=0) as server:
+                await server.start(path=path)
+                async with await ComputeClient.connect(path=path) as client:
+                    return await client.call("Calculator.square_root", 16)
+        assert asyncio.run(main()) == 4.0
+
+    @pytest.mark.unit
+    def test_invalid_limits(self):
+        """Test that invalid limits raise ValueError."""
+        with pytest.raises(ValueError, match="Server limits must be positive"):
+            ComputeServer(max_batch=0)
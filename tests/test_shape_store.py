@@ -0,0 +1,164 @@
+"""Unit tests for the ShapeStore module."""
+import pytest
+import math
+from array import array
+from mathlib.batch_geometry import BatchValidationError
+from mathlib.geometry import Geometry
+from mathlib.shape_store import ShapeStore, ShapeView
+
+
+class TestShapeStore:
+    """Test suite for ShapeStore class."""
+
+    @pytest.fixture
+    def store(self):
+        """Fixture to provide a store with a few shapes of every kind."""
+        store = ShapeStore()
+        store.extend("circle", [1, 2, 3])
+        store.extend("rectangle", [2, 5], [3, 5])
+        store.add("triangle", 4, 3)
+        store.add("sphere", 2)
+        store.extend("cylinder", array("d", [1, 2]), array("d", [10, 1]))
+        return store
+
+    # Test adding shapes
+    @pytest.mark.unit
+    def test_counts(self, store):
+        """Test counting shapes overall and per kind."""
+        assert len(store) == 9
+        assert store.count() == 9
+        assert store.count("circle") == 3
+        assert store.count("sphere") == 1
+
+    @pytest.mark.unit
+    def test_add_returns_index(self, store):
+        """Test that add and extend return indices within the kind."""
+        assert store.add("circle", 4) == 3
+        assert store.extend("circle", [5, 6]) == range(4, 6)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("kind,dimensions,message", [
+        ("circle", (-1,), "Radius cannot be negative"),
+        ("rectangle", (1, -1), "Length and width cannot be negative"),
+        ("cylinder", (-1, 1), "Radius and height cannot be negative"),
+        ("hexagon", (1,), "Unknown shape kind: hexagon"),
+        ("rectangle", (1,), r"A rectangle requires 2 dimension\(s\)"),
+    ])
+    def test_add_invalid(self, store, kind, dimensions, message):
+        """Test that invalid shapes are rejected."""
+        with pytest.raises(ValueError, match=message):
+            store.add(kind, *dimensions)
+
+    @pytest.mark.unit
+    def test_extend_reports_indices(self, store):
+        """Test that bulk inserts report every negative index and add nothing."""
+        with pytest.raises(BatchValidationError) as exc_info:
+            store.extend("triangle", [1, -1, 2], [1, 1, -3])
+        assert exc_info.value.indices == [1, 2]
+        assert store.count("triangle") == 1
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,error", [
+        (lambda store: store.add("rectangle", 1.0, 10 ** 400), OverflowError),
+        (lambda store: store.extend("rectangle", [1.0], [10 ** 400]), OverflowError),
+        (lambda store: store.extend("rectangle", [1.0, 2.0], ["3", 4.0]), TypeError),
+    ])
+    def test_failed_insert_keeps_columns_aligned(self, store, call, error):
+        """Test that a dimension that cannot be stored leaves every column unchanged."""
+        with pytest.raises(error):
+            call(store)
+        assert [len(store.column("rectangle", name)) for name in ("length", "width")] == [2, 2]
+        assert list(store.metric("rectangle", "area")) == [6.0, 25.0]
+
+    # Test metrics
+    @pytest.mark.unit
+    @pytest.mark.parametrize("kind,metric,method", [
+        ("circle", "area", Geometry.circle_area),
+        ("circle", "perimeter", Geometry.circle_circumference),
+        ("rectangle", "area", Geometry.rectangle_area),
+        ("rectangle", "perimeter", Geometry.rectangle_perimeter),
+        ("triangle", "area", Geometry.triangle_area),
+        ("sphere", "area", Geometry.sphere_surface_area),
+        ("sphere", "volume", Geometry.sphere_volume),
+        ("cylinder", "volume", Geometry.cylinder_volume),
+    ])
+    def test_metric_matches_geometry(self, store, kind, metric, method):
+        """Test per-shape metrics against the Geometry formulas."""
+        expected = [method(*view.dimensions()) for view in store.views(kind)]
+        assert list(store.metric(kind, metric)) == pytest.approx(expected)
+
+    @pytest.mark.unit
+    def test_undefined_metric(self, store):
+        """Test that requesting a metric a kind does not have raises ValueError."""
+        with pytest.raises(ValueError, match="A triangle has no perimeter"):
+            store.metric("triangle", "perimeter")
+        with pytest.raises(ValueError, match="Unknown metric: mass"):
+            store.total("mass")
+
+    @pytest.mark.unit
+    def test_totals(self, store):
+        """Test totals for a single kind and across kinds."""
+        assert store.total("area", "circle") == pytest.approx(14 * math.pi)
+        expected_volume = Geometry.sphere_volume(2) + 10 * math.pi + 4 * math.pi
+        assert store.total("volume") == pytest.approx(expected_volume)
+        expected_area = 14 * math.pi + 31 + 6 + Geometry.sphere_surface_area(2)
+        assert store.total("area") == pytest.approx(expected_area)
+
+    # Test filtering and aggregation
+    @pytest.mark.unit
+    def test_select(self, store):
+        """Test selecting shapes by a metric range."""
+        assert list(store.select("circle", "area", low=4, high=20)) == [1]
+        assert list(store.select("rectangle", "area", high=6)) == [0]
+        assert list(store.select("circle", "area", low=100)) == []
+
+    @pytest.mark.unit
+    def test_aggregate(self, store):
+        """Test summarising a metric over all or selected shapes."""
+        summary = store.aggregate("rectangle", "area")
+        assert summary == {"count": 2, "total": 31.0, "mean": 15.5, "min": 6.0, "max": 25.0}
+        selected = store.aggregate("circle", "area", store.select("circle", "area", low=4))
+        assert selected["count"] == 2
+        assert selected["total"] == pytest.approx(13 * math.pi)
+
+    @pytest.mark.unit
+    def test_aggregate_empty(self, store):
+        """Test that aggregating nothing raises ValueError."""
+        with pytest.raises(ValueError, match="Cannot aggregate an empty selection"):
+            store.aggregate("circle", "area", [])
+
+    # Test views and columns
+    @pytest.mark.unit
+    def test_view(self, store):
+        """Test reading dimensions and metrics through a view."""
+        view = store.view("cylinder", 1)
+        assert isinstance(view, ShapeView)
+        assert (view.radius, view.height) == (2.0, 1.0)
+        assert view.volume == pytest.approx(4 * math.pi)
+        assert repr(view) == "ShapeView(cylinder, radius=2.0, height=1.0)"
+        assert store.view("circle", -1) == store.view("circle", 2)
+        with pytest.raises(AttributeError):
+            view.perimeter
+        with pytest.raises(AttributeError):
+            view.extra = 1
+
+    @pytest.mark.unit
+    def test_view_out_of_range(self, store):
+        """Test that views of missing shapes raise IndexError."""
+        with pytest.raises(IndexError, match="Shape index out of range"):
+            store.view("sphere", 1)
+
+    @pytest.mark.unit
+    def test_column_is_read_only(self, store):
+        """Test that dimension columns are exposed without copying or mutation."""
+        radii = store.column("circle", "radius")
+        assert radii.tolist() == [1.0, 2.0, 3.0]
+        with pytest.raises(TypeError):
+            radii[0] = 5.0
+        with pytest.raises(ValueError, match="A circle has no dimension width"):
+            store.column("circle", "width")
+
+    @pytest.mark.unit
+    def test_nbytes(self, store):
+        """Test that storage costs eight bytes per dimension per shape."""
+        assert store.nbytes() == 8 * (3 + 2 * 2 + 2 + 1 + 2 * 2)
@@ -0,0 +1,156 @@
+"""Unit tests for the shared statistics module."""
+import pytest
+import math
+import random
+from array import array
+from multiprocessing import shared_memory
+from mathlib import shared_statistics
+from mathlib.shared_statistics import SharedDataset
+from mathlib.statistics import Statistics
+
+
+@pytest.fixture(scope="module")
+def numbers():
+    """Fixture to provide random values with repeats and outliers."""
+    rng = random.Random(36)
+    values = [rng.gauss(50, 10) for _ in range(5000)]
+    values += [42.0] * 300 + [1e6, -1e6]
+    rng.shuffle(values)
+    return values
+
+
+@pytest.fixture(scope="module")
+def dataset(numbers):
+    """Fixture to provide the values shared with three workers (one pool per module)."""
+    with SharedDataset(numbers, workers=3) as dataset:
+        yield dataset
+
+
+class TestSharedDataset:
+    """Test suite for SharedDataset class."""
+
+    # Test reductions
+    @pytest.mark.integration
+    def test_moments_match_statistics(self, dataset, numbers):
+        """Test that merged partial moments equal the serial results."""
+        assert len(dataset) == len(numbers)
+        assert dataset.mean() == pytest.approx(Statistics.mean(numbers))
+        assert dataset.variance() == pytest.approx(Statistics.variance(numbers))
+        assert dataset.standard_deviation(sample=False) == pytest.approx(
+            Statistics.standard_deviation(numbers, sample=False))
+        assert dataset.range_value() == Statistics.range_value(numbers)
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("p", [0, 1, 25, 50, 73.3, 99, 100])
+    def test_percentile_matches_statistics(self, dataset, numbers, monkeypatch, p):
+        """Test exact selection, forcing several refinement rounds."""
+        monkeypatch.setattr(shared_statistics, "_SELECT_LIMIT", 16)
+        assert dataset.percentile(p) == Statistics.percentile(numbers, p)
+
+    @pytest.mark.integration
+    def test_median(self, dataset, numbers):
+        """Test the median against the serial implementation."""
+        assert dataset.median() == pytest.approx(Statistics.median(numbers))
+
+    @pytest.mark.integration
+    def test_histogram(self, dataset, numbers):
+        """Test histogram counts and edges."""
+        counts, edges = dataset.histogram(4, low=0, high=100)
+        assert edges == [0, 25, 50, 75, 100]
+        for i, count in enumerate(counts):
+            upper = edges[i + 1]
+            expected = sum(1 for x in numbers if edges[i] <= x < upper or (i == 3 and x == upper))
+            assert count == expected
+        assert sum(dataset.histogram(7)[0]) == len(numbers)
+
+    @pytest.mark.integration
+    def test_constant_and_single_values(self):
+        """Test datasets without spread."""
+        with SharedDataset(array("d", [3.5] * 10), workers=2) as dataset:
+            assert dataset.median() == 3.5
+            assert dataset.variance() == 0
+        with SharedDataset([7], workers=2) as dataset:
+            assert dataset.percentile(30) == 7
+            with pytest.raises(ValueError, match="only one data point"):
+                dataset.variance()
+
+    @pytest.mark.integration
+    def test_infinities(self, monkeypatch):
+        """Test that infinities are ordered like Statistics does and kept out of the bins."""
+        monkeypatch.setattr(shared_statistics, "_SELECT_LIMIT", 2)
+        values = [1, 2, math.inf, 3, -math.inf, 5, math.inf]
+        with SharedDataset(values, workers=2) as dataset:
+            assert dataset.median() == Statistics.median(values) == 3
+            for p in (0, 10, 30, 70, 90, 100):
+                assert dataset.percentile(p) == Statistics.percentile(values, p)
+            counts, edges = dataset.histogram(2)
+            assert (counts, edges) == ([2, 2], [1, 3, 5])
+            with pytest.raises(ValueError, match="Histogram bounds must be finite"):
+                dataset.histogram(2, low=0, high=math.inf)
+        with SharedDataset([math.inf, math.inf], workers=2) as dataset:
+            assert dataset.median() == math.inf
+            with pytest.raises(ValueError, match="Dataset has no finite values"):
+                dataset.histogram(2)
+
+    @pytest.mark.integration
+    def test_nan_is_rejected(self):
+        """Test that order statistics and histograms reject NaN instead of crashing."""
+        with SharedDataset([1, math.nan, 3], workers=2) as dataset:
+            for call in (dataset.median, lambda: dataset.percentile(90),
+                         lambda: dataset.histogram(2, low=0, high=4)):
+                with pytest.raises(ValueError, match="Dataset contains NaN values"):
+                    call()
+
+    # Test errors and cleanup
+    @pytest.mark.unit
+    @pytest.mark.parametrize("numbers,workers,message", [
+        ([], 2, "Cannot share an empty dataset"),
+        ([1, 2], 0, "Number of workers must be positive"),
+    ])
+    def test_invalid_dataset(self, numbers, workers, message):
+        """Test that invalid construction arguments raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            SharedDataset(numbers, workers=workers)
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("call,message", [
+        (lambda d: d.percentile(101), "Percentile must be between 0 and 100"),
+        (lambda d: d.histogram(0), "Number of bins must be positive"),
+        (lambda d: d.histogram(3, low=5, high=1), "Lower bound cannot exceed upper bound"),
+    ])
+    def test_invalid_arguments(self, dataset, call, message):
+        """Test that invalid arguments raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            call(dataset)
+
+    @pytest.mark.integration
+    def test_unlinked_after_error(self):
+        """Test that the block is freed when the with block raises."""
+        with pytest.raises(RuntimeError):
+            with SharedDataset([1, 2, 3], workers=2) as dataset:
+                name = dataset.name
+                dataset.mean()
+                raise RuntimeError("boom")
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+        with pytest.raises(ValueError, match="Dataset is closed"):
+            dataset.histogram()
+        dataset.close()
+
+    @pytest.mark.unit
+    def test_unlinked_after_bad_input(self, monkeypatch):
+        """Test that the block is freed when copying the data fails."""
+        created = []
+        original = shared_memory.SharedMemory
+
+        def recording(*args, **kwargs):
+            block = original(*args, **kwargs)
+            created.append(block.name)
+            return block
+
+        monkeypatch.setattr(shared_memory, "SharedMemory", recording)
+        with pytest.raises(TypeError):
+            SharedDataset([1, "two", 3], workers=1)
+        monkeypatch.undo()
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=created[0])
@@ -0,0 +1,224 @@
+"""Unit tests for the spatial index module."""
+import pytest
+import math
+import random
+from mathlib.geometry import Geometry
+from mathlib.spatial import KDTree, SpatialHashGrid
+
+
+def brute_force(coords, dims, query):
+    """Return (distance, index) for every point, closest first."""
+    points = [coords[i:i + dims] for i in range(0, len(coords), dims)]
+    return sorted((math.dist(query, p), i) for i, p in enumerate(points))
+
+
+class TestKDTree:
+    """Test suite for KDTree class."""
+
+    @pytest.fixture(params=[2, 3], ids=["2d", "3d"])
+    def points(self, request):
+        """Fixture to provide a random flat coordinate buffer and its dimension."""
+        rng = random.Random(request.param)
+        dims = request.param
+        return [rng.uniform(-50, 50) for _ in range(500 * dims)], dims
+
+    @pytest.fixture
+    def tree(self, points):
+        """Fixture to provide a tree built over the random points."""
+        return KDTree(*points)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("k", [1, 5, 40])
+    def test_nearest_matches_brute_force(self, tree, points, k):
+        """Test k-nearest-neighbour results against a linear scan."""
+        coords, dims = points
+        rng = random.Random(k)
+        for _ in range(20):
+            query = [rng.uniform(-60, 60) for _ in range(dims)]
+            assert tree.nearest(query, k) == brute_force(coords, dims, query)[:k]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("radius", [0, 5, 20])
+    def test_within_radius_matches_brute_force(self, tree, points, radius):
+        """Test radius queries against a linear scan."""
+        coords, dims = points
+        rng = random.Random(radius)
+        for _ in range(20):
+            query = [rng.uniform(-50, 50) for _ in range(dims)]
+            expected = [(d, i) for d, i in brute_force(coords, dims, query) if d <= radius]
+            assert tree.within_radius(query, radius) == expected
+
+    @pytest.mark.unit
+    def test_within_box_matches_brute_force(self, tree, points):
+        """Test bounding-box queries against a linear scan."""
+        coords, dims = points
+        lower, upper = [-10] * dims, [25] * dims
+        expected = [i for i in range(len(coords) // dims)
+                    if all(lo <= c <= hi for lo, c, hi
+                           in zip(lower, coords[i * dims:(i + 1) * dims], upper))]
+        assert tree.within_box(lower, upper) == expected
+
+    @pytest.mark.unit
+    def test_batched_queries(self, tree, points):
+        """Test that batched queries equal one query per point."""
+        coords, dims = points
+        queries = coords[:10 * dims]
+        singles = [tree.nearest(queries[i:i + dims], 3) for i in range(0, len(queries), dims)]
+        assert tree.nearest_many(queries, 3) == singles
+        assert tree.within_radius_many(queries, 4)[0] == tree.within_radius(queries[:dims], 4)
+
+    @pytest.mark.unit
+    def test_metric_matches_geometry(self):
+        """Test that distances agree with Geometry.distance_between_points."""
+        tree = KDTree([0, 0, 3, 4, -1, 7])
+        (distance, index), = tree.nearest([1, 1])
+        assert index == 0
+        assert distance == pytest.approx(Geometry.distance_between_points(1, 1, 0, 0))
+
+    @pytest.mark.unit
+    def test_duplicate_points(self):
+        """Test that coincident points are all returned."""
+        tree = KDTree.from_points([(1, 1)] * 40 + [(5, 5)])
+        assert len(tree.within_radius((1, 1), 0)) == 40
+        assert [i for _, i in tree.nearest((5, 5), 2)][0] == 40
+
+    @pytest.mark.unit
+    def test_k_larger_than_tree(self):
+        """Test that asking for more neighbours than points returns all points."""
+        tree = KDTree.from_points([(0, 0), (1, 0)])
+        assert tree.nearest((0, 0), 10) == [(0.0, 0), (1.0, 1)]
+
+    @pytest.mark.unit
+    def test_empty_tree(self):
+        """Test that queries on an empty tree return nothing."""
+        tree = KDTree([], dims=3)
+        assert len(tree) == 0
+        assert tree.nearest((0, 0, 0)) == []
+        assert tree.within_box((0, 0, 0), (1, 1, 1)) == []
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call,message", [
+        (lambda t: t.nearest((0, 0), 0), "k must be positive"),
+        (lambda t: t.within_radius((0, 0), -1), "Radius cannot be negative"),
+        (lambda t: t.nearest((0, 0, 0)), "Query point must have 2 coordinates"),
+        (lambda t: t.nearest_many([0, 0, 0]), "must be a multiple of 2"),
+    ])
+    def test_invalid_queries(self, call, message):
+        """Test that malformed queries raise ValueError."""
+        tree = KDTree([0, 0, 1, 1])
+        with pytest.raises(ValueError, match=message):
+            call(tree)
+
+    @pytest.mark.unit
+    def test_invalid_construction(self):
+        """Test that malformed coordinate buffers raise ValueError."""
+        with pytest.raises(ValueError, match="must be a multiple of 3"):
+            KDTree([0, 0, 0, 1], dims=3)
+        with pytest.raises(ValueError, match="at least one dimension"):
+            KDTree([], dims=0)
+        with pytest.raises(ValueError, match="same number of dimensions"):
+            KDTree.from_points([(0, 0), (1, 1, 1)])
+
+
+class TestSpatialHashGrid:
+    """Test suite for SpatialHashGrid class."""
+
+    @pytest.fixture
+    def grid(self):
+        """Fixture to provide a grid with random 2D points."""
+        rng = random.Random(3)
+        grid = SpatialHashGrid(cell_size=5)
+        for key in range(300):
+            grid.insert(key, (rng.uniform(0, 100), rng.uniform(0, 100)))
+        return grid
+
+    @staticmethod
+    def brute_force_pairs(grid, radius):
+        """Return every pair within radius using Geometry.distance_between_points."""
+        keys = sorted(grid._points)
+        pairs = set()
+        for i, a in enumerate(keys):
+            for b in keys[i + 1:]:
+                distance = Geometry.distance_between_points(*grid.position(a), *grid.position(b))
+                if distance <= radius:
+                    pairs.add((a, b))
+        return pairs
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("radius", [0.5, 5, 8, 30])
+    def test_proximity_join_matches_brute_force(self, grid, radius):
+        """Test that the join finds exactly the pairs within radius, once each."""
+        found = [(min(a, b), max(a, b)) for a, b, _ in grid.proximity_join(radius, auto_tune=False)]
+        assert len(found) == len(set(found))
+        assert set(found) == self.brute_force_pairs(grid, radius)
+
+    @pytest.mark.unit
+    def test_proximity_join_distances(self, grid):
+        """Test that yielded distances agree with Geometry.distance_between_points."""
+        for a, b, distance in grid.proximity_join(5):
+            expected = Geometry.distance_between_points(*grid.position(a), *grid.position(b))
+            assert distance == pytest.approx(expected)
+
+    @pytest.mark.unit
+    def test_auto_tune(self, grid):
+        """Test that the cell size follows the query radius."""
+        expected = self.brute_force_pairs(grid, 12)
+        found = {(min(a, b), max(a, b)) for a, b, _ in grid.proximity_join(12)}
+        assert grid.cell_size == 12
+        assert found == expected
+        list(grid.proximity_join(8))
+        assert grid.cell_size == 12
+        list(grid.proximity_join(3))
+        assert grid.cell_size == 3
+
+    @pytest.mark.unit
+    def test_move_and_remove(self):
+        """Test that moved and removed points are reflected in queries."""
+        grid = SpatialHashGrid(cell_size=1)
+        grid.insert("a", (0, 0))
+        grid.insert("b", (10, 10))
+        assert list(grid.proximity_join(1, auto_tune=False)) == []
+        grid.move("b", (0.5, 0))
+        assert [(a, b) for a, b, _ in grid.proximity_join(1)] in ([("a", "b")], [("b", "a")])
+        grid.move("b", (0.6, 0))
+        assert grid.position("b") == (0.6, 0)
+        grid.remove("a")
+        assert "a" not in grid
+        assert len(grid) == 1
+        assert grid._cells == {(0, 0): {"b": (0.6, 0)}}
+
+    @pytest.mark.unit
+    def test_within_radius(self, grid):
+        """Test radius queries against a linear scan."""
+        expected = sorted(
+            (math.dist((50, 50), grid.position(key)), key) for key in grid._points
+            if math.dist((50, 50), grid.position(key)) <= 7
+        )
+        assert sorted(grid.within_radius((50, 50), 7)) == expected
+
+    @pytest.mark.unit
+    def test_three_dimensions(self):
+        """Test joining 3D points."""
+        grid = SpatialHashGrid(cell_size=1, dims=3)
+        grid.insert(1, (0, 0, 0))
+        grid.insert(2, (0, 0, 0.9))
+        grid.insert(3, (0, 0, 2))
+        assert [(a, b) for a, b, _ in grid.proximity_join(1)] == [(1, 2)]
+
+    @pytest.mark.unit
+    def test_errors(self):
+        """Test invalid arguments and unknown keys."""
+        with pytest.raises(ValueError, match="Cell size must be positive"):
+            SpatialHashGrid(0)
+        grid = SpatialHashGrid(1)
+        grid.insert("a", (0, 0))
+        with pytest.raises(ValueError, match="Key already present"):
+            grid.insert("a", (1, 1))
+        with pytest.raises(ValueError, match="Point must have 2 coordinates"):
+            grid.insert("b", (1, 1, 1))
+        with pytest.raises(ValueError, match="Radius cannot be negative"):
+            list(grid.proximity_join(-1))
+        with pytest.raises(KeyError):
+            grid.move("missing", (0, 0))
+        with pytest.raises(KeyError):
+            grid.remove("missing")
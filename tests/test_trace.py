@@ -0,0 +1,189 @@
+"""Unit tests for the trace module."""
+import gzip
+import json
+import sys
+import threading
+from array import array
+import pytest
+from mathlib import instrumentation
+from mathlib.calculator import Calculator
+from mathlib.statistics import Statistics
+from mathlib.trace import TraceEvent, TraceRecorder, load_trace, main, replay
+
+
+@pytest.fixture
+def trace_path(tmp_path):
+    """Fixture to record a small workload and return the trace's path."""
+    path = str(tmp_path / "trace.ndjson")
+    with TraceRecorder(path):
+        Calculator.add(1, 2)
+        Statistics.percentile(list(range(100)), 90)
+        Statistics.standard_deviation([1.0, 2.0, 4.0])
+        with pytest.raises(ValueError):
+            Statistics.mean([])
+    return path
+
+
+class TestTraceRecorder:
+    """Test suite for recording traces."""
+
+    @pytest.mark.unit
+    def test_records_outermost_calls(self, trace_path):
+        """Test the recorded events, without the calls made internally."""
+        events = load_trace(trace_path)
+        assert [event.operation for event in events] == [
+            "Calculator.add", "Statistics.percentile", "Statistics.standard_deviation",
+            "Statistics.mean"]
+        assert events[0].args == [1, 2]
+        assert events[1].args == [{"len": 100}, 90]
+        assert [event.ok for event in events] == [True, True, True, False]
+        times = [event.time for event in events]
+        assert times == sorted(times) and times[0] >= 0
+
+    @pytest.mark.unit
+    def test_methods_are_restored(self, trace_path):
+        """Test that stopping the recorder puts the original methods back."""
+        original = vars(Statistics)["mean"]
+        with TraceRecorder(trace_path):
+            assert vars(Statistics)["mean"] is not original
+        assert vars(Statistics)["mean"] is original
+
+    @pytest.mark.unit
+    def test_capture_args_and_kwargs(self, tmp_path):
+        """Test that captured sequences keep their values, including arrays."""
+        path = str(tmp_path / "trace.ndjson.gz")
+        with TraceRecorder(path, capture_args=True) as recorder:
+            Statistics.variance(array("d", [1.0, 2.0, 3.0]), sample=False)
+        assert recorder.calls == 1
+        with gzip.open(path, "rt") as handle:
+            record = json.loads(handle.readline())
+        assert record["args"] == [[1.0, 2.0, 3.0]]
+        assert record["kwargs"] == {"sample": False}
+
+    @pytest.mark.unit
+    def test_unencodable_arguments(self, tmp_path):
+        """Test that an argument the trace cannot store leaves the call's outcome alone."""
+        class Opaque:
+            def __add__(self, other):
+                return other
+
+            def __repr__(self):
+                raise RuntimeError("no repr")
+
+        path = str(tmp_path / "trace.ndjson")
+        with TraceRecorder(path) as recorder:
+            assert Calculator.add(Opaque(), 2) == 2
+            with pytest.raises(ValueError, match="Cannot divide by zero"):
+                Calculator.divide(Opaque(), 0)
+            Calculator.add(1, 2)
+        assert (recorder.calls, recorder.dropped) == (1, 2)
+        assert [event.args for event in load_trace(path)] == [[1, 2]]
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not hasattr(sys, "get_int_max_str_digits"),
+                        reason="Integer string conversion is unlimited")
+    def test_unwritable_event(self, tmp_path):
+        """Test that an event JSON cannot encode is dropped, not raised."""
+        with TraceRecorder(str(tmp_path / "trace.ndjson")) as recorder:
+            assert Calculator.add(10 ** 5000, 1) == 10 ** 5000 + 1
+            with pytest.raises(ValueError, match="Cannot divide by zero"):
+                Calculator.divide(10 ** 5000, 0)
+        assert (recorder.calls, recorder.dropped) == (0, 2)
+
+    @pytest.mark.unit
+    def test_already_recording(self, tmp_path):
+        """Test that a recorder cannot be started twice."""
+        with TraceRecorder(str(tmp_path / "trace.ndjson")) as recorder:
+            with pytest.raises(RuntimeError, match="Recorder is already recording"):
+                recorder.start()
+
+    @pytest.mark.unit
+    def test_stacks_with_instrumentation(self, tmp_path):
+        """Test recording while instrumentation is on, stopped in reverse order."""
+        original = vars(Calculator)["add"]
+        instrumentation.enable([Calculator])
+        try:
+            with TraceRecorder(str(tmp_path / "trace.ndjson"), targets=[Calculator]) as recorder:
+                Calculator.add(1, 1)
+            assert recorder.calls == 1
+            assert instrumentation.snapshot()["Calculator.add"]["calls"] == 1
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+        assert vars(Calculator)["add"] is original
+
+    @pytest.mark.integration
+    def test_concurrent_calls(self, tmp_path):
+        """Test that every call from many threads is written on its own line."""
+        path = str(tmp_path / "trace.ndjson")
+        with TraceRecorder(path):
+            threads = [threading.Thread(target=lambda: [Calculator.add(1, i) for i in range(200)])
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert len(load_trace(path)) == 800
+
+
+class TestReplay:
+    """Test suite for loading and replaying traces."""
+
+    @pytest.mark.unit
+    def test_full_speed(self, trace_path):
+        """Test a replay at full speed, including the call that raised."""
+        report = replay(load_trace(trace_path))
+        assert report.calls == 4
+        assert report.errors == 1
+        assert 0 <= report.p50 <= report.p90 <= report.p99 <= report.max
+        assert report.throughput > 0
+
+    @pytest.mark.unit
+    def test_scaled_rate(self):
+        """Test that a replay at half speed takes twice the recorded time."""
+        events = [TraceEvent(i * 0.01, "Calculator.add", [1, 2], {}, True) for i in range(6)]
+        report = replay(events, speed=0.5)
+        assert report.seconds == pytest.approx(0.1, abs=0.04)
+
+    @pytest.mark.integration
+    def test_processes(self):
+        """Test that events are shared between worker processes."""
+        events = [TraceEvent(0.0, "Statistics.median", [{"len": 1000}], {}, True)] * 20
+        report = replay(events, processes=2)
+        assert report.calls == 20
+        assert report.errors == 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("events,kwargs,message", [
+        ([], {}, "Cannot replay an empty trace"),
+        ([TraceEvent(0.0, "Calculator.add", [1, 2], {}, True)], {"speed": 0}, "Speed and processes must be positive"),
+        ([TraceEvent(0.0, "Calculator.add", [1, 2], {}, True)], {"processes": 0}, "Speed and processes must be positive"),
+        ([TraceEvent(0.0, "Calculator.nope", [], {}, True)], {}, "Unknown operation: Calculator.nope"),
+        ([TraceEvent(0.0, "Calculator._private", [], {}, True)], {}, "Unknown operation"),
+    ])
+    def test_invalid_replay(self, events, kwargs, message):
+        """Test that invalid replays raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            replay(events, **kwargs)
+
+    @pytest.mark.unit
+    def test_invalid_trace(self, tmp_path):
+        """Test that a malformed line is reported with its number."""
+        path = tmp_path / "trace.ndjson"
+        path.write_text('{"t": 0, "op": "Calculator.add", "args": [1, 2]}\n{"op": "x"}\n')
+        with pytest.raises(ValueError, match="Invalid trace event on line 2"):
+            load_trace(str(path))
+
+    # Test the command line
+    @pytest.mark.integration
+    def test_record_and_replay_commands(self, tmp_path, capsys):
+        """Test recording a script and replaying its trace."""
+        script = tmp_path / "work.py"
+        script.write_text("import sys\nfrom mathlib.geometry import Geometry\n"
+                          "for r in range(int(sys.argv[1])):\n    Geometry.circle_area(r)\n")
+        trace = str(tmp_path / "trace.ndjson")
+        assert main(["record", trace, str(script), "5"]) == 0
+        assert "Recorded 5 calls" in capsys.readouterr().err
+        assert main(["replay", trace]) == 0
+        assert capsys.readouterr().out.startswith("5 calls, 0 errors")
+        assert main(["replay", str(tmp_path / "missing.ndjson")]) == 1
@@ -0,0 +1,143 @@
+"""Unit tests for the validated module."""
+import math
+import random
+from array import array
+import pytest
+from mathlib.batch_geometry import BatchGeometry, BatchValidationError, UncheckedGeometry
+from mathlib.calculator import Calculator
+from mathlib.statistics import Statistics
+from mathlib.validated import (UncheckedCalculator, UncheckedStatistics, ValidatedColumn,
+                               validate)
+
+
+@pytest.fixture(scope="module")
+def columns():
+    """Fixture to provide four positive random columns of 500 values."""
+    rng = random.Random(7)
+    return [[rng.uniform(0.5, 100) for _ in range(500)] for _ in range(4)]
+
+
+class TestValidate:
+    """Test suite for the validate function."""
+
+    # Test accepted columns
+    @pytest.mark.unit
+    def test_returns_an_immutable_copy(self):
+        """Test that later changes to the input do not reach the column."""
+        raw = [1.0, 2.0, 3.0]
+        column = validate(raw, non_negative=True)
+        raw[0] = -1.0
+        assert list(column) == [1.0, 2.0, 3.0]
+        assert len(column) == 3 and column[1] == 2.0
+        assert column.satisfies("finite", "non_negative")
+        assert not column.satisfies("nonzero")
+        with pytest.raises(TypeError):
+            column.values[0] = 5.0
+
+    @pytest.mark.unit
+    def test_revalidation(self):
+        """Test that passed checks are not repeated and new ones are added."""
+        column = validate([1, 2, 3], non_negative=True)
+        assert validate(column, non_negative=True) is column
+        stricter = validate(column, nonzero=True, integer=True)
+        assert stricter.satisfies("finite", "non_negative", "nonzero", "integer")
+
+    @pytest.mark.unit
+    def test_slices_keep_constraints(self):
+        """Test that a slice is a ValidatedColumn with the same checks."""
+        part = validate([1, 2, 3, 4], non_negative=True)[1:3]
+        assert isinstance(part, ValidatedColumn)
+        assert list(part) == [2.0, 3.0]
+        assert part.satisfies("non_negative")
+
+    @pytest.mark.unit
+    def test_accepts_arrays_and_empty_columns(self):
+        """Test arrays, integers and the empty column."""
+        assert list(validate(array("q", [1, 2]))) == [1.0, 2.0]
+        assert len(validate([], non_negative=True, nonzero=True)) == 0
+
+    # Test rejected columns
+    @pytest.mark.unit
+    @pytest.mark.parametrize("values,options,reason,indices", [
+        ([1, "a", 2, None], {}, "Radius must be numbers", [1, 3]),
+        ([1, math.nan, math.inf, 2], {}, "Radius must be finite", [1, 2]),
+        ([1, -2, 3, -0.5], {"non_negative": True}, "Radius cannot be negative", [1, 3]),
+        ([math.nan, -1.0], {"finite": False, "non_negative": True}, "Radius cannot be negative", [1]),
+        ([0, 2, 0.0, 3], {"nonzero": True}, "Radius cannot be zero", [0, 2]),
+        ([1, 2.5, 3, 4.25], {"integer": True}, "Radius must be integers", [1, 3]),
+    ])
+    def test_reports_every_offending_index(self, values, options, reason, indices):
+        """Test that a failed check names the reason and every position."""
+        with pytest.raises(BatchValidationError) as info:
+            validate(values, "Radius", **options)
+        assert info.value.reason == reason
+        assert info.value.indices == indices
+
+    @pytest.mark.unit
+    def test_non_finite_allowed(self):
+        """Test that finite=False lets NaN and infinities through."""
+        assert math.isinf(validate([1, math.inf], finite=False)[1])
+
+    @pytest.mark.unit
+    def test_min_length(self):
+        """Test that a short column raises ValueError."""
+        with pytest.raises(ValueError, match="Values must have at least 2 values"):
+            validate([1.0], min_length=2)
+
+
+class TestUncheckedKernels:
+    """Test suite for the unchecked kernels."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("name", sorted(
+        name for name in vars(BatchGeometry) if not name.startswith("_")))
+    def test_geometry_matches_batch_geometry(self, name, columns):
+        """Test that every unchecked geometry kernel gives the checked results."""
+        method = getattr(BatchGeometry, name)
+        arity = method.__code__.co_argcount - 1
+        args = [validate(column, non_negative=True) for column in columns[:arity]]
+        assert list(getattr(UncheckedGeometry, name)(*args)) == list(method(*columns[:arity]))
+        assert list(method(*args)) == list(method(*columns[:arity]))
+
+    @pytest.mark.unit
+    def test_batch_geometry_trusts_validated_columns(self):
+        """Test that BatchGeometry skips its negative scan for validated columns."""
+        trusted = ValidatedColumn(array("d", [-1.0, 2.0]), frozenset({"non_negative"}))
+        assert list(BatchGeometry.circle_circumference(trusted)) == pytest.approx([-2 * math.pi, 4 * math.pi])
+        with pytest.raises(BatchValidationError):
+            BatchGeometry.circle_circumference(validate([-1.0, 2.0]))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("name", ["add", "subtract", "multiply", "divide", "power", "modulo"])
+    def test_binary_calculator(self, name, columns):
+        """Test that binary calculator kernels match Calculator."""
+        a, b = columns[0][:50], [x / 40 for x in columns[1][:50]]
+        expected = [getattr(Calculator, name)(x, y) for x, y in zip(a, b)]
+        assert list(getattr(UncheckedCalculator, name)(a, b)) == pytest.approx(expected)
+
+    @pytest.mark.unit
+    def test_unary_calculator(self, columns):
+        """Test square roots and factorials."""
+        assert list(UncheckedCalculator.square_root(columns[0])) == \
+            [Calculator.square_root(x) for x in columns[0]]
+        integers = validate([0, 1, 5, 10], non_negative=True, integer=True)
+        assert UncheckedCalculator.factorial(integers) == [1, 1, 120, 3628800]
+
+    @pytest.mark.unit
+    def test_output_buffer(self, columns):
+        """Test writing into a preallocated buffer."""
+        out = array("d", bytes(8 * 500))
+        assert UncheckedCalculator.add(columns[0], columns[1], out=out) is out
+        assert out[3] == columns[0][3] + columns[1][3]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("name,args", [
+        ("mean", ()), ("median", ()), ("mode", ()), ("variance", ()), ("variance", (False,)),
+        ("standard_deviation", ()), ("range_value", ()), ("percentile", (37.5,)),
+    ])
+    @pytest.mark.parametrize("size", [2, 7, 500])
+    def test_statistics_match_exactly(self, name, args, size, columns):
+        """Test that unchecked statistics equal Statistics to the last bit."""
+        data = [round(x) for x in columns[2][:size]]
+        column = validate(data, min_length=2)
+        assert getattr(UncheckedStatistics, name)(column, *args) == getattr(Statistics, name)(data, *args)